@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for the AES optimization core in logic.py
+
+asv-style: each benchmark is a setup function over a parameter grid that
+returns the callable to time. A run records the best/median time of every
+(benchmark, parameters) case together with the git commit and library
+versions, can be saved as JSON and compared against an earlier run. Problem
+instances come from the benchmarks.py builders, so suite cases time the same
+workloads as the command-line benchmarks.
+
+    python bench_suite.py --save                  # bench_results/<commit>.json
+    python bench_suite.py --quick -k voyage       # smallest scales, matching names
+    python bench_suite.py --compare bench_results/abc1234.json
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import platform
+import re
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import scipy
+import cvxpy as cp
+
+from benchmarks import daily_profiles, example_aes, example_seaport, fleet_pairs, synthetic_fleet
+from logic import (CandidatePairs, RouteOptimizer, SatisfactoryIndex, VoltageRegulator,
+                   VoyageScheduler)
+
+RESULTS_DIR = Path(__file__).parent / "bench_results"
+
+BENCHMARKS = {}
+
+def benchmark(repeat=5, **params):
+    """Register a setup function; it is called with one value per parameter"""
+    def register(setup):
+        BENCHMARKS[setup.__name__] = {'setup': setup, 'params': params, 'repeat': repeat,
+                                      'doc': (setup.__doc__ or '').strip()}
+        return setup
+    return register
+
+# Benchmarks
+
+@benchmark(grid=[10, 100, 1000])
+def resistance_map(grid):
+    """RouteOptimizer.generate_resistance_map on a grid x grid Beaufort field"""
+    wind = np.random.default_rng(0).integers(0, 9, size=(grid, grid))
+    optimizer = RouteOptimizer(grid_size=(grid, grid))
+    return lambda: optimizer.generate_resistance_map(wind)
+
+@benchmark(grid=[10, 100, 300])
+def route_planning(grid):
+    """RouteOptimizer.dijkstra_route_planning corner to corner"""
+    optimizer = RouteOptimizer(grid_size=(grid, grid))
+    resistance_map = optimizer.generate_resistance_map(
+        np.random.default_rng(0).integers(1, 7, size=(grid, grid)))
+    return lambda: optimizer.dijkstra_route_planning(resistance_map, (0, 0), (grid - 1, grid - 1))
+
+@benchmark(repeat=3, hours=[4, 8, 16, 24])
+def optimize_voyage(hours):
+    """VoyageScheduler.optimize_voyage (SLSQP) over a voyage of ``hours``"""
+    scheduler = VoyageScheduler(example_aes(P_dis_min=0), d_route=14.0 * hours)
+    profile = list(np.random.default_rng(0).uniform(0.1, 0.3, size=hours))
+    return lambda: scheduler.optimize_voyage(scheduler.T_s + hours, profile)
+
+@benchmark(pairs=[100, 1000, 10000])
+def filter_by_threshold(pairs):
+    """SatisfactoryIndex.filter_by_threshold on one vessel's list of pair dicts"""
+    aes = synthetic_fleet(1)[0]
+    fleet = [dataclasses.replace(aes, T_up=aes.T_low + 23)]
+    candidates = fleet_pairs(fleet, per_slot=max(1, pairs // 24))[aes.vessel_id]
+    return lambda: SatisfactoryIndex.filter_by_threshold(candidates, 0.5)
+
+@benchmark(pairs=[1000, 10000, 100000])
+def candidate_selection(pairs):
+    """CandidatePairs: SI, threshold filter, top-10 and Pareto front"""
+    rng = np.random.default_rng(0)
+    T_a = rng.integers(8, 32, pairs)
+    SOC_a, cost = rng.uniform(0.1, 0.6, pairs), rng.uniform(500, 1500, pairs)
+
+    def run():
+        table = CandidatePairs.from_arrays(T_a, SOC_a, cost).compute_SI()
+        return table.filter(0.5), table.top_k(10), table.pareto_front()
+    return run
+
+@benchmark(repeat=3, vessels=[2, 4, 8], hours=[24, 48])
+def optimize_voltage_regulation(vessels, hours):
+    """VoltageRegulator.optimize_voltage_regulation (berth/charging MILP, no cache)"""
+    fleet = synthetic_fleet(vessels)
+    pairs = fleet_pairs(fleet)
+    pv, load = daily_profiles(hours)
+    regulator = VoltageRegulator(example_seaport())
+    return lambda: regulator.optimize_voltage_regulation(pairs, pv, load, fleet)
+
+# Runner
+
+def git_revision():
+    """(short commit hash, dirty flag) of the working tree, or ('unknown', False)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, cwd=Path(__file__).parent).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True,
+                               cwd=Path(__file__).parent).stdout.strip() != ""
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+def environment():
+    commit, dirty = git_revision()
+    return {'commit': commit, 'dirty': dirty,
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'machine': platform.machine(),
+            'processor': platform.processor(), 'numpy': np.__version__,
+            'scipy': scipy.__version__, 'cvxpy': cp.__version__}
+
+def case_name(name, params):
+    return name + "".join(f"[{key}={value}]" for key, value in params.items())
+
+def run_case(setup, params, repeat):
+    """Best and median wall time of ``repeat`` timed calls after one warm-up call"""
+    func = setup(**params)
+    func()
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start_time)
+    return {'min': min(times), 'median': statistics.median(times), 'repeat': repeat}
+
+def run_suite(pattern=None, quick=False, repeat=None):
+    """Run every registered case whose name matches ``pattern``; returns the results"""
+    results = {}
+    for name, spec in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        grid = {key: values[:1] if quick else values for key, values in spec['params'].items()}
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid, values))
+            case = case_name(name, params)
+            try:
+                results[case] = run_case(spec['setup'], params, repeat or spec['repeat'])
+                print(f"{case:<55} {1e3 * results[case]['min']:10.3f} ms "
+                      f"(median {1e3 * results[case]['median']:.3f} ms)")
+            except Exception as e:
+                results[case] = {'error': f"{type(e).__name__}: {e}"}
+                print(f"{case:<55} {'FAILED':>10}  {results[case]['error']}")
+    return results
+
+def compare(baseline, current, threshold=1.2):
+    """Print per-case time ratios current/baseline; returns the regressed case names"""
+    print(f"\n{'case':<55} {'base (ms)':>10} {'curr (ms)':>10} {'ratio':>7}")
+    print(f"  baseline {baseline['env']['commit']}, current {current['env']['commit']}")
+    regressions = []
+    for case, result in current['results'].items():
+        before = baseline['results'].get(case)
+        if not before or 'min' not in before or 'min' not in result:
+            continue
+        ratio = result['min'] / before['min']
+        flag = ""
+        if ratio > threshold:
+            flag = "  slower"
+            regressions.append(case)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{case:<55} {1e3 * before['min']:10.3f} {1e3 * result['min']:10.3f} "
+              f"{ratio:6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the AES optimization core")
+    parser.add_argument("-k", "--filter", default=None, help="regex on benchmark names")
+    parser.add_argument("--quick", action="store_true", help="smallest scale of every benchmark")
+    parser.add_argument("--repeat", type=int, default=None, help="override timed calls per case")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--save", nargs="?", const="", default=None,
+                        help="save results as JSON (default bench_results/<commit>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="baseline results file; with two files compare them without running")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="ratio flagged as a regression in --compare")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in BENCHMARKS.items():
+            params = ", ".join(f"{key}={values}" for key, values in spec['params'].items())
+            print(f"{name:<30} {params:<30} {spec['doc']}")
+        return
+
+    if args.compare and len(args.compare) == 2:
+        baseline, current = (json.loads(Path(path).read_text()) for path in args.compare)
+    else:
+        current = {'env': environment(),
+                   'results': run_suite(args.filter, args.quick, args.repeat)}
+        if args.save is not None:
+            path = Path(args.save) if args.save else RESULTS_DIR / (
+                current['env']['commit'] + ("-dirty" if current['env']['dirty'] else "") + ".json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(current, indent=2))
+            print(f"\nResults saved to {path}")
+        baseline = json.loads(Path(args.compare[0]).read_text()) if args.compare else None
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} case(s) slower than {args.threshold}x baseline")
+
+if __name__ == "__main__":
+    main()
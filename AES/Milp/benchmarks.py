@@ -0,0 +1,892 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the AES optimization core in logic.py
+"""
+
+import argparse
+import dataclasses
+import heapq
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from scipy.optimize import minimize
+
+import cvxpy as cp
+
+from decomposition import FleetPortDecomposition
+from network import LinDistFlow, load_feeder, synthetic_feeder
+from logic import (AESParameters, CoordinatedOptimizer, RouteOptimizer, SatisfactoryIndex,
+                   SeaportParameters, VoltageRegulator, VoyageScheduler)
+from persistent import PersistentRegulator
+from route_search import SEARCH_ENGINES, IncrementalRouter, RouteService, distance_field
+from profiling import Tracer
+from rolling_horizon import RollingHorizonRegulator
+from solve_cache import SolveCache
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Return (best wall time in seconds, result) over `repeat` calls."""
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+def reference_resistance_map(grid_size, wind_conditions):
+    """Original per-cell dict lookup, kept as the baseline for comparison."""
+    beaufort_scale = {
+        0: 0.00, 1: 0.06, 2: 0.13, 3: 0.20,
+        4: 0.26, 5: 0.33, 6: 0.40
+    }
+    resistance_map = np.zeros(grid_size)
+    for i in range(grid_size[0]):
+        for j in range(grid_size[1]):
+            wind_level = min(int(wind_conditions[i, j]), 6)
+            resistance_map[i, j] = beaufort_scale[wind_level]
+    return resistance_map
+
+def bench_resistance_map(sizes, reference_limit=1000, seed=0):
+    """Vectorized resistance map vs. the original loop at several grid sizes."""
+    rng = np.random.default_rng(seed)
+    print(f"{'grid':>12} {'loop (s)':>10} {'f64 (s)':>10} {'f32 (s)':>10} "
+          f"{'chunked (s)':>12} {'speedup':>9}")
+
+    for n in sizes:
+        wind_conditions = rng.integers(0, 9, size=(n, n))
+        optimizer = RouteOptimizer(grid_size=(n, n))
+
+        t64, map64 = timed(optimizer.generate_resistance_map, wind_conditions)
+        t32, map32 = timed(optimizer.generate_resistance_map, wind_conditions,
+                           dtype=np.float32)
+        tchunk, map_chunk = timed(optimizer.generate_resistance_map, wind_conditions,
+                                  chunk_rows=max(1, n // 8))
+        assert np.array_equal(map64, map_chunk)
+        assert np.allclose(map64, map32)
+
+        if n <= reference_limit:
+            tloop, map_loop = timed(reference_resistance_map, (n, n), wind_conditions,
+                                    repeat=1)
+            assert np.array_equal(map64, map_loop)
+            loop_col, speedup_col = f"{tloop:10.4f}", f"{tloop / t64:8.1f}x"
+        else:
+            loop_col, speedup_col = f"{'-':>10}", f"{'-':>9}"
+
+        print(f"{f'{n}x{n}':>12} {loop_col} {t64:10.4f} {t32:10.4f} "
+              f"{tchunk:12.4f} {speedup_col}")
+
+def reference_dijkstra(resistance_map, start, end):
+    """Original tuple/dict-based Dijkstra; returns (cost, expanded nodes)."""
+    rows, cols = resistance_map.shape
+    distances = np.full((rows, cols), np.inf)
+    distances[start] = 0
+    previous = {}
+    pq = [(0, start)]
+    directions = [(0, 1), (1, 0), (0, -1), (-1, 0),
+                  (1, 1), (1, -1), (-1, 1), (-1, -1)]
+    expanded = 0
+
+    while pq:
+        current_dist, current = heapq.heappop(pq)
+        if current == end:
+            expanded += 1
+            break
+        if current_dist > distances[current]:
+            continue
+        expanded += 1
+        for dx, dy in directions:
+            nx, ny = current[0] + dx, current[1] + dy
+            if 0 <= nx < rows and 0 <= ny < cols:
+                neighbor = (nx, ny)
+                new_dist = current_dist + resistance_map[nx, ny]
+                if new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    previous[neighbor] = current
+                    heapq.heappush(pq, (new_dist, neighbor))
+
+    return distances[end], expanded
+
+def bench_route_search(sizes, engines, diagonal_weighting=False, seed=0):
+    """Compare search engines (time and expanded nodes) against the original Dijkstra."""
+    rng = np.random.default_rng(seed)
+    print(f"{'grid':>12} {'engine':>14} {'time (s)':>10} {'expanded':>10} "
+          f"{'cost':>10} {'speedup':>9}")
+
+    for n in sizes:
+        # Calm sea (Beaufort >= 1) keeps the A* heuristic informative
+        wind_conditions = rng.integers(1, 7, size=(n, n))
+        optimizer = RouteOptimizer(grid_size=(n, n), diagonal_weighting=diagonal_weighting)
+        resistance_map = optimizer.generate_resistance_map(wind_conditions)
+        start, end = (0, 0), (n - 1, n - 1)
+
+        t_ref = None
+        if not diagonal_weighting:
+            t_ref, (cost, expanded) = timed(reference_dijkstra, resistance_map, start, end,
+                                            repeat=1)
+            print(f"{f'{n}x{n}':>12} {'original':>14} {t_ref:10.4f} {expanded:10d} "
+                  f"{cost:10.3f} {'1.0x':>9}")
+
+        costs = []
+        for engine in engines:
+            optimizer.search_engine = engine
+            elapsed, (_, cost) = timed(optimizer.dijkstra_route_planning,
+                                       resistance_map, start, end, repeat=1)
+            costs.append(cost)
+            speedup = f"{t_ref / elapsed:8.1f}x" if t_ref else f"{'-':>9}"
+            print(f"{f'{n}x{n}':>12} {engine:>14} {elapsed:10.4f} "
+                  f"{optimizer.last_search.expanded:10d} {cost:10.3f} {speedup}")
+        assert np.allclose(costs, costs[0])
+
+def bench_route_service(n, n_vessels, n_origins, seed=0):
+    """Per-vessel point-to-point searches vs. RouteService distance fields."""
+    rng = np.random.default_rng(seed)
+    optimizer = RouteOptimizer(grid_size=(n, n))
+    resistance_map = optimizer.generate_resistance_map(rng.integers(1, 7, size=(n, n)))
+
+    origins = [tuple(int(x) for x in rng.integers(0, n, 2)) for _ in range(n_origins)]
+    queries = {vessel_id: (origins[vessel_id % n_origins],
+                           tuple(int(x) for x in rng.integers(0, n, 2)))
+               for vessel_id in range(n_vessels)}
+
+    start_time = time.perf_counter()
+    direct = {vessel_id: optimizer.dijkstra_route_planning(resistance_map, o, d)[1]
+              for vessel_id, (o, d) in queries.items()}
+    t_direct = time.perf_counter() - start_time
+
+    service = RouteService()
+    service.set_resistance_map(resistance_map)
+    t_cold, routes = timed(service.routes, queries, repeat=1)
+    t_warm, _ = timed(service.routes, queries, repeat=1)
+    assert all(np.isclose(routes[k][1], direct[k]) for k in queries)
+
+    print(f"grid {n}x{n}, {n_vessels} vessels, {n_origins} origins")
+    print(f"  point-to-point searches: {t_direct:.4f}s")
+    print(f"  route service (cold):    {t_cold:.4f}s  ({t_direct / t_cold:.1f}x)")
+    print(f"  route service (warm):    {t_warm:.4f}s  ({t_direct / t_warm:.1f}x)")
+    print(f"  cache: {service.stats()}")
+
+def bench_incremental_routing(n, fractions, seed=0):
+    """Repair a distance tree after a regional wind change vs. full recompute."""
+    rng = np.random.default_rng(seed)
+    optimizer = RouteOptimizer(grid_size=(n, n))
+    wind_conditions = rng.integers(1, 7, size=(n, n))
+    resistance_map = optimizer.generate_resistance_map(wind_conditions)
+    origin = (0, 0)
+
+    print(f"grid {n}x{n}, origin {origin}")
+    print(f"{'changed':>9} {'cells':>8} {'reset':>8} {'repair (s)':>11} "
+          f"{'full (s)':>9} {'speedup':>9}")
+    for fraction in fractions:
+        router = IncrementalRouter(resistance_map, origin)
+
+        # One square weather front covering `fraction` of the grid
+        side = max(1, int(round(n * np.sqrt(fraction))))
+        r0, c0 = rng.integers(0, n - side + 1, 2)
+        new_wind = wind_conditions.copy()
+        new_wind[r0:r0 + side, c0:c0 + side] = rng.integers(1, 7, size=(side, side))
+
+        cells, resistances = optimizer.resistance_diff(resistance_map, new_wind)
+        t_repair, stats = timed(router.update, cells, resistances, repeat=1)
+        new_map = optimizer.generate_resistance_map(new_wind)
+        t_full, full = timed(distance_field, new_map, origin, repeat=1)
+        assert np.allclose(router.field.distances, full.distances)
+
+        print(f"{fraction:9.3%} {stats['changed']:8d} {stats['reset']:8d} "
+              f"{t_repair:11.4f} {t_full:9.4f} {t_full / t_repair:8.1f}x")
+
+def example_aes(vessel_id=1, T_low=10, T_up=12, P_dis_min=10):
+    """AES 1 from run_example (Table II, type 1).
+
+    Long-voyage benchmarks pass P_dis_min=0, otherwise the minimum discharge
+    alone would empty the ESS (SOC bound (9)) after about 9 hours.
+    """
+    return AESParameters(
+        vessel_id=vessel_id, P_DSG_max=300, P_DSG_min=80, P_ramp=200,
+        E_ESS=120, P_dis_max=60, P_dis_min=P_dis_min, P_sv1=10, P_sv2=10,
+        c0=3.02e-5, c1=0.37, c2=0.01, TC_ESS=600,
+        T_low=T_low, T_up=T_up, beta_k=0.5
+    )
+
+def reference_optimize_voyage(scheduler, T_a, resistance_profile):
+    """Original closure-based SLSQP set-up without gradients, plus the SOC bound (9)."""
+    cruise_hours = T_a - 8
+
+    def objective(x):
+        total_cost = 0
+        for t in range(cruise_hours):
+            P_DSG_t = x[cruise_hours + t]
+            P_dis_t = x[2 * cruise_hours + t]
+            total_cost += scheduler.dsg_cost(P_DSG_t)
+            total_cost += scheduler.ess_degradation_cost(P_dis_t, P_dis_t / scheduler.params.E_ESS)
+        return total_cost
+
+    constraints = []
+    for t in range(cruise_hours):
+        def power_balance(x, t=t):
+            f_t = resistance_profile[t] if t < len(resistance_profile) else 0.2
+            P_pl_t = scheduler.propulsion_power(x[t], f_t)
+            return x[cruise_hours + t] + x[2 * cruise_hours + t] - P_pl_t - scheduler.params.P_sv1
+        constraints.append({'type': 'eq', 'fun': lambda x, t=t: power_balance(x, t)})
+    constraints.append({'type': 'eq',
+                        'fun': lambda x: np.sum(x[:cruise_hours]) - scheduler.d_route})
+    constraints.append({'type': 'ineq',
+                        'fun': lambda x: (scheduler.discharge_capacity()
+                                          - np.sum(x[2 * cruise_hours:]))})
+
+    bounds = ([(5, 20)] * cruise_hours +
+              [(scheduler.params.P_DSG_min, scheduler.params.P_DSG_max)] * cruise_hours +
+              [(scheduler.params.P_dis_min, scheduler.params.P_dis_max)] * cruise_hours)
+    x0 = np.concatenate([np.full(cruise_hours, scheduler.d_route / cruise_hours),
+                         np.full(cruise_hours, scheduler.params.P_DSG_min),
+                         np.full(cruise_hours, 0)])
+    return minimize(objective, x0, method='SLSQP', bounds=bounds, constraints=constraints)
+
+def bench_voyage(horizons, d_per_hour=14.0, seed=0):
+    """Analytic-gradient optimize_voyage vs. the original finite-difference set-up."""
+    rng = np.random.default_rng(seed)
+    print(f"{'hours':>6} {'ref nfev':>9} {'ref (s)':>9} {'ref cost':>10} "
+          f"{'nfev':>6} {'time (s)':>9} {'cost':>10} {'speedup':>9}")
+
+    for hours in horizons:
+        scheduler = VoyageScheduler(example_aes(P_dis_min=0), d_route=d_per_hour * hours)
+        profile = list(rng.uniform(0.1, 0.3, size=hours))
+        T_a = 8 + hours
+
+        t_ref, ref = timed(reference_optimize_voyage, scheduler, T_a, profile, repeat=1)
+        t_new, new = timed(scheduler.optimize_voyage, T_a, profile, repeat=1)
+
+        ref_cols = (f"{ref.nfev:9d} {t_ref:9.3f} {ref.fun:10.3f}" if ref.success
+                    else f"{ref.nfev:9d} {t_ref:9.3f} {'failed':>10}")
+        new_cols = (f"{new['nfev']:6d} {t_new:9.3f} {new['cost']:10.3f}" if new
+                    else f"{'-':>6} {t_new:9.3f} {'failed':>10}")
+        print(f"{hours:6d} {ref_cols} {new_cols} {t_ref / t_new:8.1f}x")
+
+def bench_voyage_batch(n_slots, d_route=200.0, seed=0):
+    """optimize_voyage_batch (warm-started) vs. one cold optimize_voyage per T_a."""
+    rng = np.random.default_rng(seed)
+    # Light DSG minimum keeps a wide range of arrival times feasible
+    aes = example_aes(T_low=18, T_up=17 + n_slots, P_dis_min=0)
+    aes.P_DSG_min = 20
+    scheduler = VoyageScheduler(aes, d_route=d_route)
+    profile = list(rng.uniform(0.1, 0.3, size=aes.T_up - 8))
+    T_a_values = range(aes.T_low, aes.T_up + 1)
+
+    def solve_each():
+        results = [scheduler.optimize_voyage(T_a, profile) for T_a in T_a_values]
+        return [r for r in results if r]
+
+    t_each, each = timed(solve_each, repeat=1)
+    t_batch, batch = timed(scheduler.optimize_voyage_batch, T_a_values, profile, repeat=1)
+
+    costs_each = {r['T_a']: r['cost'] for r in each}
+    costs_batch = {r['T_a']: r['cost'] for r in batch}
+    common = sorted(set(costs_each) & set(costs_batch))
+    max_gap = max((abs(costs_each[T] - costs_batch[T]) / costs_each[T] for T in common),
+                  default=0.0)
+
+    print(f"{n_slots} arrival slots (T_a {aes.T_low}-{aes.T_up}), d_route={d_route}")
+    print(f"  per-T_a cold solves: {t_each:.3f}s, {sum(r['nfev'] for r in each)} nfev, "
+          f"{len(each)} pairs")
+    print(f"  batch warm-started:  {t_batch:.3f}s, {sum(r['nfev'] for r in batch)} nfev, "
+          f"{len(batch)} pairs ({t_each / t_batch:.1f}x)")
+    print(f"  max relative cost difference: {max_gap:.2e}")
+
+def example_seaport():
+    """Seaport from run_example (Table III)."""
+    return SeaportParameters(
+        n_buses=16, n_berths=3, V_min=0.95, V_max=1.05, tap_max=10,
+        berth_times={0: [2, 4, 6], 1: [2, 4, 6], 2: [1, 2, 3]}
+    )
+
+def bench_fleet_scheduling(n_vessels, workers, chunk_size=None, shared_results=False, seed=0):
+    """Step 3 (schedule_voyages) wall time for a fleet at several worker counts."""
+    rng = np.random.default_rng(seed)
+    fleet = []
+    for vessel_id in range(n_vessels):
+        aes = example_aes(vessel_id=vessel_id, T_low=18, T_up=33, P_dis_min=0)
+        aes.P_DSG_min = 20
+        aes.c2 = float(rng.uniform(0.008, 0.012))
+        fleet.append(aes)
+    profile = list(rng.uniform(0.1, 0.3, size=25))
+
+    print(f"{n_vessels} vessels x 16 arrival slots, chunk_size={chunk_size or 'auto'}"
+          f"{', shared result buffer' if shared_results else ''}")
+    baseline, reference = None, None
+    for n_workers in workers:
+        optimizer = CoordinatedOptimizer(fleet, example_seaport(), n_workers=n_workers,
+                                         chunk_size=chunk_size, d_route=200.0,
+                                         shared_results=shared_results)
+        elapsed, pairs = timed(optimizer.schedule_voyages, profile, repeat=1)
+        costs = [r['cost'] for vessel_pairs in pairs.values() for r in vessel_pairs]
+        if reference is None:
+            baseline, reference = elapsed, costs
+        assert np.allclose(costs, reference)
+        nfev = sum(r.get('nfev', 0) for vessel_pairs in pairs.values() for r in vessel_pairs)
+        print(f"  workers={n_workers:3d}: {elapsed:8.3f}s  ({baseline / elapsed:.1f}x), "
+              f"{len(costs)} pairs, {nfev} nfev")
+
+def bench_voyage_backends(horizons, d_per_hour=14.0, seed=0):
+    """SLSQP vs. the convex CVXPY reformulation: time and cost gap."""
+    rng = np.random.default_rng(seed)
+    print(f"{'hours':>6} {'slsqp (s)':>10} {'cvxpy (s)':>10} {'slsqp cost':>11} "
+          f"{'cvxpy cost':>11} {'rel. gap':>10} {'max |dv|':>9}")
+
+    for hours in horizons:
+        profile = list(rng.uniform(0.1, 0.3, size=hours))
+        T_a = 8 + hours
+        slsqp = VoyageScheduler(example_aes(P_dis_min=0), d_route=d_per_hour * hours)
+        convex = VoyageScheduler(example_aes(P_dis_min=0), d_route=d_per_hour * hours,
+                                 backend='cvxpy')
+
+        t_slsqp, _ = timed(slsqp.optimize_voyage, T_a, profile, repeat=1)
+        t_cvxpy, _ = timed(convex.optimize_voyage, T_a, profile, repeat=1)
+        report = slsqp.compare_backends(T_a, profile)
+        if 'gap' in report:
+            print(f"{hours:6d} {t_slsqp:10.3f} {t_cvxpy:10.3f} {report['slsqp']['cost']:11.3f} "
+                  f"{report['convex']['cost']:11.3f} {report['relative_gap']:10.2e} "
+                  f"{report['max_velocity_diff']:9.4f}")
+        else:
+            print(f"{hours:6d} {t_slsqp:10.3f} {t_cvxpy:10.3f} "
+                  f"{'infeasible' if not report['slsqp'] else '':>11} "
+                  f"{'infeasible' if not report['convex'] else '':>11} "
+                  f"{('mismatch: ' + report['mismatch']) if 'mismatch' in report else '':>20}")
+
+def reference_voltage_model(n_berths, n_vessels, n_hours, n_pairs):
+    """Original loop-built berth/voltage model (scalar constraints)."""
+    omega = cp.Variable((n_berths, n_vessels, n_hours), boolean=True)
+    tap = cp.Variable(n_hours, integer=True)
+    Q_PV = cp.Variable((4, n_hours))
+    P_ch = cp.Variable((n_berths, n_vessels, n_hours))
+    vessel_selection = {k: cp.Variable(n_pairs, boolean=True) for k in range(n_vessels)}
+
+    constraints = []
+    for t in range(n_hours):
+        for m in range(n_berths):
+            constraints.append(cp.sum([omega[m, k, t] for k in range(n_vessels)]) <= 1)
+        for k in range(n_vessels):
+            constraints.append(cp.sum([omega[m, k, t] for m in range(n_berths)]) <= 1)
+    for k in vessel_selection:
+        constraints.append(cp.sum(vessel_selection[k]) == 1)
+    for t in range(n_hours):
+        constraints.append(cp.sum([P_ch[m, k, t] * omega[m, k, t]
+                                   for m in range(n_berths) for k in range(n_vessels)]) <= 1000)
+    constraints += [tap >= -10, tap <= 10]
+    for i in range(4):
+        for t in range(n_hours):
+            constraints.append(Q_PV[i, t] >= -50)
+            constraints.append(Q_PV[i, t] <= 50)
+    constraints += [P_ch >= 0, P_ch <= 200]
+    return cp.Problem(cp.Minimize(cp.sum(cp.square(P_ch))), constraints)
+
+def synthetic_pairs(n_vessels, n_pairs, seed=0):
+    """Ta-SOCa candidate pairs per vessel with random costs."""
+    rng = np.random.default_rng(seed)
+    return {k: [{'T_a': 10 + j, 'SOC_a': float(rng.uniform(0.1, 0.9)),
+                 'cost': float(rng.uniform(500, 1500))} for j in range(n_pairs)]
+            for k in range(n_vessels)}
+
+def bench_voltage_model(fleet_sizes, steps, n_pairs=3, solve=True, reference_limit=8000):
+    """Model build, canonicalization and solve of the berth MILP vs. the loop-built model
+
+    The reference model is bilinear (P_ch * omega) and cannot be canonicalized,
+    so 'build x' compares build times only and 'e2e x' compares its build time
+    with the whole build + canonicalization + solve of the vectorized model.
+    """
+    print(f"{'vessels':>8} {'steps':>6} {'ref build':>10} {'build':>8} {'canon':>8} "
+          f"{'solve':>8} {'status':>10} {'build x':>9} {'e2e x':>8}")
+    regulator = VoltageRegulator(example_seaport())
+    for n_vessels in fleet_sizes:
+        for n_steps in steps:
+            pairs = synthetic_pairs(n_vessels, n_pairs)
+            pv = np.clip(np.sin(np.linspace(0, np.pi, n_steps)), 0, None)
+            load = np.full(n_steps, 0.8)
+
+            n_scalar = regulator.params.n_berths * n_vessels * n_steps
+            t_ref = None
+            if n_scalar <= reference_limit:
+                t_ref, _ = timed(reference_voltage_model, regulator.params.n_berths,
+                                 n_vessels, n_steps, n_pairs, repeat=1)
+            t_build, model = timed(regulator.build_model, pairs, pv, load, repeat=1)
+
+            canon_col, solve_col, status = f"{'-':>8}", f"{'-':>8}", '-'
+            total = None
+            if solve and model['problem'].is_dcp():
+                result = regulator.solve_model(model, build_time=t_build)
+                timing = result['timing']
+                status = 'optimal' if result['success'] else result.get('status', 'error')
+                if 'canonicalization' in timing:
+                    canon_col = f"{timing['canonicalization']:8.3f}"
+                    solve_col = f"{timing['solve']:8.3f}"
+                    total = timing['total']
+
+            ref_col = f"{t_ref:10.3f}" if t_ref else f"{'-':>10}"
+            speedup = f"{t_ref / t_build:8.1f}x" if t_ref else f"{'-':>9}"
+            e2e = f"{t_ref / total:7.1f}x" if t_ref and total else f"{'-':>8}"
+            print(f"{n_vessels:8d} {n_steps:6d} {ref_col} {t_build:8.3f} {canon_col} "
+                  f"{solve_col} {status:>10} {speedup} {e2e}")
+
+def synthetic_fleet(n_vessels, seed=0):
+    """AES fleet cycling through the three Table II types."""
+    rng = np.random.default_rng(seed)
+    types = {1: (300, 80, 120, 60, 10), 2: (400, 120, 180, 90, 20), 3: (500, 170, 240, 120, 30)}
+    fleet = []
+    for vessel_id in range(n_vessels):
+        vessel_type = vessel_id % 3 + 1
+        P_max, P_min, E_ESS, P_dis_max, P_sv = types[vessel_type]
+        T_low = int(rng.integers(8, 17))
+        fleet.append(AESParameters(
+            vessel_id=vessel_id, P_DSG_max=P_max, P_DSG_min=P_min, P_ramp=200,
+            E_ESS=E_ESS, P_dis_max=P_dis_max, P_dis_min=10, P_sv1=P_sv, P_sv2=P_sv,
+            c0=3.02e-5, c1=0.37, c2=0.01, TC_ESS=600,
+            T_low=T_low, T_up=T_low + 2, beta_k=0.5, vessel_type=vessel_type))
+    return fleet
+
+def fleet_pairs(fleet, seed=0, per_slot=1):
+    """``per_slot`` candidate pairs per arrival slot with random SOC_a and cost."""
+    rng = np.random.default_rng(seed)
+    return {aes.vessel_id: [{'T_a': T_a, 'SOC_a': float(rng.uniform(0.1, 0.6)),
+                             'cost': float(rng.uniform(500, 1500))}
+                            for T_a in range(aes.T_low, aes.T_up + 1) for _ in range(per_slot)]
+            for aes in fleet}
+
+def daily_profiles(n_hours):
+    """(pv_forecast, load_forecast) with one sunny day per 24 steps."""
+    t = np.arange(n_hours)
+    pv = np.clip(np.sin(2 * np.pi * (t % 24 - 6) / 24), 0, None)
+    return pv, 0.7 + 0.2 * np.sin(2 * np.pi * t / 24)
+
+def bench_berth_milp(fleet_sizes, n_hours=24):
+    """Solve time and optimality gap of the linearized berth/charging MILP."""
+    regulator = VoltageRegulator(example_seaport())
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_hours)), 0, None)
+    load = 0.7 + 0.2 * np.sin(np.linspace(0, 2 * np.pi, n_hours))
+    print(f"solver {regulator.solver}, {n_hours} steps")
+    print(f"{'vessels':>8} {'status':>10} {'build':>8} {'canon':>8} {'solve':>8} "
+          f"{'gap':>10} {'objective':>11}")
+    for n_vessels in fleet_sizes:
+        fleet = synthetic_fleet(n_vessels)
+        result = regulator.optimize_voltage_regulation(fleet_pairs(fleet), pv, load, fleet)
+        timing = result['timing']
+        status = 'optimal' if result['success'] else result.get('status', 'error')
+        gap = result.get('mip_gap')
+        print(f"{n_vessels:8d} {status:>10} {timing['build']:8.3f} "
+              f"{timing.get('canonicalization', 0.0):8.3f} {timing.get('solve', 0.0):8.3f} "
+              f"{(f'{gap:.2e}' if gap is not None else '-'):>10} "
+              f"{result.get('objective_value', float('nan')):11.2f}")
+
+def bench_lindistflow(bus_counts, n_steps=24, tap_max=10, seed=0):
+    """Build/canonicalize/solve the LinDistFlow volt/var MILP on growing radial feeders."""
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_steps)), 0, None)
+    load = 0.8 + 0.3 * np.sin(np.linspace(0, 2 * np.pi, n_steps))
+    port_power = np.where((np.arange(n_steps) >= 10) & (np.arange(n_steps) < 16), 150.0, 0.0)
+
+    print(f"{'buses':>6} {'vars':>7} {'build':>8} {'canon':>8} {'solve':>8} {'status':>10} "
+          f"{'min V':>7} {'losses kWh':>11}")
+    for n_buses in bus_counts:
+        if n_buses == 16:
+            network = LinDistFlow(load_feeder())
+        else:
+            rng = np.random.default_rng(seed)
+            feeder = synthetic_feeder(n_buses, seed)
+            buses = rng.choice(np.arange(2, n_buses + 1), size=5, replace=False)
+            network = LinDistFlow(feeder, pv_buses=tuple(buses[:4]), port_bus=int(buses[4]))
+
+        start_time = time.perf_counter()
+        tap = cp.Variable(n_steps, integer=True)
+        Q_PV = cp.Variable((network.n_pv, n_steps))
+        gamma = cp.Variable(n_steps - 1, integer=True)
+        constraints, losses, variables = network.constraints(tap, Q_PV, port_power, pv, load)
+        constraints += [tap >= -10, tap <= 10,
+                        gamma >= tap[1:] - tap[:-1], gamma >= tap[:-1] - tap[1:],
+                        cp.sum(gamma) <= tap_max]
+        problem = cp.Problem(cp.Minimize(network.base_kva * losses), constraints)
+        t_build = time.perf_counter() - start_time
+
+        problem.solve(solver=cp.HIGHS)
+        n_vars = sum(v.size for v in problem.variables())
+        if problem.status == cp.OPTIMAL:
+            V = variables['V'].value
+            energy = np.sum(network.losses_kw(variables['P_branch'].value,
+                                              variables['Q_branch'].value))
+            extra = f"{V.min():7.3f} {energy:11.2f}"
+        else:
+            extra = f"{'-':>7} {'-':>11}"
+        print(f"{n_buses:6d} {n_vars:7d} {t_build:8.3f} {problem.compilation_time:8.3f} "
+              f"{problem.solver_stats.solve_time:8.3f} {problem.status:>10} {extra}")
+
+def bench_rolling_horizon(fleet_sizes, horizons, window=12, stride=6):
+    """End-to-end rolling-horizon vs. monolithic berth MILP on multi-day horizons."""
+    regulator = VoltageRegulator(example_seaport())
+    print(f"solver {regulator.solver}, window {window}, stride {stride}")
+    print(f"{'hours':>6} {'vessels':>8} {'monolithic':>11} {'rolling':>9} {'speedup':>8} "
+          f"{'cost mono':>10} {'cost roll':>10}")
+    for n_hours in horizons:
+        pv, load = daily_profiles(n_hours)
+        days = max(n_hours // 24, 1)
+        for n_vessels in fleet_sizes:
+            # Spread the fleet's arrival windows over the days of the horizon
+            fleet = [dataclasses.replace(aes, T_low=aes.T_low + 24 * (aes.vessel_id % days),
+                                         T_up=aes.T_up + 24 * (aes.vessel_id % days))
+                     for aes in synthetic_fleet(n_vessels)]
+            # min_vessels=0: time the windows even where the threshold would not
+            rolling = RollingHorizonRegulator(regulator, window, stride, min_vessels=0)
+            report = rolling.compare_monolithic(fleet_pairs(fleet), pv, load, fleet)
+            mono, roll = report['monolithic'], report['rolling']
+            print(f"{n_hours:6d} {n_vessels:8d} {mono['time']:11.3f} {roll['time']:9.3f} "
+                  f"{report['speedup']:7.1f}x {mono.get('voyage_cost', float('nan')):10.2f} "
+                  f"{roll.get('voyage_cost', float('nan')):10.2f}")
+
+def bench_decomposition(fleet_sizes, energy_price=0.5, n_workers=1, rolling_horizon=None,
+                        n_hours=24):
+    """Sequential pipeline (Steps 3-5) vs. FleetPortDecomposition as the fleet grows."""
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_hours)), 0, None)
+    load = 0.7 + 0.2 * np.sin(np.linspace(0, 2 * np.pi, n_hours))
+    profile = [0.15, 0.20, 0.18, 0.22]
+    print(f"energy price {energy_price} $/kWh, workers {n_workers}, "
+          f"master {'rolling ' + str(rolling_horizon) if rolling_horizon else 'monolithic'}")
+    print(f"{'vessels':>8} {'pipeline':>9} {'objective':>11} {'decomp':>8} {'iters':>6} "
+          f"{'columns':>8} {'objective':>11}")
+    for n_vessels in fleet_sizes:
+        fleet = [dataclasses.replace(aes, T_low=10 + aes.vessel_id % 8,
+                                     T_up=13 + aes.vessel_id % 8)
+                 for aes in synthetic_fleet(n_vessels)]
+        optimizer = CoordinatedOptimizer(fleet, example_seaport(), n_workers=n_workers,
+                                         d_route=80.0, rolling_horizon=rolling_horizon)
+        optimizer.voltage_regulator.energy_price = energy_price
+
+        start_time = time.perf_counter()
+        pairs = optimizer.schedule_voyages(profile)
+        filtered = {aes.vessel_id: SatisfactoryIndex.filter_by_threshold(pairs[aes.vessel_id],
+                                                                         aes.beta_k)
+                    for aes in fleet}
+        pipeline = optimizer.voltage_regulator.optimize_voltage_regulation(filtered, pv, load,
+                                                                           fleet)
+        t_pipeline = time.perf_counter() - start_time
+
+        result = FleetPortDecomposition(optimizer, verbose=False).solve(pv, load, profile)
+        columns = result['iterations'][-1]['n_columns'] if result.get('iterations') else 0
+        print(f"{n_vessels:8d} {t_pipeline:9.3f} "
+              f"{pipeline.get('objective_value', float('nan')):11.2f} "
+              f"{result.get('time', float('nan')):8.3f} {len(result.get('iterations', [])):6d} "
+              f"{columns:8d} "
+              f"{result['voltage_control']['objective_value'] if result['success'] else float('nan'):11.2f}")
+
+def bench_solve_cache(fleet_sizes, n_workers=1, n_hours=24):
+    """Cold vs. warm Steps 3-5 through a persistent SolveCache (fresh file per fleet size)."""
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_hours)), 0, None)
+    load = 0.7 + 0.2 * np.sin(np.linspace(0, 2 * np.pi, n_hours))
+    profile = [0.15, 0.20, 0.18, 0.22]
+    print(f"{'vessels':>8} {'cold':>8} {'warm':>8} {'speedup':>8} {'hits':>6} {'misses':>7} "
+          f"{'entries':>8} {'kB':>8}")
+    for n_vessels in fleet_sizes:
+        fleet = synthetic_fleet(n_vessels)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SolveCache(Path(tmp) / "solves.sqlite")
+            optimizer = CoordinatedOptimizer(fleet, example_seaport(), n_workers=n_workers,
+                                             d_route=80.0, cache=cache)
+
+            def run():
+                pairs = optimizer.schedule_voyages(profile)
+                filtered = {aes.vessel_id: SatisfactoryIndex.filter_by_threshold(
+                    pairs[aes.vessel_id], aes.beta_k) for aes in fleet}
+                return optimizer.voltage_regulator.optimize_voltage_regulation(
+                    filtered, pv, load, fleet)
+
+            t_cold, cold = timed(run, repeat=1)
+            t_warm, warm = timed(run, repeat=1)
+            assert warm.get('objective_value') == cold.get('objective_value')
+            stats = cache.stats()
+            cache.close()
+        print(f"{n_vessels:8d} {t_cold:8.3f} {t_warm:8.3f} {t_cold / t_warm:7.1f}x "
+              f"{stats['hits']:6d} {stats['misses']:7d} {stats['entries']:8d} "
+              f"{stats['bytes'] / 1024:8.1f}")
+
+def bench_warm_start(fleet_sizes, days=5, n_hours=24, seed=0):
+    """Fresh berth MILP per day vs. one PersistentRegulator re-solved with each day's inputs."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_hours)
+    regulator = VoltageRegulator(example_seaport())
+    print(f"solver {regulator.solver}, {days} days of perturbed forecasts and pairs")
+    print(f"{'vessels':>8} {'day':>4} {'fresh':>8} {'persist':>8} {'canon':>8} {'saved':>8} "
+          f"{'obj diff':>9}")
+    for n_vessels in fleet_sizes:
+        fleet = synthetic_fleet(n_vessels)
+        base = fleet_pairs(fleet)
+        persistent = PersistentRegulator(regulator)
+        total_fresh = total_persistent = 0.0
+        for day in range(days):
+            pv = np.clip(np.sin(2 * np.pi * (t - 6) / 24), 0, None) * rng.uniform(0.6, 1.0, n_hours)
+            load = (0.7 + 0.2 * np.sin(2 * np.pi * t / 24)) * rng.uniform(0.9, 1.1, n_hours)
+            pairs = {k: [{**pair, 'SOC_a': pair['SOC_a'] * rng.uniform(0.95, 1.05),
+                          'cost': pair['cost'] * rng.uniform(0.95, 1.05)} for pair in candidates]
+                     for k, candidates in base.items()}
+            t_fresh, fresh = timed(regulator.optimize_voltage_regulation, pairs, pv, load, fleet,
+                                   repeat=1)
+            t_persistent, warm = timed(persistent.optimize, pairs, pv, load, fleet, repeat=1)
+            total_fresh += t_fresh
+            total_persistent += t_persistent
+            diff = float('nan')
+            if fresh['success'] and warm['success']:
+                diff = (warm['objective_value'] - fresh['objective_value']) / fresh['objective_value']
+            print(f"{n_vessels:8d} {day:4d} {t_fresh:8.3f} {t_persistent:8.3f} "
+                  f"{warm['timing'].get('canonicalization', 0.0):8.3f} "
+                  f"{t_fresh - t_persistent:8.3f} {diff:9.1e}")
+        print(f"{n_vessels:8d} {'all':>4} {total_fresh:8.3f} {total_persistent:8.3f} {'':>8} "
+              f"{total_fresh - total_persistent:8.3f} "
+              f"({100 * (1 - total_persistent / total_fresh):.0f}% saved)")
+
+def bench_resolution(fleet_sizes, resolutions, n_hours=24, max_wait=1.0):
+    """Dense vs. windowed berth grid of the berth MILP at sub-hourly resolutions."""
+    t = np.arange(n_hours)
+    pv = np.clip(np.sin(2 * np.pi * (t % 24 - 6) / 24), 0, None)
+    load = 0.7 + 0.2 * np.sin(2 * np.pi * t / 24)
+    days = max(n_hours // 24, 1)
+    print(f"max_wait {max_wait} h, {n_hours} h horizon")
+    print(f"{'vessels':>8} {'steps/h':>8} {'dense cells':>12} {'window cells':>13} {'ratio':>7} "
+          f"{'dense (s)':>10} {'window (s)':>11} {'obj dense':>10} {'obj window':>11}")
+    for n_vessels in fleet_sizes:
+        fleet = [dataclasses.replace(aes, T_low=aes.T_low + 24 * (aes.vessel_id % days),
+                                     T_up=aes.T_up + 24 * (aes.vessel_id % days))
+                 for aes in synthetic_fleet(n_vessels)]
+        hourly = fleet_pairs(fleet)
+        for steps_per_hour in resolutions:
+            # Same hourly candidates at every resolution, so objectives are comparable
+            pairs = {k: [{**pair, 'T_a': pair['T_a'] * steps_per_hour} for pair in candidates]
+                     for k, candidates in hourly.items()}
+            row = {}
+            for mode, wait in (('dense', None), ('window', max_wait)):
+                regulator = VoltageRegulator(example_seaport(), steps_per_hour=steps_per_hour,
+                                             max_wait=wait)
+                start_time = time.perf_counter()
+                model = regulator.build_model(pairs, np.repeat(pv, steps_per_hour),
+                                              np.repeat(load, steps_per_hour), fleet)
+                result = regulator.solve_model(model, build_time=time.perf_counter() - start_time)
+                row[mode] = (model['grid'].size, result['timing']['total'],
+                             result.get('objective_value', float('nan')))
+            (dense, t_dense, obj_dense), (window, t_window, obj_window) = row['dense'], row['window']
+            print(f"{n_vessels:8d} {steps_per_hour:8d} {dense:12d} {window:13d} "
+                  f"{dense / max(window, 1):6.1f}x {t_dense:10.3f} {t_window:11.3f} "
+                  f"{obj_dense:10.2f} {obj_window:11.2f}")
+
+def bench_presolve(fleet_sizes, n_hours=24):
+    """Berth MILP size and solve time without and with VoltageRegulator.presolve."""
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_hours)), 0, None)
+    load = 0.7 + 0.2 * np.sin(np.linspace(0, 2 * np.pi, n_hours))
+    print(f"{'vessels':>8} {'presolve':>9} {'vars':>7} {'int vars':>9} {'constr':>8} "
+          f"{'fixed':>6} {'order':>6} {'solve (s)':>10} {'nodes':>7} {'objective':>11}")
+    for n_vessels in fleet_sizes:
+        # Waves of six vessels (two per type) sharing an arrival window, and
+        # pairs drawn per (type, T_a), so same-type vessels are interchangeable
+        fleet = [dataclasses.replace(aes, T_low=2 + 6 * (aes.vessel_id // 6),
+                                     T_up=4 + 6 * (aes.vessel_id // 6))
+                 for aes in synthetic_fleet(n_vessels)]
+        by_type = {}
+        for aes in fleet:
+            by_type.setdefault((aes.vessel_type, aes.T_low), fleet_pairs([aes], seed=aes.vessel_type)
+                               [aes.vessel_id])
+        pairs = {aes.vessel_id: by_type[(aes.vessel_type, aes.T_low)] for aes in fleet}
+        times = {}
+        for presolve in (False, True):
+            regulator = VoltageRegulator(example_seaport(), presolve=presolve)
+            start_time = time.perf_counter()
+            model = regulator.build_model(pairs, pv, load, fleet)
+            result = regulator.solve_model(model, build_time=time.perf_counter() - start_time)
+            metrics = model['problem'].size_metrics
+            report = result.get('presolve', {})
+            n_int = sum(v.size for v in model['problem'].variables()
+                        if v.attributes['boolean'] or v.attributes['integer'])
+            times[presolve] = result['timing'].get('solve', float('nan'))
+            print(f"{n_vessels:8d} {('on' if presolve else 'off'):>9} "
+                  f"{metrics.num_scalar_variables:7d} {n_int:9d} "
+                  f"{metrics.num_scalar_eq_constr + metrics.num_scalar_leq_constr:8d} "
+                  f"{report.get('fixed_y', 0) + report.get('fixed_pairs', 0):6d} "
+                  f"{report.get('ordering_constraints', 0):6d} {times[presolve]:10.3f} "
+                  f"{result.get('mip_nodes', -1):7d} "
+                  f"{result.get('objective_value', float('nan')):11.2f}")
+        if report:
+            print(f"{'':8} {'':9} cells {report['dense_cells']} -> {report['cells']}, "
+                  f"berth classes {report['berth_classes']}, "
+                  f"vessel classes {report['vessel_classes']}, "
+                  f"presolve {report['time']:.3f} s, "
+                  f"solve {times[False] / max(times[True], 1e-9):.1f}x faster")
+
+def bench_trace(n_vessels, n_workers=1, trace=None, chrome=None, profile_step=None,
+                n_hours=24, memory=False):
+    """One traced Algorithm 1 run: per-step wall/CPU time, solver counters and, with
+    ``memory``, peak memory (tracemalloc slows the run several-fold)."""
+    pv = np.clip(np.sin(np.linspace(-np.pi / 2, 3 * np.pi / 2, n_hours)), 0, None)
+    load = 0.7 + 0.2 * np.sin(np.linspace(0, 2 * np.pi, n_hours))
+    fleet = synthetic_fleet(n_vessels)
+    with Tracer(trace, chrome_path=chrome, profile_step=profile_step, memory=memory) as tracer:
+        optimizer = CoordinatedOptimizer(fleet, example_seaport(), n_workers=n_workers,
+                                         d_route=80.0, tracer=tracer)
+        optimizer.run_coordinated_optimization(np.random.default_rng(0).integers(0, 4, (10, 10)),
+                                               pv, load)
+    print()
+    print(tracer.summary())
+    for event in tracer.events:
+        if 'profile' in event:
+            print(f"\ncProfile of {event['step']} written to {event['profile']['path']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AES optimization core")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    p_map = subparsers.add_parser("resistance-map",
+                                  help="RouteOptimizer.generate_resistance_map")
+    p_map.add_argument("--sizes", nargs="+", type=int,
+                       default=[10, 100, 500, 1000, 2000, 4000])
+
+    p_route = subparsers.add_parser("route-search",
+                                    help="RouteOptimizer.dijkstra_route_planning engines")
+    p_route.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 300, 600])
+    p_route.add_argument("--engines", nargs="+", default=list(SEARCH_ENGINES))
+    p_route.add_argument("--diagonal-weighting", action="store_true")
+
+    p_service = subparsers.add_parser("route-service",
+                                      help="Many-to-many queries through RouteService")
+    p_service.add_argument("--size", type=int, default=200)
+    p_service.add_argument("--vessels", type=int, default=50)
+    p_service.add_argument("--origins", type=int, default=5)
+
+    p_incr = subparsers.add_parser("incremental-routing",
+                                   help="IncrementalRouter repair vs. full recompute")
+    p_incr.add_argument("--size", type=int, default=300)
+    p_incr.add_argument("--fractions", nargs="+", type=float,
+                        default=[0.001, 0.01, 0.05, 0.2, 0.5])
+
+    p_voyage = subparsers.add_parser("voyage",
+                                     help="VoyageScheduler.optimize_voyage gradients")
+    p_voyage.add_argument("--hours", nargs="+", type=int, default=[4, 8, 16, 24, 48])
+
+    p_batch = subparsers.add_parser("voyage-batch",
+                                    help="VoyageScheduler.optimize_voyage_batch warm starts")
+    p_batch.add_argument("--slots", type=int, default=24)
+
+    p_fleet = subparsers.add_parser("fleet-scheduling",
+                                    help="CoordinatedOptimizer.schedule_voyages process pool")
+    p_fleet.add_argument("--vessels", type=int, default=200)
+    p_fleet.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8])
+    p_fleet.add_argument("--chunk-size", type=int, default=None,
+                         help="arrival times per job (default: whole windows)")
+    p_fleet.add_argument("--shared", action="store_true",
+                         help="workers write into a shared-memory PackedVoyages buffer")
+
+    p_backends = subparsers.add_parser("voyage-backends",
+                                       help="SLSQP vs. convex CVXPY voyage backend")
+    p_backends.add_argument("--hours", nargs="+", type=int, default=[4, 8, 16, 24, 48])
+
+    p_vmodel = subparsers.add_parser("voltage-model",
+                                     help="VoltageRegulator model build/canonicalize/solve")
+    p_vmodel.add_argument("--vessels", nargs="+", type=int, default=[2, 8, 24, 48])
+    p_vmodel.add_argument("--steps", nargs="+", type=int, default=[24, 96])
+    p_vmodel.add_argument("--no-solve", dest="solve", action="store_false",
+                          help="time the model build only")
+
+    p_milp = subparsers.add_parser("berth-milp",
+                                   help="Linearized berth/charging MILP solve time and gap")
+    p_milp.add_argument("--vessels", nargs="+", type=int, default=[2, 4, 6, 8, 10])
+    p_milp.add_argument("--hours", type=int, default=24)
+
+    p_ldf = subparsers.add_parser("lindistflow",
+                                  help="LinDistFlow volt/var model on growing radial feeders")
+    p_ldf.add_argument("--buses", nargs="+", type=int, default=[16, 50, 100, 200, 500])
+    p_ldf.add_argument("--steps", type=int, default=24)
+
+    p_rolling = subparsers.add_parser("rolling-horizon",
+                                      help="RollingHorizonRegulator vs. monolithic berth MILP")
+    p_rolling.add_argument("--vessels", nargs="+", type=int, default=[4, 8, 16])
+    p_rolling.add_argument("--hours", nargs="+", type=int, default=[24, 48, 96])
+    p_rolling.add_argument("--window", type=int, default=12)
+    p_rolling.add_argument("--stride", type=int, default=6)
+
+    p_decomp = subparsers.add_parser("decomposition",
+                                     help="FleetPortDecomposition vs. the sequential pipeline")
+    p_decomp.add_argument("--vessels", nargs="+", type=int, default=[4, 8, 12])
+    p_decomp.add_argument("--energy-price", type=float, default=0.5)
+    p_decomp.add_argument("--workers", type=int, default=1)
+    p_decomp.add_argument("--window", type=int, default=None,
+                          help="rolling-horizon master with this window (stride = window / 2)")
+
+    p_cache = subparsers.add_parser("solve-cache",
+                                    help="Cold vs. warm pipeline runs through SolveCache")
+    p_cache.add_argument("--vessels", nargs="+", type=int, default=[4, 8, 16])
+    p_cache.add_argument("--workers", type=int, default=1)
+
+    p_warm = subparsers.add_parser("warm-start",
+                                   help="Daily berth MILP solves: fresh model vs. PersistentRegulator")
+    p_warm.add_argument("--vessels", nargs="+", type=int, default=[4, 8, 12])
+    p_warm.add_argument("--days", type=int, default=5)
+
+    p_res = subparsers.add_parser("resolution",
+                                  help="Dense vs. windowed berth grid at sub-hourly steps")
+    p_res.add_argument("--vessels", nargs="+", type=int, default=[4, 8])
+    p_res.add_argument("--steps-per-hour", nargs="+", type=int, default=[1, 4, 12])
+    p_res.add_argument("--hours", type=int, default=24)
+    p_res.add_argument("--max-wait", type=float, default=1.0,
+                       help="hours a vessel may wait for a berth in the windowed grid")
+
+    p_presolve = subparsers.add_parser("presolve",
+                                       help="Berth MILP with and without symmetry-breaking presolve")
+    p_presolve.add_argument("--vessels", nargs="+", type=int, default=[6, 12])
+    p_presolve.add_argument("--hours", type=int, default=24)
+
+    p_trace = subparsers.add_parser("trace",
+                                    help="Per-step timings of one CoordinatedOptimizer run")
+    p_trace.add_argument("--vessels", type=int, default=8)
+    p_trace.add_argument("--workers", type=int, default=1)
+    p_trace.add_argument("--output", default=None, help="JSON-lines trace file (appended)")
+    p_trace.add_argument("--chrome", default=None, help="Chrome trace-event file")
+    p_trace.add_argument("--profile-step", default=None,
+                         choices=["route_planning", "voyage_scheduling", "si_filter",
+                                  "voltage_regulation", "finalize", "algorithm1"],
+                         help="run this step under cProfile")
+    p_trace.add_argument("--memory", action="store_true",
+                         help="peak memory per step via tracemalloc (several-fold slower)")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "resistance-map":
+        bench_resistance_map(args.sizes)
+    elif args.benchmark == "route-search":
+        bench_route_search(args.sizes, args.engines, args.diagonal_weighting)
+    elif args.benchmark == "route-service":
+        bench_route_service(args.size, args.vessels, args.origins)
+    elif args.benchmark == "incremental-routing":
+        bench_incremental_routing(args.size, args.fractions)
+    elif args.benchmark == "voyage":
+        bench_voyage(args.hours)
+    elif args.benchmark == "voyage-batch":
+        bench_voyage_batch(args.slots)
+    elif args.benchmark == "fleet-scheduling":
+        bench_fleet_scheduling(args.vessels, args.workers, args.chunk_size, args.shared)
+    elif args.benchmark == "voyage-backends":
+        bench_voyage_backends(args.hours)
+    elif args.benchmark == "voltage-model":
+        bench_voltage_model(args.vessels, args.steps, solve=args.solve)
+    elif args.benchmark == "berth-milp":
+        bench_berth_milp(args.vessels, args.hours)
+    elif args.benchmark == "lindistflow":
+        bench_lindistflow(args.buses, args.steps)
+    elif args.benchmark == "rolling-horizon":
+        bench_rolling_horizon(args.vessels, args.hours, args.window, args.stride)
+    elif args.benchmark == "decomposition":
+        rolling = (args.window, max(args.window // 2, 1)) if args.window else None
+        bench_decomposition(args.vessels, args.energy_price, args.workers, rolling)
+    elif args.benchmark == "solve-cache":
+        bench_solve_cache(args.vessels, args.workers)
+    elif args.benchmark == "warm-start":
+        bench_warm_start(args.vessels, args.days)
+    elif args.benchmark == "resolution":
+        bench_resolution(args.vessels, args.steps_per_hour, args.hours, args.max_wait)
+    elif args.benchmark == "presolve":
+        bench_presolve(args.vessels, args.hours)
+    elif args.benchmark == "trace":
+        bench_trace(args.vessels, args.workers, args.output, args.chrome, args.profile_step,
+                    memory=args.memory)
+
+if __name__ == "__main__":
+    main()
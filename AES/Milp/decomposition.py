@@ -0,0 +1,155 @@
+"""
+Price-coordinated decomposition of AES voyage scheduling and seaport voltage regulation
+"""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from logic import CandidatePairs, CoordinatedOptimizer, SatisfactoryIndex
+from rolling_horizon import RollingHorizonRegulator
+
+class FleetPortDecomposition:
+    """Column generation between the seaport MILP (master) and AES voyages (subproblems)
+
+    The master is the berth/charging MILP of the optimizer's VoltageRegulator
+    over a pool of T_a-SOC_a columns per vessel. Its energy constraints,
+    re-solved as an LP with the schedule fixed, price each vessel's arrival SOC
+    deficit in $/kWh. The voyage subproblems are then re-solved for every
+    arrival time under that price, in parallel through
+    CoordinatedOptimizer.schedule_voyages, and return columns that trade fuel
+    against ESS discharge. Only the prices and (T_a, SOC_a, cost) columns are
+    exchanged, so AES and port data stay private as in Algorithm 1.
+
+    A column enters the pool if its priced cost (voyage cost + price * energy
+    to restore SOC_target) beats the best pooled column at the same T_a by more
+    than ``tol`` (relative). The loop stops when no column enters, when the
+    master objective changes by less than ``tol``, or after ``max_iter`` rounds.
+    """
+
+    def __init__(self, optimizer: CoordinatedOptimizer, tol: float = 1e-3,
+                 max_iter: int = 10, verbose: bool = True):
+        self.optimizer = optimizer
+        self.tol = tol
+        self.max_iter = max_iter
+        self.verbose = verbose
+
+    def solve(self, pv_forecast: np.ndarray, load_forecast: np.ndarray,
+              resistance_profile: List[float]) -> Dict:
+        """Iterate master and subproblems until the column pool stops improving
+
+        Returns the same layout as CoordinatedOptimizer.run_coordinated_optimization
+        (without routes) plus the final 'energy_prices', per-iteration
+        'iterations' log, 'converged' and total 'time'.
+        """
+        start_time = time.perf_counter()
+        optimizer = self.optimizer
+        fleet = {aes.vessel_id: aes for aes in optimizer.aes_fleet}
+
+        try:
+            columns = optimizer.schedule_voyages(resistance_profile)
+        except RuntimeError as e:
+            print(f"Voyage scheduling failed: {e}")
+            return {'success': False, 'error': str(e)}
+        pool = {vessel_id: SatisfactoryIndex.filter_by_threshold(pairs, fleet[vessel_id].beta_k)
+                for vessel_id, pairs in columns.items()}
+        # Arrival times passengers accept (SI >= beta_k at zero price)
+        allowed = {vessel_id: {pair['T_a'] for pair in pairs} for vessel_id, pairs in pool.items()}
+
+        iterations, prices, previous_objective, converged = [], {}, None, False
+        for iteration in range(1, self.max_iter + 1):
+            t0 = time.perf_counter()
+            result = self._solve_master(pool, pv_forecast, load_forecast)
+            t_master = time.perf_counter() - t0
+            if not result['success']:
+                print(f"Iteration {iteration}: master problem failed")
+                return {'success': False, 'error': 'Master problem failed',
+                        'iterations': iterations}
+
+            t0 = time.perf_counter()
+            prices = optimizer.voltage_regulator.energy_prices(
+                pool, pv_forecast, load_forecast, optimizer.aes_fleet, result)
+            t_pricing = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            try:
+                candidates = optimizer.schedule_voyages(resistance_profile, prices)
+            except RuntimeError as e:
+                print(f"Iteration {iteration}: voyage subproblems failed: {e}")
+                return {'success': False, 'error': str(e), 'iterations': iterations}
+            t_voyages = time.perf_counter() - t0
+
+            added, improvement = self._add_columns(pool, candidates, allowed, prices)
+            objective = result['objective_value']
+            iterations.append({
+                'iteration': iteration, 'objective': objective, 'columns_added': added,
+                'improvement': improvement, 'max_price': max(prices.values(), default=0.0),
+                'n_columns': sum(len(pairs) for pairs in pool.values()),
+                'master_time': t_master, 'pricing_time': t_pricing, 'voyage_time': t_voyages,
+            })
+            if self.verbose:
+                log = iterations[-1]
+                print(f"Iteration {iteration}: objective {objective:.2f}, "
+                      f"{added} columns added (priced gain {improvement:.2f}), "
+                      f"max price {log['max_price']:.4f} $/kWh, master {t_master:.2f}s, "
+                      f"pricing {t_pricing:.2f}s, voyages {t_voyages:.2f}s")
+
+            if added == 0 or (previous_objective is not None and
+                              abs(objective - previous_objective)
+                              <= self.tol * max(abs(previous_objective), 1.0)):
+                converged = True
+                break
+            previous_objective = objective
+
+        strategies = {vessel_id: pool[vessel_id][int(np.argmax(selected))]
+                      for vessel_id, selected in result['vessel_selection'].items()}
+        return {
+            'success': True,
+            'vessel_strategies': strategies,
+            'voltage_control': result,
+            'summary': optimizer._generate_summary(strategies, result),
+            'energy_prices': prices,
+            'iterations': iterations,
+            'converged': converged,
+            'time': time.perf_counter() - start_time,
+        }
+
+    def _solve_master(self, pool: Dict[int, List[Dict]], pv_forecast: np.ndarray,
+                      load_forecast: np.ndarray) -> Dict:
+        """Port MILP over the current pool, rolling-horizon if the optimizer is set up for it"""
+        optimizer = self.optimizer
+        if optimizer.rolling_horizon:
+            return RollingHorizonRegulator(optimizer.voltage_regulator,
+                                           *optimizer.rolling_horizon).optimize(
+                pool, pv_forecast, load_forecast, optimizer.aes_fleet)
+        return optimizer.voltage_regulator.optimize_voltage_regulation(
+            pool, pv_forecast, load_forecast, optimizer.aes_fleet)
+
+    def _add_columns(self, pool: Dict[int, List[Dict]], candidates: Dict[int, List[Dict]],
+                     allowed: Dict[int, set], prices: Dict[int, float]):
+        """Add improving columns to the pool; returns (count, total priced improvement)"""
+        regulator = self.optimizer.voltage_regulator
+        fleet = {aes.vessel_id: aes for aes in self.optimizer.aes_fleet}
+        added, improvement = 0, 0.0
+        for vessel_id, new_columns in candidates.items():
+            price = prices.get(vessel_id, 0.0)
+            E_ESS = fleet[vessel_id].E_ESS
+
+            def priced(pair):
+                return pair['cost'] + price * E_ESS * (regulator.SOC_target - pair['SOC_a'])
+
+            for column in new_columns:
+                incumbents = [priced(pair) for pair in pool.get(vessel_id, [])
+                              if pair['T_a'] == column['T_a']]
+                if column['T_a'] not in allowed.get(vessel_id, ()) or not incumbents:
+                    continue
+                best = min(incumbents)
+                if priced(column) < best - self.tol * max(abs(best), 1.0):
+                    pool[vessel_id].append(column)
+                    added += 1
+                    improvement += best - priced(column)
+
+            if pool.get(vessel_id):
+                CandidatePairs.from_pairs(pool[vessel_id]).compute_SI()
+        return added, improvement
@@ -1,15 +1,18 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from figstyle import results_store
+
 # Data for the chart
 time_points = [10, 11, 12]
-x_labels = ['10', '11', '12']
 
 # SOC_a values for each AES at each time point
-aes1_values = [0.1, 0.1, 0.42]
-aes2_values = [0.1, 0.17, 0.58]
-aes3_values = [0.1, 0.17, 0.58]
-aes4_values = [0.1, 0.36, 0.65]
+soc_values = [
+    [0.1, 0.1, 0.42],    # AES1
+    [0.1, 0.17, 0.58],   # AES2
+    [0.1, 0.17, 0.58],   # AES3
+    [0.1, 0.36, 0.65],   # AES4
+]
 
 # SI values (shown as text on bars)
 si_values = [
@@ -19,58 +22,90 @@ si_values = [
     [0.5, 1, 0]      # AES4
 ]
 
-# Set up the figure
-fig, ax = plt.subplots(figsize=(10, 6))
-
-# Bar width and positions
-bar_width = 0.18
-x_pos = np.arange(len(time_points))
-
-# Colors for each AES
-colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']  # Blue, Orange, Green, Red
-labels = ['AES 1', 'AES 2', 'AES 3', 'AES 4']
-
-# Create bars for each AES
-bars1 = ax.bar(x_pos - 1.5*bar_width, aes1_values, bar_width, 
-               label=labels[0], color=colors[0], edgecolor='black', linewidth=1)
-bars2 = ax.bar(x_pos - 0.5*bar_width, aes2_values, bar_width, 
-               label=labels[1], color=colors[1], edgecolor='black', linewidth=1)
-bars3 = ax.bar(x_pos + 0.5*bar_width, aes3_values, bar_width, 
-               label=labels[2], color=colors[2], edgecolor='black', linewidth=1)
-bars4 = ax.bar(x_pos + 1.5*bar_width, aes4_values, bar_width, 
-               label=labels[3], color=colors[3], edgecolor='black', linewidth=1)
-
-# Add SI values as text on bars
-all_bars = [bars1, bars2, bars3, bars4]
-for i, bars in enumerate(all_bars):
-    for j, bar in enumerate(bars):
-        height = bar.get_height()
-        if height > 0:  # Only add text if bar has height
-            ax.text(bar.get_x() + bar.get_width()/2., height/2, 
-                   f'{si_values[i][j]}', ha='center', va='center', 
-                   fontweight='bold', fontsize=10)
-
-# Customize the plot
-ax.set_xlabel('T_a (h)', fontsize=14)
-ax.set_ylabel('SOC_a', fontsize=14)
-ax.set_title('Fig. 3. T_a-SOC_a pairs and corresponding SI values for all AES', 
-             fontsize=12, pad=20)
-
-# Set x-axis
-ax.set_xticks(x_pos)
-ax.set_xticklabels(x_labels)
-ax.set_xlim(-0.6, 2.6)
-
-# Set y-axis
-ax.set_ylim(0, 0.8)
-ax.set_yticks(np.arange(0, 0.81, 0.2))
-
-# Add legend
-ax.legend(loc='upper left', fontsize=10)
-
-# Add grid
-ax.grid(True, alpha=0.3, axis='y')
-
-# Adjust layout
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+def stored_pairs(store, method='Proposed'):
+    """(time_points, SOC_a rows, SI rows, labels) of every vessel's T_a-SOC_a pairs
+
+    Time points are in hours; arrival times a vessel has no feasible pair for
+    are left at zero.
+    """
+    results = store.load(method if method in store else store.methods()[0])
+    pairs = {vessel_id: results.pairs(vessel_id) for vessel_id in results.vessel_ids}
+    times = sorted({int(T_a) for pair in pairs.values() for T_a in pair['T_a']})
+    soc = np.zeros((len(pairs), len(times)))
+    si = np.zeros((len(pairs), len(times)))
+    for row, pair in enumerate(pairs.values()):
+        columns = np.searchsorted(times, pair['T_a'])
+        soc[row, columns] = pair['SOC_a']
+        si[row, columns] = pair['SI']
+    hours = [T_a / results.steps_per_hour for T_a in times]
+    return hours, soc, si, [f'AES {vessel_id}' for vessel_id in pairs]
+
+def plot(store=None):
+    """Fig. 3: T_a-SOC_a pairs and their SI values for all AES
+
+    Pairs come from ``store`` (default: $AES_RESULTS) when given, otherwise
+    the paper's values are plotted.
+    """
+    store = store or results_store()
+    if store is None:
+        times, soc, si = time_points, soc_values, si_values
+        labels = ['AES 1', 'AES 2', 'AES 3', 'AES 4']
+    else:
+        times, soc, si, labels = stored_pairs(store)
+
+    # Set up the figure
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Bar width and positions
+    bar_width = 0.18
+    x_pos = np.arange(len(times))
+
+    # Colors for each AES
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']  # Blue, Orange, Green, Red
+
+    # Create bars for each AES, centred on each arrival time
+    offsets = (np.arange(len(labels)) - (len(labels) - 1) / 2) * bar_width
+    all_bars = [ax.bar(x_pos + offset, values, bar_width, label=label,
+                       color=colors[i] if i < len(colors) else f'C{i}',
+                       edgecolor='black', linewidth=1)
+                for i, (values, offset, label) in enumerate(zip(soc, offsets, labels))]
+
+    # Add SI values as text on bars
+    for i, bars in enumerate(all_bars):
+        for j, bar in enumerate(bars):
+            height = bar.get_height()
+            if height > 0:  # Only add text if bar has height
+                ax.text(bar.get_x() + bar.get_width()/2., height/2,
+                       f'{si[i][j]:.2g}', ha='center', va='center',
+                       fontweight='bold', fontsize=10)
+
+    # Customize the plot
+    ax.set_xlabel('T_a (h)', fontsize=14)
+    ax.set_ylabel('SOC_a', fontsize=14)
+    ax.set_title('Fig. 3. T_a-SOC_a pairs and corresponding SI values for all AES',
+                 fontsize=12, pad=20)
+
+    # Set x-axis
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels([f'{T_a:g}' for T_a in times])
+    ax.set_xlim(-0.6, len(times) - 0.4)
+
+    # Set y-axis
+    y_max = max(0.8, np.ceil(5 * np.max(soc)) / 5)
+    ax.set_ylim(0, y_max)
+    ax.set_yticks(np.arange(0, y_max + 0.01, 0.2))
+
+    # Add legend
+    ax.legend(loc='upper left', fontsize=10)
+
+    # Add grid
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Adjust layout
+    plt.tight_layout()
+
+    return fig
+
+if __name__ == "__main__":
+    plot()
+    plt.show()
@@ -1,158 +1,104 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Create figure with two subplots
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-
-# Colors for each method
-colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d4af37']  # Blue, Orange, Green, Gold
-methods = ['Method #1', 'Method #2', 'Method #3', 'Proposed']
+from figstyle import (METHODS, aes_sections, method_bars, panel_label, results_store,
+                      stored_methods, voyage_sections)
 
 # Time points for each AES (8, 9, 10, 11 for each AES section)
 time_base = np.array([8, 9, 10, 11])
 
-# Bar width and positions
+# Bar width
 bar_width = 0.2
-x_positions = np.arange(len(time_base))
-
-# --- SUBPLOT (a): DSGs Data ---
-# AES 1 - DSGs
-dsg_aes1_method1 = [120, 110, 120, 110]
-dsg_aes1_method2 = [130, 130, 130, 130]
-dsg_aes1_method3 = [100, 90, 100, 90]
-dsg_aes1_proposed = [90, 80, 90, 80]
-
-# AES 2 - DSGs  
-dsg_aes2_method1 = [150, 140, 150, 140]
-dsg_aes2_method2 = [160, 160, 160, 160]
-dsg_aes2_method3 = [130, 120, 130, 120]
-dsg_aes2_proposed = [120, 110, 120, 110]
-
-# AES 3 - DSGs
-dsg_aes3_method1 = [140, 130, 140, 130]
-dsg_aes3_method2 = [150, 150, 150, 150]
-dsg_aes3_method3 = [120, 110, 120, 110]
-dsg_aes3_proposed = [110, 100, 110, 100]
-
-# AES 4 - DSGs
-dsg_aes4_method1 = [180, 320, 400, 180]
-dsg_aes4_method2 = [190, 300, 390, 190]
-dsg_aes4_method3 = [170, 310, 380, 170]
-dsg_aes4_proposed = [160, 290, 370, 160]
-
-# Plot DSGs data
-aes_sections = [
-    (dsg_aes1_method1, dsg_aes1_method2, dsg_aes1_method3, dsg_aes1_proposed),
-    (dsg_aes2_method1, dsg_aes2_method2, dsg_aes2_method3, dsg_aes2_proposed),
-    (dsg_aes3_method1, dsg_aes3_method2, dsg_aes3_method3, dsg_aes3_proposed),
-    (dsg_aes4_method1, dsg_aes4_method2, dsg_aes4_method3, dsg_aes4_proposed)
+
+# DSG power of Method #1, #2, #3 and Proposed for each AES
+dsg_sections = [
+    ([120, 110, 120, 110], [130, 130, 130, 130], [100, 90, 100, 90], [90, 80, 90, 80]),
+    ([150, 140, 150, 140], [160, 160, 160, 160], [130, 120, 130, 120], [120, 110, 120, 110]),
+    ([140, 130, 140, 130], [150, 150, 150, 150], [120, 110, 120, 110], [110, 100, 110, 100]),
+    ([180, 320, 400, 180], [190, 300, 390, 190], [170, 310, 380, 170], [160, 290, 370, 160]),
 ]
 
-for aes_idx, (m1, m2, m3, prop) in enumerate(aes_sections):
-    x_offset = aes_idx * 4
-    x_pos = x_positions + x_offset
-    
-    ax1.bar(x_pos - 1.5*bar_width, m1, bar_width, color=colors[0], 
-            edgecolor='black', linewidth=0.5, label=methods[0] if aes_idx == 0 else "")
-    ax1.bar(x_pos - 0.5*bar_width, m2, bar_width, color=colors[1], 
-            edgecolor='black', linewidth=0.5, label=methods[1] if aes_idx == 0 else "")
-    ax1.bar(x_pos + 0.5*bar_width, m3, bar_width, color=colors[2], 
-            edgecolor='black', linewidth=0.5, label=methods[2] if aes_idx == 0 else "")
-    ax1.bar(x_pos + 1.5*bar_width, prop, bar_width, color=colors[3], 
-            edgecolor='black', linewidth=0.5, label=methods[3] if aes_idx == 0 else "")
-
-# --- SUBPLOT (b): ESS Data ---
-# AES 1 - ESS
-ess_aes1_method1 = [32, 35, 30, 40]
-ess_aes1_method2 = [15, 18, 12, 25]
-ess_aes1_method3 = [10, 12, 8, 20]
-ess_aes1_proposed = [8, 10, 6, 18]
-
-# AES 2 - ESS
-ess_aes2_method1 = [45, 42, 48, 40]
-ess_aes2_method2 = [20, 22, 18, 25]
-ess_aes2_method3 = [15, 17, 13, 20]
-ess_aes2_proposed = [12, 14, 10, 18]
-
-# AES 3 - ESS  
-ess_aes3_method1 = [48, 45, 42, 40]
-ess_aes3_method2 = [18, 20, 15, 22]
-ess_aes3_method3 = [12, 15, 10, 18]
-ess_aes3_proposed = [10, 12, 8, 15]
-
-# AES 4 - ESS
-ess_aes4_method1 = [45, 60, 95, 40]
-ess_aes4_method2 = [25, 65, 90, 35]
-ess_aes4_method3 = [20, 58, 85, 30]
-ess_aes4_proposed = [18, 55, 80, 25]
-
-# Plot ESS data
+# ESS discharge power of Method #1, #2, #3 and Proposed for each AES
 ess_sections = [
-    (ess_aes1_method1, ess_aes1_method2, ess_aes1_method3, ess_aes1_proposed),
-    (ess_aes2_method1, ess_aes2_method2, ess_aes2_method3, ess_aes2_proposed),
-    (ess_aes3_method1, ess_aes3_method2, ess_aes3_method3, ess_aes3_proposed),
-    (ess_aes4_method1, ess_aes4_method2, ess_aes4_method3, ess_aes4_proposed)
+    ([32, 35, 30, 40], [15, 18, 12, 25], [10, 12, 8, 20], [8, 10, 6, 18]),
+    ([45, 42, 48, 40], [20, 22, 18, 25], [15, 17, 13, 20], [12, 14, 10, 18]),
+    ([48, 45, 42, 40], [18, 20, 15, 22], [12, 15, 10, 18], [10, 12, 8, 15]),
+    ([45, 60, 95, 40], [25, 65, 90, 35], [20, 58, 85, 30], [18, 55, 80, 25]),
 ]
 
-for aes_idx, (m1, m2, m3, prop) in enumerate(ess_sections):
-    x_offset = aes_idx * 4
-    x_pos = x_positions + x_offset
-    
-    ax2.bar(x_pos - 1.5*bar_width, m1, bar_width, color=colors[0], 
-            edgecolor='black', linewidth=0.5, label=methods[0] if aes_idx == 0 else "")
-    ax2.bar(x_pos - 0.5*bar_width, m2, bar_width, color=colors[1], 
-            edgecolor='black', linewidth=0.5, label=methods[1] if aes_idx == 0 else "")
-    ax2.bar(x_pos + 0.5*bar_width, m3, bar_width, color=colors[2], 
-            edgecolor='black', linewidth=0.5, label=methods[2] if aes_idx == 0 else "")
-    ax2.bar(x_pos + 1.5*bar_width, prop, bar_width, color=colors[3], 
-            edgecolor='black', linewidth=0.5, label=methods[3] if aes_idx == 0 else "")
-
-# Add vertical dashed lines to separate AES sections
-for ax in [ax1, ax2]:
-    ax.axvline(x=3.5, color='black', linestyle='--', linewidth=1)
-    ax.axvline(x=7.5, color='black', linestyle='--', linewidth=1)
-    ax.axvline(x=11.5, color='black', linestyle='--', linewidth=1)
-
-# Add AES section labels with arrows
-arrow_props = dict(arrowstyle='<->', color='black', lw=1.5)
-
-for ax in [ax1, ax2]:
-    # AES labels
-    ax.text(1.5, ax.get_ylim()[1]*0.95, 'AES 1', ha='center', fontsize=11, weight='bold')
-    ax.text(5.5, ax.get_ylim()[1]*0.95, 'AES 2', ha='center', fontsize=11, weight='bold')
-    ax.text(9.5, ax.get_ylim()[1]*0.95, 'AES 3', ha='center', fontsize=11, weight='bold')
-    ax.text(13.5, ax.get_ylim()[1]*0.95, 'AES 4', ha='center', fontsize=11, weight='bold')
-    
-    # Arrows
-    y_arrow = ax.get_ylim()[1]*0.88
-    ax.annotate('', xy=(3.5, y_arrow), xytext=(-0.5, y_arrow), arrowprops=arrow_props)
-    ax.annotate('', xy=(7.5, y_arrow), xytext=(3.5, y_arrow), arrowprops=arrow_props)
-    ax.annotate('', xy=(11.5, y_arrow), xytext=(7.5, y_arrow), arrowprops=arrow_props)
-    ax.annotate('', xy=(15.5, y_arrow), xytext=(11.5, y_arrow), arrowprops=arrow_props)
-
-# Customize subplot (a) - DSGs
-ax1.set_ylabel('P (kW)', fontsize=12)
-ax1.set_ylim(0, 400)
-ax1.set_xticks(np.arange(16))
-ax1.set_xticklabels(['8', '9', '10', '11'] * 4)
-ax1.legend(loc='upper left', fontsize=10)
-ax1.grid(True, alpha=0.3)
-ax1.text(0.02, 0.95, '(a)', transform=ax1.transAxes, fontsize=12, weight='bold')
-
-# Customize subplot (b) - ESS  
-ax2.set_xlabel('Time (h)', fontsize=12)
-ax2.set_ylabel('P (kW)', fontsize=12)
-ax2.set_ylim(0, 100)
-ax2.set_xticks(np.arange(16))
-ax2.set_xticklabels(['8', '9', '10', '11'] * 4)
-ax2.legend(loc='upper left', fontsize=10)
-ax2.grid(True, alpha=0.3)
-ax2.text(0.02, 0.95, '(b)', transform=ax2.transAxes, fontsize=12, weight='bold')
-
-# Add main title
-fig.suptitle('Fig. 6. Generation scheduling of AES during the voyage scheduling under\ndifferent methods: (a) DSGs, (b) ESS', 
-             fontsize=12, y=0.02)
-
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.15)
-plt.show()
\ No newline at end of file
+def _limit(sections, step=50):
+    """Rounded-up axis limit above the largest stored power"""
+    peak = max(np.max(values) for _, series in sections for values in series)
+    return max(step, step * np.ceil(1.15 * peak / step))
+
+def plot(store=None):
+    """Fig. 6: DSG and ESS scheduling during the voyage under each method
+
+    Powers come from ``store`` (default: $AES_RESULTS) when given, otherwise
+    the paper's values are plotted.
+    """
+    store = store or results_store()
+    if store is None:
+        methods, vessel_ids = METHODS, None
+        dsg = [(time_base, series) for series in dsg_sections]
+        ess = [(time_base, series) for series in ess_sections]
+        limits = (400, 100)
+    else:
+        stored = stored_methods(store)
+        methods = list(stored)
+        by_vessel = voyage_sections(stored, 'P_DSG_profile')
+        vessel_ids, dsg = list(by_vessel), list(by_vessel.values())
+        ess = list(voyage_sections(stored, 'P_dis_profile').values())
+        limits = (_limit(dsg), _limit(ess, step=10))
+
+    # One section of len(hours) bar groups per AES
+    starts = np.cumsum([0] + [len(hours) for hours, _ in dsg])
+    edges = list(starts - 0.5)
+    hour_labels = [str(hour) for hours, _ in dsg for hour in hours]
+
+    # Create figure with two subplots
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+
+    # (a) DSGs and (b) ESS, one bar per method, hour and AES
+    for ax, sections in [(ax1, dsg), (ax2, ess)]:
+        for aes_idx, (hours, series) in enumerate(sections):
+            method_bars(ax, starts[aes_idx] + np.arange(len(hours)), series, bar_width,
+                        label=aes_idx == 0, methods=methods)
+
+    # Separate the AES sections; the paper's labels follow the autoscaled limits
+    for ax, limit in [(ax1, limits[0]), (ax2, limits[1])]:
+        y_max = ax.get_ylim()[1] if store is None else limit
+        aes_sections(ax, edges, label_y=y_max * 0.95, arrow_y=y_max * 0.88, fontsize=11,
+                     vessel_ids=vessel_ids)
+
+    # Customize subplot (a) - DSGs
+    ax1.set_ylabel('P (kW)', fontsize=12)
+    ax1.set_ylim(0, limits[0])
+    ax1.set_xticks(np.arange(starts[-1]))
+    ax1.set_xticklabels(hour_labels)
+    ax1.legend(loc='upper left', fontsize=10)
+    ax1.grid(True, alpha=0.3)
+    panel_label(ax1, 'a')
+
+    # Customize subplot (b) - ESS
+    ax2.set_xlabel('Time (h)', fontsize=12)
+    ax2.set_ylabel('P (kW)', fontsize=12)
+    ax2.set_ylim(0, limits[1])
+    ax2.set_xticks(np.arange(starts[-1]))
+    ax2.set_xticklabels(hour_labels)
+    ax2.legend(loc='upper left', fontsize=10)
+    ax2.grid(True, alpha=0.3)
+    panel_label(ax2, 'b')
+
+    # Add main title
+    fig.suptitle('Fig. 6. Generation scheduling of AES during the voyage scheduling under\ndifferent methods: (a) DSGs, (b) ESS',
+                 fontsize=12, y=0.02)
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)
+
+    return fig
+
+if __name__ == "__main__":
+    plot()
+    plt.show()
@@ -1,18 +1,12 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Create figure with 3 subplots
-fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 12))
+from figstyle import METHODS, panel_label, plot_methods, results_store, stored_methods
 
 # Time data
 time = np.arange(0, 25, 1)
 
-# Colors for each method
-colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d4af37']  # Blue, Orange, Green, Gold
-methods = ['Method #1', 'Method #2', 'Method #3', 'Proposed']
-
-# --- SUBPLOT (a): OLTC Tap positions ---
-# Create step-like data for tap positions
+# --- (a): OLTC tap positions (step-like) ---
 method1_tap = np.zeros(25)
 method1_tap[10:20] = 2
 method1_tap[20:] = 1
@@ -28,24 +22,7 @@ proposed_tap = np.zeros(25)
 proposed_tap[4:8] = -1
 proposed_tap[20:] = -1
 
-# Plot tap positions with step plots
-ax1.step(time, method1_tap, where='post', color=colors[0], linewidth=2, label=methods[0])
-ax1.step(time, method2_tap, where='post', color=colors[1], linewidth=2, label=methods[1])
-ax1.step(time, method3_tap, where='post', color=colors[2], linewidth=2, label=methods[2])
-ax1.step(time, proposed_tap, where='post', color=colors[3], linewidth=2, label=methods[3])
-
-# Customize subplot (a)
-ax1.set_xlim(0, 25)
-ax1.set_ylim(-2, 2)
-ax1.set_ylabel('Tap', fontsize=12)
-ax1.set_yticks([-1, 0, 1, 2])
-ax1.grid(True, alpha=0.3)
-ax1.legend(loc='upper right', fontsize=10)
-ax1.text(0.02, 0.9, '(a)', transform=ax1.transAxes, fontsize=12, weight='bold')
-ax1.set_xticks(np.arange(0, 26, 5))
-
-# --- SUBPLOT (b): Reactive power of PV 4 ---
-# Create reactive power data with annotations
+# --- (b): Reactive power of PV 4 ---
 method1_q = np.full(25, 8.0)
 method1_q[10:12] = [5, 0]
 method1_q[12:15] = [-5, -10, -15]
@@ -59,34 +36,7 @@ method3_q[9:14] = [15, 25, 20, 10, 5]
 proposed_q = np.full(25, 8.0)
 proposed_q[9:14] = [10, 8, 12, 15, 10]
 
-# Plot reactive power
-ax2.plot(time, method1_q, color=colors[0], linewidth=2, label=methods[0])
-ax2.plot(time, method2_q, color=colors[1], linewidth=2, label=methods[1])
-ax2.plot(time, method3_q, color=colors[2], linewidth=2, label=methods[2])
-ax2.plot(time, proposed_q, color=colors[3], linewidth=2, label=methods[3])
-
-# Add annotations
-ax2.annotate('Provide extra Q to mitigate\nvoltage drop', 
-             xy=(11, 20), xytext=(16, 22),
-             arrowprops=dict(arrowstyle='->', color='black', lw=1),
-             fontsize=10, ha='center')
-
-ax2.annotate('Absorb Q to reduce voltages', 
-             xy=(12.5, -10), xytext=(16, -8),
-             arrowprops=dict(arrowstyle='->', color='black', lw=1),
-             fontsize=10, ha='center')
-
-# Customize subplot (b)
-ax2.set_xlim(0, 25)
-ax2.set_ylim(-15, 30)
-ax2.set_ylabel('Q (kVar)', fontsize=12)
-ax2.grid(True, alpha=0.3)
-ax2.legend(loc='upper left', fontsize=10)
-ax2.text(0.02, 0.9, '(b)', transform=ax2.transAxes, fontsize=12, weight='bold')
-ax2.set_xticks(np.arange(0, 26, 5))
-
-# --- SUBPLOT (c): Charging power of AES ---
-# Create charging power profiles
+# --- (c): Charging power of AES ---
 method1_power = np.zeros(25)
 method1_power[10:17] = [0, 50, 150, 200, 180, 100, 0]
 
@@ -99,33 +49,122 @@ method3_power[10:17] = [100, 200, 260, 200, 160, 80, 0]
 proposed_power = np.zeros(25)
 proposed_power[9:17] = [80, 160, 200, 180, 190, 160, 100, 20]
 
-# Plot charging power
-ax3.plot(time, method1_power, color=colors[0], linewidth=2, label=methods[0])
-ax3.plot(time, method2_power, color=colors[1], linewidth=2, label=methods[1])
-ax3.plot(time, method3_power, color=colors[2], linewidth=2, label=methods[2])
-ax3.plot(time, proposed_power, color=colors[3], linewidth=2, label=methods[3])
-
-# Add annotation
-ax3.annotate('Trade-off between Method\n#1 and Method #2', 
-             xy=(13, 180), xytext=(18, 220),
-             arrowprops=dict(arrowstyle='->', color='black', lw=1),
-             fontsize=10, ha='center')
-
-# Customize subplot (c)
-ax3.set_xlim(0, 25)
-ax3.set_ylim(0, 300)
-ax3.set_xlabel('Time (h)', fontsize=12)
-ax3.set_ylabel('P (kW)', fontsize=12)
-ax3.grid(True, alpha=0.3)
-ax3.legend(loc='upper left', fontsize=10)
-ax3.text(0.02, 0.9, '(c)', transform=ax3.transAxes, fontsize=12, weight='bold')
-ax3.set_xticks(np.arange(0, 26, 5))
-
-# Add main title
-fig.suptitle('Fig. 9. Dispatch of OLTC, PVs and AES in seaport microgrids under different\nmethods: (a) OLTC, (b) Reactive power of PV 4, (c) Charging power of AES', 
-             fontsize=12, y=0.02, ha='center')
-
-# Adjust layout
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.15)
-plt.show()
\ No newline at end of file
+def stored_dispatch(store, pv_index=3):
+    """(methods, hours, taps, PV reactive powers, total charging powers) from a ResultsStore
+
+    Methods run at a coarser resolution hold each value over their step, so all
+    series share the finest stored step.
+    """
+    stored = stored_methods(store)
+    steps_per_hour = max(results.steps_per_hour for results in stored.values())
+    repeats = [steps_per_hour // results.steps_per_hour for results in stored.values()]
+    taps = [np.repeat(results['tap'], k) for results, k in zip(stored.values(), repeats)]
+    q_pv = [np.repeat(results['Q_PV'][min(pv_index, results['Q_PV'].shape[0] - 1)], k)
+            for results, k in zip(stored.values(), repeats)]
+    charging = [np.repeat(np.asarray(results['P_ch']).sum(axis=(0, 1)), k)
+                for results, k in zip(stored.values(), repeats)]
+    n_steps = min(len(values) for values in taps)
+    hours = np.arange(n_steps) / steps_per_hour
+    return (list(stored), hours, [values[:n_steps] for values in taps],
+            [values[:n_steps] for values in q_pv], [values[:n_steps] for values in charging])
+
+def _range(series, low, high, margin=0.1):
+    """Axis range covering the stored series with a margin, at least (low, high)"""
+    lo = min(np.min(values) for values in series)
+    hi = max(np.max(values) for values in series)
+    pad = margin * max(hi - lo, 1.0)
+    return min(low, np.floor(lo - pad)), max(high, np.ceil(hi + pad))
+
+def plot(store=None):
+    """Fig. 9: OLTC, PV 4 reactive power and AES charging under each method
+
+    Dispatch comes from ``store`` (default: $AES_RESULTS) when given, otherwise
+    the paper's values (and their annotations) are plotted.
+    """
+    store = store or results_store()
+    if store is None:
+        methods = METHODS
+        taps = [method1_tap, method2_tap, method3_tap, proposed_tap]
+        q_pv = [method1_q, method2_q, method3_q, proposed_q]
+        charging = [method1_power, method2_power, method3_power, proposed_power]
+        hours, limits = time, [(-2, 2), (-15, 30), (0, 300)]
+        x_max = len(hours)
+    else:
+        methods, hours, taps, q_pv, charging = stored_dispatch(store)
+        x_max = len(hours) * (hours[1] if len(hours) > 1 else 1)
+        limits = [_range(taps, -2, 2), _range(q_pv, -15, 30), _range(charging, 0, 300)]
+
+    # Create figure with 3 subplots
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 12))
+
+    # Plot tap positions with step plots
+    plot_methods(ax1, hours, taps, kind='step', where='post', methods=methods)
+
+    # Customize subplot (a)
+    ax1.set_xlim(0, x_max)
+    ax1.set_ylim(*limits[0])
+    ax1.set_ylabel('Tap', fontsize=12)
+    if store is None:
+        ax1.set_yticks([-1, 0, 1, 2])
+    ax1.grid(True, alpha=0.3)
+    ax1.legend(loc='upper right', fontsize=10)
+    panel_label(ax1, 'a', y=0.9)
+    ax1.set_xticks(np.arange(0, x_max + 1, 5))
+
+    # Plot reactive power
+    plot_methods(ax2, hours, q_pv, methods=methods)
+
+    # Add annotations
+    if store is None:
+        ax2.annotate('Provide extra Q to mitigate\nvoltage drop',
+                     xy=(11, 20), xytext=(16, 22),
+                     arrowprops=dict(arrowstyle='->', color='black', lw=1),
+                     fontsize=10, ha='center')
+
+        ax2.annotate('Absorb Q to reduce voltages',
+                     xy=(12.5, -10), xytext=(16, -8),
+                     arrowprops=dict(arrowstyle='->', color='black', lw=1),
+                     fontsize=10, ha='center')
+
+    # Customize subplot (b)
+    ax2.set_xlim(0, x_max)
+    ax2.set_ylim(*limits[1])
+    ax2.set_ylabel('Q (kVar)', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='upper left', fontsize=10)
+    panel_label(ax2, 'b', y=0.9)
+    ax2.set_xticks(np.arange(0, x_max + 1, 5))
+
+    # Plot charging power
+    plot_methods(ax3, hours, charging, methods=methods)
+
+    # Add annotation
+    if store is None:
+        ax3.annotate('Trade-off between Method\n#1 and Method #2',
+                     xy=(13, 180), xytext=(18, 220),
+                     arrowprops=dict(arrowstyle='->', color='black', lw=1),
+                     fontsize=10, ha='center')
+
+    # Customize subplot (c)
+    ax3.set_xlim(0, x_max)
+    ax3.set_ylim(*limits[2])
+    ax3.set_xlabel('Time (h)', fontsize=12)
+    ax3.set_ylabel('P (kW)', fontsize=12)
+    ax3.grid(True, alpha=0.3)
+    ax3.legend(loc='upper left', fontsize=10)
+    panel_label(ax3, 'c', y=0.9)
+    ax3.set_xticks(np.arange(0, x_max + 1, 5))
+
+    # Add main title
+    fig.suptitle('Fig. 9. Dispatch of OLTC, PVs and AES in seaport microgrids under different\nmethods: (a) OLTC, (b) Reactive power of PV 4, (c) Charging power of AES',
+                 fontsize=12, y=0.02, ha='center')
+
+    # Adjust layout
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)
+
+    return fig
+
+if __name__ == "__main__":
+    plot()
+    plt.show()
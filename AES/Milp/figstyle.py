@@ -0,0 +1,108 @@
+"""
+Shared style for the paper figures (fig2.py to fig12.py): method/AES colors and labels,
+per-AES section separators, legend handles and access to a ResultsStore
+"""
+
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Methods compared in Figs. 5-9 and the AES they schedule share one palette
+COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d4af37']  # Blue, Orange, Green, Gold
+METHODS = ['Method #1', 'Method #2', 'Method #3', 'Proposed']
+AES_LABELS = ['AES 1', 'AES 2', 'AES 3', 'AES 4']
+METHOD_COLORS = dict(zip(METHODS, COLORS))
+AES_COLORS = dict(zip(AES_LABELS, COLORS))
+
+SECTION_ARROW = dict(arrowstyle='<->', color='black', lw=1.5)
+
+# ResultsStore directory the data-driven figures read (see results_store.py)
+RESULTS_ENV = 'AES_RESULTS'
+
+def results_store():
+    """ResultsStore named by $AES_RESULTS, or None to plot the paper's numbers"""
+    path = os.environ.get(RESULTS_ENV)
+    if not path:
+        return None
+    from results_store import ResultsStore
+    store = ResultsStore(path)
+    return store if store.methods() else None
+
+def stored_methods(store):
+    """{method: MethodResults} of a store, in METHODS order followed by any others"""
+    names = store.methods()
+    ordered = [m for m in METHODS if m in names] + [m for m in names if m not in METHODS]
+    return {method: store.load(method) for method in ordered}
+
+def method_color(method, index=0):
+    return METHOD_COLORS.get(method, f'C{index + len(COLORS)}')
+
+def plot_methods(ax, x, series, kind='plot', label=True, methods=METHODS, **kwargs):
+    """One line per method (series in ``methods`` order); kind='step' for step plots"""
+    draw = getattr(ax, kind)
+    for index, (values, method) in enumerate(zip(series, methods)):
+        draw(x, values, color=method_color(method, index), linewidth=2,
+             label=method if label else None, **kwargs)
+
+def method_bars(ax, x, series, width, label=True, methods=METHODS, **kwargs):
+    """Grouped bars, one per method (series in ``methods`` order), centred on x"""
+    offsets = (np.arange(len(series)) - (len(series) - 1) / 2) * width
+    for index, (values, offset, method) in enumerate(zip(series, offsets, methods)):
+        ax.bar(x + offset, values, width, color=method_color(method, index), edgecolor='black',
+               linewidth=0.5, label=method if label else "", **kwargs)
+
+def voyage_sections(methods, name):
+    """{vessel_id: (hours, [values per method])} of a voyage profile
+
+    Hours span every method's voyage of the vessel at the finest stored
+    resolution; each series is zero outside its own voyage (and for methods
+    that did not schedule the vessel).
+    """
+    sections = {}
+    vessel_ids = sorted({v for results in methods.values() for v in results.vessel_ids})
+    for vessel_id in vessel_ids:
+        profiles = [results.profile(name, vessel_id) if vessel_id in results.vessel_ids
+                    else (np.arange(0), np.zeros(0)) for results in methods.values()]
+        voyages = [(hours, 1 / results.steps_per_hour)
+                   for results, (hours, _) in zip(methods.values(), profiles) if len(hours)]
+        if not voyages:
+            continue
+        step = min(duration for _, duration in voyages)
+        first = min(h[0] for h, _ in voyages)
+        end = max(h[-1] + duration for h, duration in voyages)
+        hours = first + step * np.arange(int(round((end - first) / step)))
+        series = []
+        for results, (voyage_hours, values) in zip(methods.values(), profiles):
+            row = np.zeros(len(hours))
+            if len(values):
+                # Coarser runs hold each value over their step
+                repeat = int(round(1 / results.steps_per_hour / step))
+                start = int(round((voyage_hours[0] - first) / step))
+                row[start:start + repeat * len(values)] = np.repeat(values, repeat)
+            series.append(row)
+        sections[vessel_id] = (hours, series)
+    return sections
+
+def aes_sections(ax, edges, label_y, arrow_y, fontsize=12, vessel_ids=None):
+    """Dashed separators, '<->' spans and bold 'AES k' labels for per-vessel sections
+
+    ``edges`` are the n + 1 section boundaries of n vessels in data coordinates;
+    vessels are numbered 1..n unless ``vessel_ids`` are given.
+    """
+    for x in edges[1:-1]:
+        ax.axvline(x=x, color='black', linestyle='--', linewidth=1)
+    vessel_ids = vessel_ids or range(1, len(edges))
+    for k, left, right in zip(vessel_ids, edges[:-1], edges[1:]):
+        ax.annotate(f'AES {k}', xy=((left + right) / 2, label_y), ha='center',
+                    fontsize=fontsize, weight='bold')
+        ax.annotate('', xy=(right, arrow_y), xytext=(left, arrow_y), arrowprops=SECTION_ARROW)
+
+def panel_label(ax, label, y=0.95):
+    """Bold '(a)'-style subplot label in the upper left corner"""
+    ax.text(0.02, y, f'({label})', transform=ax.transAxes, fontsize=12, weight='bold')
+
+def legend_handles(colors=AES_COLORS, **kwargs):
+    """Rectangle patches for a {label: color} legend"""
+    return [plt.Rectangle((0, 0), 1, 1, facecolor=color, label=label, **kwargs)
+            for label, color in colors.items()]
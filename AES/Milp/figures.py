@@ -0,0 +1,40 @@
+"""
+In-process rendering of the paper figures (fig2.py to fig12.py)
+
+Each figN module builds its figure in ``plot()``; importing it once and
+calling ``render`` repeatedly avoids a new interpreter (and numpy/matplotlib
+import) per figure.
+"""
+
+import importlib
+import io
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+FIGURE_NUMBERS = range(2, 13)
+
+def figure_module(fig_number: int):
+    """The imported figN module (cached in sys.modules after the first call)"""
+    if fig_number not in FIGURE_NUMBERS:
+        raise ValueError(f"No figure {fig_number}; expected one of "
+                         f"{FIGURE_NUMBERS.start}-{FIGURE_NUMBERS.stop - 1}")
+    return importlib.import_module(f"fig{fig_number}")
+
+def render(fig_number: int, output_path=None, fmt: str = None, dpi: int = 150):
+    """Draw figure ``fig_number`` and save it
+
+    With ``output_path`` the figure is written there (format from ``fmt`` or
+    the file suffix) and the path is returned; without it the encoded image
+    (``fmt``, default png) is returned as bytes. The figure is closed either way.
+    """
+    fig = figure_module(fig_number).plot()
+    try:
+        if output_path is None:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt or "png", dpi=dpi)
+            return buffer.getvalue()
+        fig.savefig(output_path, format=fmt, dpi=dpi)
+        return str(Path(output_path))
+    finally:
+        plt.close(fig)
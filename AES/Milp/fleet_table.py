@@ -0,0 +1,98 @@
+"""
+Columnar AES fleet: one NumPy array per AESParameters field
+"""
+
+import dataclasses
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from logic import AESParameters
+
+TABLE_II = Path(__file__).parent / "table_II.csv"
+TABLE_III = Path(__file__).parent / "table_III.csv"
+
+# Column dtypes follow the AESParameters annotations
+FIELDS = {f.name: (np.int64 if f.type in (int, 'int') else np.float64)
+          for f in dataclasses.fields(AESParameters)}
+
+class FleetTable:
+    """AES fleet stored column-wise
+
+    A fleet of n vessels is len(FIELDS) arrays of length n instead of n
+    dataclass instances, so it pickles to a few buffers and whole-fleet
+    edits are array operations. Indexing and iteration build AESParameters
+    on demand, so a FleetTable can be passed wherever a fleet list is.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        missing = set(FIELDS) - set(columns)
+        if missing:
+            raise ValueError(f"FleetTable is missing columns: {sorted(missing)}")
+        self.columns = {name: np.array(columns[name], dtype=dtype)
+                        for name, dtype in FIELDS.items()}
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("FleetTable columns differ in length")
+
+    @classmethod
+    def from_fleet(cls, fleet: Sequence[AESParameters]) -> 'FleetTable':
+        return cls({name: [getattr(aes, name) for aes in fleet] for name in FIELDS})
+
+    @classmethod
+    def from_tables(cls, devices=TABLE_II, berths=TABLE_III, n_vessels: int = None,
+                    T_low=10, T_up=12, beta_k=0.5, c0: float = 3.02e-5, c1: float = 0.37,
+                    c2: float = 0.01, TC_ESS: float = 600) -> 'FleetTable':
+        """Fleet of Tables II/III (ESS rows carry E_ESS in the ramp column)
+
+        With ``n_vessels`` the table's vessels are repeated cyclically and
+        numbered 1..n_vessels. T_low, T_up and beta_k may be scalars or arrays
+        of length n_vessels.
+        """
+        devices, berths = pd.read_csv(devices), pd.read_csv(berths)
+        dsg = devices[devices["Device"] == "DSG"].set_index("Vessel").sort_index()
+        ess = devices[devices["Device"] == "ESS"].set_index("Vessel").sort_index()
+        base = len(dsg)
+        n = base if n_vessels is None else n_vessels
+        rows = np.arange(n) % base
+        P_sv2 = np.array([float(berths[f"Psv2_{vessel}_kW"].iloc[0]) for vessel in dsg.index])
+        columns = {
+            'vessel_id': np.arange(1, n + 1),
+            'P_DSG_max': dsg["Pmax_kW"].to_numpy()[rows],
+            'P_DSG_min': dsg["Pmin_kW"].to_numpy()[rows],
+            'P_ramp': dsg["Pramp_EESS_kW"].to_numpy()[rows],
+            'E_ESS': ess["Pramp_EESS_kW"].to_numpy()[rows],
+            'P_dis_max': ess["Pmax_kW"].to_numpy()[rows],
+            'P_dis_min': ess["Pmin_kW"].to_numpy()[rows],
+            'P_sv1': dsg["Psv1_kW"].to_numpy()[rows],
+            'P_sv2': P_sv2[rows],
+            'vessel_type': dsg["Type"].to_numpy()[rows],
+        }
+        scalars = {'c0': c0, 'c1': c1, 'c2': c2, 'TC_ESS': TC_ESS,
+                   'T_low': T_low, 'T_up': T_up, 'beta_k': beta_k}
+        for name, value in scalars.items():
+            columns[name] = np.broadcast_to(value, (n,))
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns['vessel_id'])
+
+    def __getitem__(self, index: int) -> AESParameters:
+        return AESParameters(**{name: column[index].item()
+                                for name, column in self.columns.items()})
+
+    def __iter__(self) -> Iterator[AESParameters]:
+        return (self[i] for i in range(len(self)))
+
+    def take(self, index) -> 'FleetTable':
+        """Sub-fleet of the given row indices or boolean mask"""
+        return FleetTable({name: column[index] for name, column in self.columns.items()})
+
+    def to_fleet(self) -> List[AESParameters]:
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
@@ -1,11 +1,24 @@
+import contextlib
+import time
+import warnings
+
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize, linprog
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, NonlinearConstraint, minimize, linprog
 import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from typing import List, Tuple, Dict
 import cvxpy as cp
 
+from network import LinDistFlow, load_feeder
+from packed import PackedVoyages
+from profiling import Tracer, solver_counts
+from results_store import ResultsStore
+from route_search import RouteService, path_length, search
+from solve_cache import SolveCache, cache_hit, fingerprint
+
 @dataclass
 class AESParameters:
     """Parameters for All-Electric Ship"""
@@ -25,6 +38,7 @@ class AESParameters:
     T_low: int        # Earliest arrival time (hour)
     T_up: int         # Latest arrival time (hour)
     beta_k: float     # Satisfaction threshold
+    vessel_type: int = 1  # AES type (Table II), selects berth service time
     
 @dataclass  
 class SeaportParameters:
@@ -34,192 +48,404 @@ class SeaportParameters:
     V_min: float      # Minimum voltage (p.u.)
     V_max: float      # Maximum voltage (p.u.)
     tap_max: int      # Maximum daily OLTC switching
-    berth_times: Dict[int, List[float]]  # Berthing times for each berth-vessel combination
+    berth_times: Dict[int, List[float]]  # Berthing times per berth, indexed by AES type - 1
+
+# Beaufort scale -> sea resistance f_t (Table I in paper), indexed by wind level
+BEAUFORT_RESISTANCE = np.array([0.00, 0.06, 0.13, 0.20, 0.26, 0.33, 0.40])
+# Hourly sea resistance of a voyage without a planned route of its own
+DEFAULT_RESISTANCE_PROFILE = [0.15, 0.20, 0.18, 0.22]
 
 class RouteOptimizer:
     """Optimal route planning with minimum sea resistance"""
     
-    def __init__(self, grid_size: Tuple[int, int] = (10, 10)):
+    def __init__(self, grid_size: Tuple[int, int] = (10, 10),
+                 search_engine: str = "dijkstra", diagonal_weighting: bool = False):
         self.grid_size = grid_size
+        self.search_engine = search_engine            # see route_search.SEARCH_ENGINES
+        self.diagonal_weighting = diagonal_weighting  # scale diagonal moves by sqrt(2)
+        self.last_search = None
         
-    def generate_resistance_map(self, wind_conditions: np.ndarray) -> np.ndarray:
-        """Generate resistance map based on Beaufort scale"""
-        # Beaufort scale mapping (from Table I in paper)
-        beaufort_scale = {
-            0: 0.00, 1: 0.06, 2: 0.13, 3: 0.20,
-            4: 0.26, 5: 0.33, 6: 0.40
-        }
-        
-        resistance_map = np.zeros(self.grid_size)
-        for i in range(self.grid_size[0]):
-            for j in range(self.grid_size[1]):
-                wind_level = min(int(wind_conditions[i, j]), 6)
-                resistance_map[i, j] = beaufort_scale[wind_level]
-                
-        return resistance_map
+    def generate_resistance_map(self, wind_conditions: np.ndarray,
+                                dtype=np.float64, chunk_rows: int = None,
+                                out: np.ndarray = None) -> np.ndarray:
+        """Generate resistance map based on Beaufort scale
+
+        Wind levels are truncated to integers and levels above 6 use the
+        force-6 resistance. NaN/inf or negative levels raise ValueError, as the
+        dict lookup did before the table. ``chunk_rows`` processes the grid in row blocks so that
+        memory-mapped wind/output arrays larger than RAM can be converted;
+        ``out`` may be any preallocated array (e.g. ``np.memmap``).
+        """
+        rows, cols = self.grid_size
+        wind = np.asarray(wind_conditions)[:rows, :cols]
+        if out is None:
+            out = np.empty((rows, cols), dtype=dtype)
+        lut = BEAUFORT_RESISTANCE.astype(out.dtype)
+
+        step = chunk_rows or rows
+        for r0 in range(0, rows, step):
+            block = np.trunc(wind[r0:r0 + step])
+            if not np.all(np.isfinite(block)) or np.any(block < 0):
+                raise ValueError("Wind levels must be finite Beaufort numbers >= 0")
+            levels = np.minimum(block, len(lut) - 1).astype(np.intp)
+            out[r0:r0 + step] = lut[levels]
+
+        return out
     
+    def resistance_diff(self, resistance_map: np.ndarray,
+                        wind_conditions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cells whose resistance changes under a new wind forecast
+
+        Returns ((k, 2) array of (row, col), (k,) new resistances), the input
+        expected by route_search.IncrementalRouter.update.
+        """
+        new_map = self.generate_resistance_map(wind_conditions, dtype=resistance_map.dtype)
+        rows, cols = np.nonzero(new_map != resistance_map)
+        return np.column_stack([rows, cols]), new_map[rows, cols]
+
     def dijkstra_route_planning(self, resistance_map: np.ndarray, 
                               start: Tuple[int, int], end: Tuple[int, int]) -> Tuple[List, float]:
-        """Find optimal route using Dijkstra algorithm"""
-        import heapq
-        
-        rows, cols = resistance_map.shape
-        distances = np.full((rows, cols), np.inf)
-        distances[start] = 0
-        previous = {}
-        pq = [(0, start)]
-        
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0), 
-                     (1, 1), (1, -1), (-1, 1), (-1, -1)]  # 8-directional
-        
-        while pq:
-            current_dist, current = heapq.heappop(pq)
-            
-            if current == end:
-                break
-                
-            if current_dist > distances[current]:
-                continue
-                
-            for dx, dy in directions:
-                nx, ny = current[0] + dx, current[1] + dy
-                if 0 <= nx < rows and 0 <= ny < cols:
-                    neighbor = (nx, ny)
-                    new_dist = current_dist + resistance_map[nx, ny]
-                    
-                    if new_dist < distances[neighbor]:
-                        distances[neighbor] = new_dist
-                        previous[neighbor] = current
-                        heapq.heappush(pq, (new_dist, neighbor))
-        
-        # Reconstruct path
-        path = []
-        current = end
-        while current in previous:
-            path.append(current)
-            current = previous[current]
-        path.append(start)
-        path.reverse()
-        
-        return path, distances[end]
+        """Find optimal route using the configured search engine (Dijkstra by default)
+
+        Statistics of the last search (expanded nodes, flat predecessor array)
+        are kept in ``self.last_search``.
+        """
+        self.last_search = search(resistance_map, start, end,
+                                  engine=self.search_engine,
+                                  diagonal_weighting=self.diagonal_weighting)
+        return self.last_search.path, self.last_search.cost
+
+# Battery lifetime model L_ESS = alpha0 * exp(alpha1 * DOD + alpha2)
+ESS_LIFETIME_COEFFS = (1.69e4, -0.24, -2.57)
 
 class VoyageScheduler:
-    """Optimal voyage scheduling for AES"""
+    """Optimal voyage scheduling for AES
+
+    Time is discretized in ``steps_per_hour`` steps per hour (1: hourly,
+    4: 15 min, 12: 5 min). Arrival times T_a are step indices from midnight
+    and profiles hold one value per step; powers stay in kW, velocities in
+    knots and costs in $, with per-hour cost rates scaled by the step length.
+    """
+
+    # AESParameters fields used only on the port side (see _cache_key)
+    PORT_FIELDS = ('vessel_id', 'P_sv2', 'T_low', 'T_up', 'beta_k', 'vessel_type')
+    T_s = 8  # Start time (8:00)
     
-    def __init__(self, aes_params: AESParameters, d_route: float = 30.0):
+    def __init__(self, aes_params: AESParameters, d_route: float = 30.0,
+                 backend: str = 'slsqp', cvxpy_solver: str = cp.CLARABEL,
+                 soc_price: float = 0.0, cache: SolveCache = None, steps_per_hour: int = 1):
+        if backend not in ('slsqp', 'cvxpy'):
+            raise ValueError(f"Unknown voyage backend '{backend}', choose 'slsqp' or 'cvxpy'")
         self.params = aes_params
+        self.steps_per_hour = steps_per_hour
+        self.dt = 1.0 / steps_per_hour    # step length (h)
+        self.start_step = self.T_s * steps_per_hour
+        self.backend = backend            # 'slsqp' (nonconvex) or 'cvxpy' (convex reformulation)
+        self.cvxpy_solver = cvxpy_solver
         self.d_route = d_route  # Route distance in nautical miles
         self.rho1, self.rho2 = 0.0355, 3.165  # Propulsion power coefficients
+        self.SOC_initial = 0.9  # Assume full charge at start
+        self.SOC_min = 0.1      # Lower SOC bound of the ESS, eq. (9)
+        self.eta_dis = 0.95
+        self.power_tol = 1e-2   # kW of power-balance surplus the convex backend accepts
+        self.soc_price = soc_price  # $/kWh the port charges to restore arrival SOC
+        self.cache = cache          # persistent per-T_a results, see _cache_key
+        self._bound_blocks = None
         
     def propulsion_power(self, velocity: float, resistance: float) -> float:
         """Calculate propulsion power P_pl = rho1 * v^rho2 * (1 + f_t)"""
         return self.rho1 * (velocity ** self.rho2) * (1 + resistance)
+
+    def propulsion_power_grad(self, velocity: float, resistance: float) -> float:
+        """dP_pl/dv = rho1 * rho2 * v^(rho2-1) * (1 + f_t)"""
+        return self.rho1 * self.rho2 * (velocity ** (self.rho2 - 1)) * (1 + resistance)
     
     def dsg_cost(self, P_DSG: float) -> float:
         """DSG fuel cost: c2*P^2 + c1*P + c0"""
         return (self.params.c2 * P_DSG**2 + 
                 self.params.c1 * P_DSG + 
                 self.params.c0)
+
+    def dsg_cost_grad(self, P_DSG: float) -> float:
+        """d(dsg_cost)/dP_DSG = 2*c2*P + c1"""
+        return 2 * self.params.c2 * P_DSG + self.params.c1
     
     def ess_degradation_cost(self, P_dis: float, DOD: float) -> float:
         """ESS degradation cost based on DOD"""
         # Simplified battery lifetime model
-        alpha0, alpha1, alpha2 = 1.69e4, -0.24, -2.57
+        alpha0, alpha1, alpha2 = ESS_LIFETIME_COEFFS
         L_ESS = alpha0 * np.exp(alpha1 * DOD + alpha2)
         return self.params.TC_ESS * P_dis / (L_ESS * self.params.E_ESS)
+
+    def ess_degradation_cost_grad(self, P_dis: float) -> float:
+        """Total derivative of ess_degradation_cost(P_dis, P_dis / E_ESS) w.r.t. P_dis"""
+        alpha0, alpha1, alpha2 = ESS_LIFETIME_COEFFS
+        E = self.params.E_ESS
+        scale = self.params.TC_ESS / (alpha0 * E)
+        return scale * np.exp(-(alpha1 * P_dis / E + alpha2)) * (1 - alpha1 * P_dis / E)
+
+    def _resistance_vector(self, cruise_steps: int, resistance_profile: List[float]) -> np.ndarray:
+        """f_t per cruise step from the hourly profile; hours beyond it default to 0.2"""
+        hours = np.arange(cruise_steps) // self.steps_per_hour
+        profile = np.asarray(resistance_profile, dtype=float)
+        f = np.full(cruise_steps, 0.2)
+        known = hours < len(profile)
+        f[known] = profile[hours[known]]
+        return f
+
+    def voyage_objective(self, x: np.ndarray, cruise_hours: int) -> Tuple[float, np.ndarray]:
+        """Total operation cost and its gradient for x = [v, P_DSG, P_dis]
+
+        ``cruise_hours`` is the number of cruise steps (hours at hourly resolution).
+        """
+        P_DSG = x[cruise_hours:2 * cruise_hours]
+        P_dis = x[2 * cruise_hours:]
+
+        cost = self.dt * (np.sum(self.dsg_cost(P_DSG)) +
+                          np.sum(self.ess_degradation_cost(P_dis, P_dis / self.params.E_ESS)))
+
+        grad = np.zeros_like(x, dtype=float)
+        grad[cruise_hours:2 * cruise_hours] = self.dt * self.dsg_cost_grad(P_DSG)
+        grad[2 * cruise_hours:] = self.dt * self.ess_degradation_cost_grad(P_dis)
+        return cost, grad
+
+    def discharge_capacity(self) -> float:
+        """Energy (kWh) the ESS can discharge before reaching SOC_min, eq. (9)"""
+        return (self.SOC_initial - self.SOC_min) * self.params.E_ESS * self.eta_dis
+
+    def priced_objective(self, x: np.ndarray, cruise_hours: int) -> Tuple[float, np.ndarray]:
+        """voyage_objective plus the port's price for the SOC used, with gradient
+
+        Each kWh discharged lowers the arrival energy by 1 / eta_dis kWh.
+        """
+        cost, grad = self.voyage_objective(x, cruise_hours)
+        if self.soc_price:
+            price = self.dt * self.soc_price / self.eta_dis
+            cost = cost + price * np.sum(x[2 * cruise_hours:])
+            grad[2 * cruise_hours:] += price
+        return cost, grad
+
+    def power_balance(self, x: np.ndarray, f: np.ndarray) -> np.ndarray:
+        """P_DSG + P_dis - P_pl(v, f) - P_sv1 for every cruise hour"""
+        n = len(f)
+        return x[n:2 * n] + x[2 * n:] - self.propulsion_power(x[:n], f) - self.params.P_sv1
+
+    def power_balance_jacobian(self, x: np.ndarray, f: np.ndarray) -> sp.csr_matrix:
+        """Sparse (n, 3n) Jacobian of power_balance: three diagonal blocks"""
+        n = len(f)
+        rows = np.tile(np.arange(n), 3)
+        cols = np.arange(3 * n)
+        data = np.concatenate([-self.propulsion_power_grad(x[:n], f),
+                               np.ones(n), np.ones(n)])
+        return sp.csr_matrix((data, (rows, cols)), shape=(n, 3 * n))
+    
+    def _voyage_bounds(self, cruise_hours: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower/upper bounds on [v, P_DSG, P_dis], sliced from per-block arrays built once"""
+        if self._bound_blocks is None or self._bound_blocks.shape[2] < cruise_hours:
+            lo = [5.0, self.params.P_DSG_min, self.params.P_dis_min]  # v_min in knots
+            hi = [20.0, self.params.P_DSG_max, self.params.P_dis_max]  # v_max in knots
+            self._bound_blocks = np.stack([
+                np.repeat(np.array(lo)[:, None], cruise_hours, axis=1),
+                np.repeat(np.array(hi)[:, None], cruise_hours, axis=1)])
+        blocks = self._bound_blocks[:, :, :cruise_hours]
+        return blocks[0].ravel(), blocks[1].ravel()
+
+    def _velocity_limits(self, f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-hour velocity range for which the power balance can be met at all
+
+        P_pl(v, f_t) must lie in [P_DSG_min + P_dis_min, P_DSG_max + P_dis_max] - P_sv1.
+        """
+        P_low = max(self.params.P_DSG_min + self.params.P_dis_min - self.params.P_sv1, 0.0)
+        P_high = self.params.P_DSG_max + self.params.P_dis_max - self.params.P_sv1
+        scale = self.rho1 * (1 + f)
+        v_low = np.clip((P_low / scale) ** (1 / self.rho2), 5.0, 20.0)
+        v_high = np.clip((P_high / scale) ** (1 / self.rho2), 5.0, 20.0)
+        return v_low, v_high
+
+    def _cold_start(self, cruise_hours: int) -> np.ndarray:
+        return np.concatenate([
+            np.full(cruise_hours, self.d_route / (cruise_hours * self.dt)),  # velocity
+            np.full(cruise_hours, self.params.P_DSG_min),       # P_DSG
+            np.full(cruise_hours, 0)                            # P_dis
+        ])
+
+    def _warm_start(self, previous: Dict, cruise_hours: int) -> np.ndarray:
+        """Resample a neighbouring T_a solution onto `cruise_hours` steps"""
+        def resample(profile):
+            if len(profile) == 1:
+                return np.full(cruise_hours, profile[0])
+            return np.interp(np.linspace(0, 1, cruise_hours),
+                             np.linspace(0, 1, len(profile)), profile)
+
+        velocity = resample(previous['velocity_profile'])
+        velocity *= self.d_route / (np.sum(velocity) * self.dt)
+        x0 = np.concatenate([velocity,
+                             resample(previous['P_DSG_profile']),
+                             resample(previous['P_dis_profile'])])
+        lower, upper = self._voyage_bounds(cruise_hours)
+        return np.clip(x0, lower, upper)
     
-    def optimize_voyage(self, T_a: int, resistance_profile: List[float]) -> Dict:
-        """Solve voyage scheduling optimization for given arrival time"""
+    def optimize_voyage(self, T_a: int, resistance_profile: List[float],
+                        method: str = 'SLSQP', x0: np.ndarray = None) -> Dict:
+        """Solve voyage scheduling optimization for given arrival time (step index)
+
+        Objective and constraints are vectorized with exact gradients. SLSQP
+        (default) gets the constraint Jacobian densified; 'trust-constr' uses
+        the sparse Jacobian directly. ``x0`` overrides the cold-start guess.
+        """
         
-        # Calculate cruise duration
-        T_s = 8  # Start time (8:00)
-        cruise_hours = T_a - T_s
+        # Calculate cruise duration (steps)
+        cruise_hours = T_a - self.start_step
         
         if cruise_hours <= 0:
             return None
-            
-        # Decision variables: velocity, P_DSG, P_dis for each hour
-        n_vars = 3 * cruise_hours  # v, P_DSG, P_dis for each time step
-        
-        # Objective: minimize total operation cost
-        def objective(x):
-            total_cost = 0
-            for t in range(cruise_hours):
-                v_t = x[t]
-                P_DSG_t = x[cruise_hours + t]
-                P_dis_t = x[2 * cruise_hours + t]
-                
-                # DSG cost
-                total_cost += self.dsg_cost(P_DSG_t)
-                
-                # ESS degradation cost (simplified)
-                DOD_t = P_dis_t / self.params.E_ESS
-                total_cost += self.ess_degradation_cost(P_dis_t, DOD_t)
-                
-            return total_cost
-        
-        # Constraints
-        constraints = []
-        
-        # Power balance constraint for each time step
-        for t in range(cruise_hours):
-            def power_balance(x, t=t):
-                v_t = x[t]
-                P_DSG_t = x[cruise_hours + t]
-                P_dis_t = x[2 * cruise_hours + t]
-                f_t = resistance_profile[t] if t < len(resistance_profile) else 0.2
-                
-                P_pl_t = self.propulsion_power(v_t, f_t)
-                return P_DSG_t + P_dis_t - P_pl_t - self.params.P_sv1
-                
-            constraints.append({'type': 'eq', 'fun': lambda x, t=t: power_balance(x, t)})
-        
-        # Distance constraint: sum(v_t) = d_route
-        constraints.append({
-            'type': 'eq', 
-            'fun': lambda x: np.sum(x[:cruise_hours]) - self.d_route
-        })
-        
-        # Bounds
-        bounds = []
-        # Velocity bounds
-        for t in range(cruise_hours):
-            bounds.append((5, 20))  # v_min, v_max in knots
-        # P_DSG bounds  
-        for t in range(cruise_hours):
-            bounds.append((self.params.P_DSG_min, self.params.P_DSG_max))
-        # P_dis bounds
-        for t in range(cruise_hours):
-            bounds.append((self.params.P_dis_min, self.params.P_dis_max))
-            
-        # Initial guess
-        x0 = np.concatenate([
-            np.full(cruise_hours, self.d_route / cruise_hours),  # velocity
-            np.full(cruise_hours, self.params.P_DSG_min),       # P_DSG
-            np.full(cruise_hours, 0)                            # P_dis
-        ])
+
+        f = self._resistance_vector(cruise_hours, resistance_profile)
+        if x0 is None:
+            x0 = self._cold_start(cruise_hours)
+        key = self._cache_key(T_a, f, method, x0)
+        if key:
+            lookup_start = time.perf_counter()
+            hit, result = self.cache.get(key)
+            if hit:
+                return cache_hit(result, time.perf_counter() - lookup_start)
+        result = self._solve_voyage(T_a, f, x0, method)
+        if key:
+            self.cache.put(key, result)
+        return result
+
+    def _cache_key(self, T_a: int, f: np.ndarray, method: str, x0: np.ndarray) -> str:
+        """Fingerprint of everything a T_a solve depends on (None without a cache)
+
+        SLSQP is a local method on a nonconvex problem, so its start point ``x0``
+        is part of the key; the convex backend ignores it.
+        """
+        if self.cache is None:
+            return None
+        # Port-side fields never enter the voyage problem, so fleets that differ
+        # only in arrival windows, SI thresholds or berthing share entries
+        voyage_params = {name: value for name, value in asdict(self.params).items()
+                         if name not in self.PORT_FIELDS}
+        options = {'backend': self.backend, 'method': method, 'cvxpy_solver': self.cvxpy_solver,
+                   'd_route': self.d_route, 'T_s': self.T_s, 'rho': (self.rho1, self.rho2),
+                   'steps_per_hour': self.steps_per_hour,
+                   'SOC': (self.SOC_initial, self.SOC_min, self.eta_dis),
+                   'soc_price': self.soc_price, 'power_tol': self.power_tol}
+        start = None if self.backend == 'cvxpy' else np.asarray(x0, dtype=float)
+        return fingerprint('voyage', voyage_params, T_a, np.asarray(f, dtype=float), options,
+                           start)
+
+    def optimize_voyage_batch(self, T_a_values, resistance_profile: List[float],
+                              method: str = 'SLSQP', previous: Dict = None) -> List[Dict]:
+        """Solve every arrival time in `T_a_values`, warm-starting from the previous T_a
+
+        Returns the successful T_a-SOC_a results in ascending T_a order. Arrival
+        times that cannot cover d_route within the power-feasible velocity range,
+        or whose minimum discharge would empty the ESS, are skipped without
+        calling the solver. A warm start that fails to
+        converge is retried from the cold-start guess. With a cache, stored
+        arrival times are returned (and warm-start the next one) without solving.
+        ``previous`` is a result for an earlier T_a that warm-starts the first
+        solve, so consecutive chunks solve like one batch.
+        """
+        T_a_sorted = sorted(T_a for T_a in set(T_a_values) if T_a > self.start_step)
+        if not T_a_sorted:
+            return []
+
+        # Shared structure for the longest voyage; shorter ones use prefixes
+        max_hours = T_a_sorted[-1] - self.start_step
+        f_full = self._resistance_vector(max_hours, resistance_profile)
+        self._voyage_bounds(max_hours)
+        v_low, v_high = self._velocity_limits(f_full)
+        reach_low, reach_high = self.dt * np.cumsum(v_low), self.dt * np.cumsum(v_high)
+        max_discharge_hours = self.discharge_capacity() / max(self.params.P_dis_min * self.dt,
+                                                              1e-9)
+
+        results = []
+        for T_a in T_a_sorted:
+            cruise_hours = T_a - self.start_step
+            if not (reach_low[cruise_hours - 1] <= self.d_route <= reach_high[cruise_hours - 1]):
+                continue
+            if cruise_hours > max_discharge_hours:
+                continue
+            f = f_full[:cruise_hours]
+            x0 = None if previous is None else self._warm_start(previous, cruise_hours)
+            key = self._cache_key(T_a, f, method,
+                                  self._cold_start(cruise_hours) if x0 is None else x0)
+            if key:
+                lookup_start = time.perf_counter()
+                hit, result = self.cache.get(key)
+                if hit:
+                    if result is not None:
+                        result = cache_hit(result, time.perf_counter() - lookup_start)
+                        results.append(result)
+                        previous = result
+                    continue
+            result = None
+            if x0 is not None:
+                result = self._solve_voyage(T_a, f, x0, method)
+            if result is None:
+                result = self._solve_voyage(T_a, f, self._cold_start(cruise_hours), method)
+            if key:
+                self.cache.put(key, result)
+            if result is not None:
+                results.append(result)
+                previous = result
+        return results
+
+    def _solve_voyage(self, T_a: int, f: np.ndarray, x0: np.ndarray, method: str) -> Dict:
+        if self.backend == 'cvxpy':
+            return self._solve_voyage_convex(T_a, f)
+        return self._solve_voyage_slsqp(T_a, f, x0, method)
+
+    def _solve_voyage_slsqp(self, T_a: int, f: np.ndarray, x0: np.ndarray, method: str) -> Dict:
+        cruise_hours = len(f)
+        lower, upper = self._voyage_bounds(cruise_hours)
+
+        # Distance constraint: sum(v_t) dt = d_route
+        distance_row = np.concatenate([np.full(cruise_hours, self.dt), np.zeros(2 * cruise_hours)])
+        # SOC constraint (9): sum(P_dis_t) dt <= discharge capacity
+        discharge_row = np.concatenate([np.zeros(2 * cruise_hours), np.full(cruise_hours, self.dt)])
+        capacity = self.discharge_capacity()
         
         # Solve optimization
         try:
-            result = minimize(objective, x0, method='SLSQP', 
-                            bounds=bounds, constraints=constraints)
+            if method == 'trust-constr':
+                constraints = [
+                    NonlinearConstraint(lambda x: self.power_balance(x, f), 0, 0,
+                                        jac=lambda x: self.power_balance_jacobian(x, f)),
+                    LinearConstraint(sp.csr_matrix(distance_row), self.d_route, self.d_route),
+                    LinearConstraint(sp.csr_matrix(discharge_row), -np.inf, capacity),
+                ]
+            else:
+                # SLSQP needs a dense Jacobian: only the velocity diagonal changes
+                jac_dense = self.power_balance_jacobian(x0, f).toarray()
+                diag = np.arange(cruise_hours)
+
+                def power_balance_jac(x):
+                    jac_dense[diag, diag] = -self.propulsion_power_grad(x[:cruise_hours], f)
+                    return jac_dense.copy()
+
+                constraints = [
+                    {'type': 'eq',
+                     'fun': lambda x: self.power_balance(x, f),
+                     'jac': power_balance_jac},
+                    {'type': 'eq',
+                     'fun': lambda x: np.array([distance_row @ x - self.d_route]),
+                     'jac': lambda x: distance_row[None, :]},
+                    {'type': 'ineq',
+                     'fun': lambda x: np.array([capacity - discharge_row @ x]),
+                     'jac': lambda x: -discharge_row[None, :]},
+                ]
+
+            result = minimize(self.priced_objective, x0, args=(cruise_hours,), jac=True,
+                              method=method, bounds=Bounds(lower, upper),
+                              constraints=constraints)
             
             if result.success:
-                # Calculate final SOC
-                total_discharge = np.sum(result.x[2*cruise_hours:])
-                SOC_initial = 0.9  # Assume full charge at start
-                eta_dis = 0.95
-                SOC_final = SOC_initial - (total_discharge * cruise_hours) / (self.params.E_ESS * eta_dis)
-                
-                return {
-                    'success': True,
-                    'T_a': T_a,
-                    'SOC_a': max(0.1, SOC_final),  # Ensure minimum SOC
-                    'cost': result.fun,
-                    'velocity_profile': result.x[:cruise_hours],
-                    'P_DSG_profile': result.x[cruise_hours:2*cruise_hours],
-                    'P_dis_profile': result.x[2*cruise_hours:]
-                }
+                cost, _ = self.voyage_objective(result.x, cruise_hours)
+                return self._voyage_result(T_a, result.x, float(cost),
+                                           nfev=result.nfev, nit=result.nit)
             else:
                 return None
                 
@@ -227,219 +453,1331 @@ class VoyageScheduler:
             print(f"Optimization failed for T_a={T_a}: {e}")
             return None
 
+    def _voyage_result(self, T_a: int, x: np.ndarray, cost: float, **stats) -> Dict:
+        cruise_hours = len(x) // 3
+
+        # Calculate final SOC
+        total_discharge = np.sum(x[2*cruise_hours:]) * self.dt
+        SOC_final = self.SOC_initial - total_discharge / (self.params.E_ESS * self.eta_dis)
+
+        return {
+            'success': True,
+            'T_a': T_a,
+            'SOC_a': max(self.SOC_min, SOC_final),  # Ensure minimum SOC
+            'cost': cost,
+            'velocity_profile': x[:cruise_hours],
+            'P_DSG_profile': x[cruise_hours:2*cruise_hours],
+            'P_dis_profile': x[2*cruise_hours:],
+            **stats
+        }
+
+    def _ess_cost_quadratic(self) -> Tuple[float, float, float]:
+        """Convex quadratic fit (a, b, c) of the ESS degradation cost over [P_dis_min, P_dis_max]"""
+        P = np.linspace(self.params.P_dis_min, self.params.P_dis_max, 50)
+        a, b, c = np.polyfit(P, self.ess_degradation_cost(P, P / self.params.E_ESS), 2)
+        return max(a, 0.0), b, c
+
+    def _solve_voyage_convex(self, T_a: int, f: np.ndarray) -> Dict:
+        """Convex reformulation solved with CVXPY
+
+        The power balance is relaxed to P_DSG + P_dis >= rho1*(1+f)*v^rho2 + P_sv1,
+        a convex (SOC-representable) constraint; since cost increases with both
+        powers it is tight at the optimum. When the P_DSG_min/P_dis_min bounds
+        force a surplus above ``power_tol`` the voyage violates the real power
+        balance and is reported as infeasible (None), like a failed SLSQP solve.
+        The ESS degradation cost is replaced by a convex quadratic fit.
+        The reported 'cost' is the original objective evaluated at the solution,
+        without the soc_price term.
+        """
+        cruise_hours = len(f)
+        lower, upper = self._voyage_bounds(cruise_hours)
+
+        v = cp.Variable(cruise_hours)
+        P_DSG = cp.Variable(cruise_hours)
+        P_dis = cp.Variable(cruise_hours)
+        a, b, c = self._ess_cost_quadratic()
+
+        objective = cp.Minimize(self.dt * (
+            self.params.c2 * cp.sum_squares(P_DSG) + self.params.c1 * cp.sum(P_DSG) +
+            a * cp.sum_squares(P_dis) + (b + self.soc_price / self.eta_dis) * cp.sum(P_dis) +
+            cruise_hours * (self.params.c0 + c)
+        ))
+        constraints = [
+            P_DSG + P_dis >= cp.multiply(self.rho1 * (1 + f), cp.power(v, self.rho2))
+                             + self.params.P_sv1,
+            self.dt * cp.sum(v) == self.d_route,
+            self.dt * cp.sum(P_dis) <= self.discharge_capacity(),
+            v >= lower[:cruise_hours], v <= upper[:cruise_hours],
+            P_DSG >= lower[cruise_hours:2*cruise_hours], P_DSG <= upper[cruise_hours:2*cruise_hours],
+            P_dis >= lower[2*cruise_hours:], P_dis <= upper[2*cruise_hours:],
+        ]
+        problem = cp.Problem(objective, constraints)
+
+        try:
+            with warnings.catch_warnings():
+                # rho2 is rewritten exactly as a rational power with SOC constraints
+                warnings.filterwarnings('ignore', message='Power atom with exponent')
+                problem.solve(solver=self.cvxpy_solver)
+        except cp.error.SolverError as e:
+            print(f"Optimization failed for T_a={T_a}: {e}")
+            return None
+
+        if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+            return None
+
+        x = np.clip(np.concatenate([v.value, P_DSG.value, P_dis.value]), lower, upper)
+        power_slack = float(np.max(np.abs(self.power_balance(x, f))))
+        if power_slack > self.power_tol:
+            return None
+        cost, _ = self.voyage_objective(x, cruise_hours)
+        return self._voyage_result(
+            T_a, x, float(cost),
+            objective_value=float(problem.value),
+            power_slack=power_slack,
+            solver=problem.solver_stats.solver_name,
+            solve_time=problem.solver_stats.solve_time,
+            **solver_iterations(problem),
+        )
+
+    def compare_backends(self, T_a: int, resistance_profile: List[float]) -> Dict:
+        """Solve T_a with SLSQP and the convex backend and report the cost gap
+
+        When only one backend finds a feasible voyage, 'mismatch' names the
+        backend that reported the instance infeasible instead of a gap.
+        """
+        cruise_hours = T_a - self.start_step
+        if cruise_hours <= 0:
+            return None
+        f = self._resistance_vector(cruise_hours, resistance_profile)
+        nonconvex = self._solve_voyage_slsqp(T_a, f, self._cold_start(cruise_hours), 'SLSQP')
+        convex = self._solve_voyage_convex(T_a, f)
+
+        report = {'T_a': T_a, 'slsqp': nonconvex, 'convex': convex}
+        if (nonconvex is None) != (convex is None):
+            report['mismatch'] = 'slsqp infeasible' if nonconvex is None else 'convex infeasible'
+        if nonconvex and convex:
+            gap = convex['cost'] - nonconvex['cost']
+            report.update(
+                gap=gap,
+                relative_gap=gap / abs(nonconvex['cost']),
+                max_velocity_diff=float(np.max(np.abs(convex['velocity_profile'] -
+                                                      nonconvex['velocity_profile']))),
+            )
+        return report
+
 class SatisfactoryIndex:
     """Calculate and manage satisfactory index for AES"""
     
     @staticmethod
-    def calculate_SI(costs: List[float]) -> List[float]:
+    def calculate_SI(costs) -> np.ndarray:
         """Calculate satisfactory index for each cost"""
-        C_max = max(costs)
-        C_min = min(costs)
+        costs = np.asarray(costs, dtype=float)
+        if costs.size == 0:
+            return costs
+        C_max = costs.max()
+        C_min = costs.min()
         
         if C_max == C_min:
-            return [1.0] * len(costs)
+            return np.ones_like(costs)
             
-        SI_values = []
-        for C_k in costs:
-            SI_k = (C_max - C_k) / (C_max - C_min)
-            SI_values.append(SI_k)
-            
-        return SI_values
+        return (C_max - costs) / (C_max - C_min)
     
     @staticmethod
     def filter_by_threshold(Ta_SOCa_pairs: List[Dict], beta_k: float) -> List[Dict]:
-        """Filter T_a-SOC_a pairs based on satisfaction threshold"""
+        """Filter T_a-SOC_a pairs based on satisfaction threshold
+
+        Every pair gets its 'SI'; the ones with SI >= beta_k are returned in order.
+        Large candidate sets are cheaper to keep as CandidatePairs throughout.
+        """
         if not Ta_SOCa_pairs:
             return []
-            
-        costs = [pair['cost'] for pair in Ta_SOCa_pairs]
+        costs = np.fromiter((pair['cost'] for pair in Ta_SOCa_pairs), float, len(Ta_SOCa_pairs))
         SI_values = SatisfactoryIndex.calculate_SI(costs)
-        
-        filtered_pairs = []
-        for i, (pair, SI) in enumerate(zip(Ta_SOCa_pairs, SI_values)):
+        for pair, SI in zip(Ta_SOCa_pairs, SI_values.tolist()):
             pair['SI'] = SI
-            if SI >= beta_k:
-                filtered_pairs.append(pair)
-                
-        return filtered_pairs
+        return [Ta_SOCa_pairs[i] for i in np.flatnonzero(SI_values >= beta_k).tolist()]
+
+class CandidatePairs:
+    """Array-backed T_a-SOC_a candidates of one vessel
+
+    The scalar fields live in a structured array (``data``) so SI, threshold
+    filtering, top-k and Pareto-front selection are vectorized; the original
+    pair dicts (with their voyage profiles) are kept alongside in ``records``
+    and indexing returns them, so the list-of-dicts API is a thin view.
+    """
+
+    DTYPE = np.dtype([('T_a', np.int64), ('SOC_a', float), ('cost', float), ('SI', float)])
+
+    def __init__(self, data: np.ndarray, records: np.ndarray = None):
+        self.data = data
+        self.records = records
+
+    @classmethod
+    def from_pairs(cls, pairs: List[Dict]) -> 'CandidatePairs':
+        n = len(pairs)
+        data = np.empty(n, dtype=cls.DTYPE)
+        for name in cls.DTYPE.names:
+            data[name] = np.fromiter((pair.get(name, np.nan) for pair in pairs), float, n)
+        records = np.empty(len(pairs), dtype=object)
+        records[:] = pairs
+        return cls(data, records)
+
+    @classmethod
+    def from_arrays(cls, T_a, SOC_a, cost) -> 'CandidatePairs':
+        """Candidates without voyage profiles (records are built on access)"""
+        data = np.empty(len(cost), dtype=cls.DTYPE)
+        data['T_a'], data['SOC_a'], data['cost'], data['SI'] = T_a, SOC_a, cost, np.nan
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Dict:
+        if self.records is not None:
+            return self.records[index]
+        row = self.data[index]
+        return {name: row[name].item() for name in self.DTYPE.names}
+
+    def to_pairs(self) -> List[Dict]:
+        return [self[i] for i in range(len(self))]
+
+    def _subset(self, index: np.ndarray) -> 'CandidatePairs':
+        records = self.records[index] if self.records is not None else None
+        return CandidatePairs(self.data[index], records)
+
+    def compute_SI(self) -> 'CandidatePairs':
+        """Fill SI from the costs (and write it into the pair dicts)"""
+        self.data['SI'] = SatisfactoryIndex.calculate_SI(self.data['cost'])
+        if self.records is not None:
+            for record, SI in zip(self.records, self.data['SI'].tolist()):
+                record['SI'] = SI
+        return self
+
+    def filter(self, beta_k: float) -> 'CandidatePairs':
+        """Candidates with SI >= beta_k, in their original order"""
+        return self._subset(np.flatnonzero(self.data['SI'] >= beta_k))
+
+    def top_k(self, k: int, field: str = 'SI', largest: bool = True) -> 'CandidatePairs':
+        """The k best candidates by ``field``, best first"""
+        values = self.data[field] if not largest else -self.data[field]
+        k = min(k, len(self))
+        if k <= 0:
+            return self._subset(np.arange(0))
+        index = np.argpartition(values, k - 1)[:k]
+        return self._subset(index[np.argsort(values[index], kind='stable')])
+
+    def best(self, field: str = 'SI') -> Dict:
+        """Pair with the largest ``field`` (first one on ties, like max())"""
+        return self[int(np.argmax(self.data[field]))]
+
+    def pareto_front(self) -> 'CandidatePairs':
+        """Candidates not dominated in (cost low, T_a early, SOC_a high), original order
+
+        After a lexicographic sort by (cost, T_a, -SOC_a) only earlier candidates
+        can dominate a later one, so a running maximum of SOC_a per arrival time
+        (accumulated over earlier arrival times) decides dominance for all
+        candidates at once. Exact duplicates keep their first occurrence.
+        """
+        n = len(self)
+        if n == 0:
+            return self._subset(np.arange(0))
+        cost, T_a, SOC_a = self.data['cost'], self.data['T_a'], self.data['SOC_a']
+        order = np.lexsort((-SOC_a, T_a, cost))
+        levels, level = np.unique(T_a[order], return_inverse=True)
+        best = np.full((len(levels), n + 1), -np.inf)
+        best[level, np.arange(1, n + 1)] = SOC_a[order]
+        best = np.maximum.accumulate(np.maximum.accumulate(best, axis=1), axis=0)
+        dominated = best[level, np.arange(n)] >= SOC_a[order]
+        return self._subset(np.sort(order[~dominated]))
+
+def default_milp_solver() -> str:
+    """First installed open-source MILP solver (CBC preferred, then HiGHS)"""
+    installed = cp.installed_solvers()
+    for solver in (cp.CBC, cp.HIGHS, cp.GLPK_MI, cp.SCIP):
+        if solver in installed:
+            return solver
+    raise RuntimeError("No MILP solver installed; install cylp (CBC) or highspy (HiGHS)")
+
+def mip_gap(problem: cp.Problem) -> float:
+    """Relative MIP gap reported by the solver, if it exposes one"""
+    extra = problem.solver_stats.extra_stats
+    gap = getattr(extra, 'mip_gap', None)
+    if gap is None and isinstance(extra, dict):
+        gap = extra.get('mip_gap')
+    return float(gap) if gap is not None else None
+
+def solver_iterations(problem: cp.Problem) -> Dict[str, int]:
+    """Iteration counters the solver reports: num_iters, simplex_iters, mip_nodes"""
+    stats = problem.solver_stats
+    counts = {}
+    if stats is None:
+        return counts
+    if stats.num_iters is not None and stats.num_iters >= 0:
+        counts['num_iters'] = int(stats.num_iters)
+    extra = stats.extra_stats
+    for name, attr in (('simplex_iters', 'simplex_iteration_count'),
+                       ('mip_nodes', 'mip_node_count')):
+        value = getattr(extra, attr, None)
+        if value is None and isinstance(extra, dict):
+            value = extra.get(attr)
+        if value is not None and value >= 0:
+            counts[name] = int(value)
+    return counts
+
+@dataclass
+class HorizonState:
+    """Committed plan carried into one window of a rolling-horizon solve
+
+    Vessel-keyed entries refer to the vessels of the window's pair dict.
+    The default state is the start of a monolithic solve.
+    """
+    tap: float = None                   # committed OLTC position before the window
+    taps_left: int = None               # remaining daily switching budget (None: tap_max)
+    berth: Dict[int, int] = field(default_factory=dict)     # berth of vessels that started service
+    served: Dict[int, int] = field(default_factory=dict)    # hours already spent at berth
+    charged: Dict[int, float] = field(default_factory=dict) # kWh already delivered
+    berthed: Tuple[int, ...] = ()       # vessels occupying their berth at the previous step
+    final: bool = True                  # window reaches the end of the horizon
+
+class BerthGrid:
+    """(berth, vessel, step) cells that carry berth allocation variables
+
+    Rows are the flattened (berth, vessel) pairs m * n_vessels + k. The dense
+    grid stores a variable as an (n_rows, n_hours) matrix; a windowed grid
+    keeps only the cells inside each row's [start, end) step window, stored as
+    one vector ordered by row and step. Both layouts offer the same
+    aggregations, so the berth model is written once for either.
+    """
+
+    def __init__(self, n_berths: int, n_vessels: int, n_hours: int, windows: np.ndarray = None):
+        self.n_berths, self.n_vessels, self.n_hours = n_berths, n_vessels, n_hours
+        self.n_rows = n_berths * n_vessels
+        self.windowed = windows is not None
+        self.A_berth, self.A_vessel = VoltageRegulator.allocation_matrices(n_berths, n_vessels)
+        self._ones = np.ones((1, n_hours))
+        if not self.windowed:
+            self.shape = (self.n_rows, n_hours)
+            self.lengths = np.full(self.n_rows, n_hours)
+            return
+        start = np.clip(windows[:, 0], 0, n_hours)
+        lengths = np.maximum(np.clip(windows[:, 1], 0, n_hours) - start, 0)
+        self.lengths = lengths        # cells per row
+        size = int(lengths.sum())
+        cells = np.arange(size)
+        self.shape = (size,)
+        self.row = np.repeat(np.arange(self.n_rows), lengths)
+        self.step = start[self.row] + cells - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        def aggregate(index, n):
+            return sp.csr_matrix((np.ones(size), (index, cells)), shape=(n, size))
+        berth, vessel = self.row // n_vessels, self.row % n_vessels
+        self._rows = aggregate(self.row, self.n_rows)
+        self._steps = aggregate(self.step, n_hours)
+        self._berth_steps = aggregate(berth * n_hours + self.step, n_berths * n_hours)
+        self._vessel_steps = aggregate(vessel * n_hours + self.step, n_vessels * n_hours)
+        later = cells[self.step > start[self.row]]
+        self._previous = sp.csr_matrix((np.ones(len(later)), (later, later - 1)), shape=(size, size))
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def variable(self, **kwargs) -> cp.Variable:
+        return cp.Variable(self.shape, **kwargs)
+
+    def per_step(self, x) -> cp.Expression:
+        """Sum over (berth, vessel) rows: (n_hours,)"""
+        return self._steps @ x if self.windowed else cp.sum(x, axis=0)
+
+    def per_row(self, x) -> cp.Expression:
+        """Sum over steps: (n_rows,)"""
+        return self._rows @ x if self.windowed else cp.sum(x, axis=1)
+
+    def per_berth(self, x) -> cp.Expression:
+        """Sum over vessels: (n_berths, n_hours)"""
+        if self.windowed:
+            return cp.reshape(self._berth_steps @ x, (self.n_berths, self.n_hours), order='C')
+        return self.A_berth @ x
+
+    def per_vessel(self, x) -> cp.Expression:
+        """Sum over berths: (n_vessels, n_hours)"""
+        if self.windowed:
+            return cp.reshape(self._vessel_steps @ x, (self.n_vessels, self.n_hours), order='C')
+        return self.A_vessel @ x
+
+    def broadcast_rows(self, values) -> cp.Expression:
+        """Per-row values repeated over each row's cells"""
+        if self.windowed:
+            return self._rows.T @ values
+        return cp.reshape(values, (self.n_rows, 1), order='C') @ self._ones
+
+    def starts(self, mu, omega, omega_prev: np.ndarray) -> List[cp.Constraint]:
+        """mu marks 0 -> 1 transitions of omega; omega_prev is each row before step 0"""
+        if self.windowed:
+            # A row's first cell follows an unallocated (zero) step unless it is step 0
+            before = np.where(self.step == 0, omega_prev[self.row], 0.0)
+            return [mu >= omega - self._previous @ omega - before]
+        return [mu[:, :1] >= omega[:, :1] - omega_prev[:, None],
+                mu[:, 1:] >= omega[:, 1:] - omega[:, :-1]]
+
+    def gather(self, dense: np.ndarray) -> np.ndarray:
+        """Cell values of an (n_rows, n_hours) array"""
+        return dense[self.row, self.step] if self.windowed else dense
+
+    def scatter(self, values: np.ndarray) -> np.ndarray:
+        """(n_rows, n_hours) array of cell values, zero outside the windows"""
+        if not self.windowed:
+            return values
+        dense = np.zeros((self.n_rows, self.n_hours))
+        dense[self.row, self.step] = values
+        return dense
 
 class VoltageRegulator:
-    """Voltage regulation in seaport microgrids with berth allocation"""
+    """Voltage regulation in seaport microgrids with berth allocation
+
+    Time is discretized in ``steps_per_hour`` steps per hour: forecasts, pair
+    arrival times and the plan are per step, berth service times (Table III,
+    in hours) are rounded up to whole steps and energy is power times the step
+    length. With ``max_wait`` set, berth variables are only allocated inside
+    each vessel's window (see berth_windows) instead of over the whole horizon.
+    With ``presolve`` set, build_model also drops the cells that can only be
+    zero and breaks the symmetry of interchangeable berths and vessels (see
+    symmetry_classes); results then report the reduction under 'presolve'.
+    """
     
-    def __init__(self, seaport_params: SeaportParameters):
+    def __init__(self, seaport_params: SeaportParameters, solver: str = None,
+                 network: LinDistFlow = None, cache: SolveCache = None,
+                 steps_per_hour: int = 1, max_wait: float = None,
+                 presolve: bool = False):
         self.params = seaport_params
+        self.steps_per_hour = steps_per_hour
+        self.dt = 1.0 / steps_per_hour    # step length (h)
+        # Hours a vessel may wait for a berth after its latest arrival; None
+        # allocates berth variables for every step of the horizon
+        self.max_wait = max_wait
+        self.solver = solver or default_milp_solver()
+        self.network = network       # LinDistFlow model; None keeps the port-capacity-only model
+        self.cache = cache           # successful results of optimize_voltage_regulation
+        self.last_timing = None
+        self.P_ch_max = 200.0        # Maximum charging power per berth (kW)
+        self.port_capacity = 1000.0  # Maximum total charging power (kW)
+        self.SOC_target = 0.9        # SOC required at departure
+        self.eta_ch = 0.95           # Charging efficiency
+        self.loss_weight = 0.01      # Weight of the loss term (kW) against voyage cost
+        self.tap_weight = 1e-3       # Tie-breaking penalty on |tap| with a network model
+        self.energy_price = 0.0      # Shore power tariff on delivered energy ($/kWh)
+        self.presolve = presolve     # Zero fixing and symmetry breaking in build_model
+
+    @staticmethod
+    def allocation_matrices(n_berths: int, n_vessels: int) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+        """Sparse row-aggregation matrices for the flattened (berth, vessel) axis
+
+        Allocation variables are stored as (n_berths * n_vessels, n_hours) with
+        row m * n_vessels + k; ``A_berth @ omega`` sums over vessels per berth and
+        ``A_vessel @ omega`` sums over berths per vessel.
+        """
+        A_berth = sp.kron(sp.eye(n_berths), np.ones((1, n_vessels)), format='csr')
+        A_vessel = sp.kron(np.ones((1, n_berths)), sp.eye(n_vessels), format='csr')
+        return A_berth, A_vessel
+
+    @staticmethod
+    def selection_matrix(Ta_SOCa_pairs_all: Dict[int, List[Dict]]) -> sp.csr_matrix:
+        """(n_vessels, n_pairs_total) matrix summing each vessel's selection block"""
+        counts = [len(pairs) for pairs in Ta_SOCa_pairs_all.values()]
+        rows = np.repeat(np.arange(len(counts)), counts)
+        return sp.csr_matrix((np.ones(len(rows)), (rows, np.arange(len(rows)))),
+                             shape=(len(counts), len(rows)))
         
+    def service_steps(self, berth: int, vessel_type: int) -> int:
+        """Table III service time of a vessel type at a berth, in whole steps"""
+        return int(np.ceil(self.params.berth_times[berth][vessel_type - 1]
+                           * self.steps_per_hour - 1e-9))
+
+    def berth_windows(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]], n_hours: int,
+                      aes_fleet: List[AESParameters] = None) -> np.ndarray:
+        """[start, end) steps of each (berth, vessel) row of a windowed BerthGrid
+
+        A vessel can be at a berth from its earliest candidate T_a until its
+        latest T_a plus ``max_wait`` hours plus the longest stay it may need
+        there: the berth's service time, or the steps to charge its largest
+        energy requirement at P_ch_max if that takes longer. Without a fleet
+        or ``max_wait`` the window runs to the horizon. A berth whose service
+        time cannot end inside the horizon gets an empty window.
+        """
+        pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        fleet = {aes.vessel_id: aes for aes in aes_fleet or []}
+        n_berths = self.params.n_berths
+        wait = (None if self.max_wait is None
+                else int(np.ceil(self.max_wait * self.steps_per_hour - 1e-9)))
+        windows = np.zeros((n_berths, len(pairs_all), 2), dtype=np.int64)
+        for k, (vessel_id, pairs) in enumerate(pairs_all.items()):
+            T_a = [pair['T_a'] for pair in pairs]
+            windows[:, k, 0] = max(min(T_a), 0)
+            if vessel_id not in fleet:
+                windows[:, k, 1] = n_hours
+                continue
+            aes = fleet[vessel_id]
+            energy = aes.E_ESS * (self.SOC_target - min(pair['SOC_a'] for pair in pairs))
+            charge_steps = int(np.ceil(max(energy, 0.0) / (self.eta_ch * self.P_ch_max * self.dt)
+                                       - 1e-9))
+            for m in range(n_berths):
+                service = self.service_steps(m, aes.vessel_type)
+                stay = max(service, charge_steps)
+                windows[m, k, 1] = (n_hours if wait is None
+                                    else min(max(T_a) + wait + stay, n_hours))
+                if windows[m, k, 0] + service > n_hours:
+                    windows[m, k, 1] = windows[m, k, 0]
+        return windows.reshape(-1, 2)
+
+    def symmetry_classes(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                         aes_fleet: List[AESParameters]) -> Tuple[List[List[int]], List[List[int]]]:
+        """Groups of interchangeable berths and of interchangeable vessels
+
+        Berths with the same Table III service times share P_ch_max and the
+        port bus, so swapping their schedules gives another solution of equal
+        cost. Vessels are interchangeable when the model sees the same data
+        for them: vessel type, E_ESS and candidate pairs (T_a, SOC_a, cost).
+        Returns (berth classes, vessel classes) as lists of berth indices and
+        of vessel positions in the pair dict, keeping only groups of two or more.
+        """
+        pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        fleet = {aes.vessel_id: aes for aes in aes_fleet or []}
+        berths, vessels = {}, {}
+        for m in range(self.params.n_berths):
+            berths.setdefault(tuple(self.params.berth_times[m]), []).append(m)
+        for k, (vessel_id, pairs) in enumerate(pairs_all.items()):
+            aes = fleet[vessel_id]
+            key = (aes.vessel_type, aes.E_ESS,
+                   tuple((pair['T_a'], pair['SOC_a'], pair['cost']) for pair in pairs))
+            vessels.setdefault(key, []).append(k)
+        return ([group for group in berths.values() if len(group) > 1],
+                [group for group in vessels.values() if len(group) > 1])
+
     def optimize_voltage_regulation(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]], 
-                                  pv_forecast: np.ndarray, load_forecast: np.ndarray) -> Dict:
-        """Solve extended OPF with berth allocation"""
-        
-        n_vessels = len(Ta_SOCa_pairs_all)
+                                  pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                                  aes_fleet: List[AESParameters] = None) -> Dict:
+        """Solve extended OPF with berth allocation
+
+        Build, canonicalization and solver times are returned under 'timing'
+        (and kept in ``self.last_timing``). With a cache, a stored result for the
+        same inputs is returned with 'cached': True instead of solving; its
+        'timing' is then the lookup, with the original solve's under 'solved'.
+        """
+        build_start = time.perf_counter()
+        key = self._cache_key(Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet)
+        if key:
+            hit, result = self.cache.get(key)
+            if hit:
+                result = cache_hit(result, time.perf_counter() - build_start)
+                self.last_timing = result['timing']
+                return result
+        model = self.build_model(Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet)
+        result = self.solve_model(model, build_time=time.perf_counter() - build_start)
+        if key and result['success']:
+            self.cache.put(key, result)
+        return result
+
+    def _cache_key(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]], pv_forecast: np.ndarray,
+                   load_forecast: np.ndarray, aes_fleet: List[AESParameters]) -> str:
+        """Fingerprint of the regulation problem (None without a cache)
+
+        Pairs enter through the fields the model reads (T_a, SOC_a, cost).
+        """
+        if self.cache is None:
+            return None
+        pairs = {vessel_id: [(pair['T_a'], pair['SOC_a'], pair['cost']) for pair in pairs]
+                 for vessel_id, pairs in Ta_SOCa_pairs_all.items()}
+        options = {'solver': self.solver, 'P_ch_max': self.P_ch_max,
+                   'port_capacity': self.port_capacity, 'SOC_target': self.SOC_target,
+                   'eta_ch': self.eta_ch, 'loss_weight': self.loss_weight,
+                   'tap_weight': self.tap_weight, 'energy_price': self.energy_price,
+                   'steps_per_hour': self.steps_per_hour, 'max_wait': self.max_wait,
+                   'presolve': self.presolve}
+        return fingerprint('voltage', pairs, np.asarray(pv_forecast, dtype=float),
+                           np.asarray(load_forecast, dtype=float), list(aes_fleet or []),
+                           self.params, self.network, options)
+
+    def build_model(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                    pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                    aes_fleet: List[AESParameters] = None,
+                    state: HorizonState = None, relax: bool = False,
+                    parametric: bool = False) -> Dict:
+        """Assemble the berth/charging MILP from whole-array CVXPY expressions
+
+        The bilinear P_ch * omega product is replaced by an auxiliary z = P_ch * omega
+        with McCormick (big-M = P_ch_max) constraints, so the model is a true MILP.
+        Pair selection is coupled to the berth schedule: a vessel can only be
+        berthed from the selected T_a on, and the energy charged must lift the
+        selected SOC_a to SOC_target. With ``aes_fleet`` each vessel also gets
+        one berth for one contiguous stay of its Table III service time.
+        The objective is the selected pairs' voyage cost, ``energy_price`` times
+        the energy delivered, plus ``loss_weight`` times a loss term: linearized LinDistFlow branch losses when a network
+        model is set (which also enforces bus voltage limits through tap and
+        Q_PV), otherwise net-load-weighted charging. The OLTC may switch at most
+        tap_max times over the horizon. Vessels without candidate pairs are left out.
+
+        ``state`` continues a committed plan (see rolling_horizon.py): the
+        tap budget and service already delivered carry over, vessels at berth
+        keep their berth until served, and in a non-final window a vessel only
+        starts a stay it can complete inside the window (or waits for a later one). ``relax`` drops all
+        integrality (used to price energy, see energy_prices).
+
+        With ``max_wait`` set (and no ``state``), berth variables exist only
+        inside berth_windows: a vessel is at berth between its earliest arrival
+        and its latest arrival plus ``max_wait`` plus the stay it needs.
+
+        ``presolve`` keeps berth variables only in the cells that can be
+        nonzero (berth_windows), fixes y and the pairs that cannot be served
+        inside the horizon to zero and, with a fleet, adds symmetry-breaking
+        constraints (see _symmetry_constraints). With ``state`` only berths and
+        vessels the committed plan does not involve are ordered; a parametric
+        model gets no presolve, since its pair data change between solves. The
+        model dict reports what was done, or why not, under 'presolve'.
+
+        ``parametric`` holds the forecasts and the pairs' T_a, SOC_a and cost
+        in cp.Parameters (see model_parameters), so the problem can be
+        re-solved for new values without being rebuilt (see persistent.py).
+        Pairs with T_a past the horizon are disabled slots there.
+
+        Returns a dict holding the cp.Problem, its variables and the layout
+        needed to unpack them.
+        """
+        if parametric and state is not None:
+            raise ValueError("Parametric models cover a whole horizon; state must be None")
+        Ta_SOCa_pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        fleet = {aes.vessel_id: aes for aes in aes_fleet or []}
+        presolve = self.presolve and not parametric
+        rolling = state is not None
+        windowed = (self.max_wait is not None or presolve) and not rolling and not parametric
+        state = state or HorizonState()
+        parameters = {}
+        if parametric:
+            parameters = {name: cp.Parameter(np.shape(value), value=value)
+                          for name, value in self.model_parameters(
+                              Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet).items()}
+        vessel_ids = list(Ta_SOCa_pairs_all)
+        all_pairs = [pair for pairs in Ta_SOCa_pairs_all.values() for pair in pairs]
+
+        n_vessels = len(vessel_ids)
         n_hours = len(pv_forecast)
         n_berths = self.params.n_berths
+        n_bk = n_berths * n_vessels
+        n_pairs = len(all_pairs)
         
         # Decision variables using CVXPY for MILP
-        # Binary variables for berth allocation
-        omega = cp.Variable((n_berths, n_vessels, n_hours), boolean=True)  # berth allocation
-        mu = cp.Variable((n_berths, n_vessels, n_hours), boolean=True)     # start service
+        # Binary variables for berth allocation, rows indexed m * n_vessels + k,
+        # one per cell of the (dense or windowed) berth grid
+        grid = BerthGrid(n_berths, n_vessels, n_hours,
+                         self.berth_windows(Ta_SOCa_pairs_all, n_hours, aes_fleet)
+                         if windowed else None)
+        binary = not relax
+        omega = grid.variable(boolean=binary)  # berth allocation
+        mu = grid.variable(boolean=binary)     # start service
         
         # Continuous variables
-        tap = cp.Variable(n_hours, integer=True)  # OLTC tap position
-        Q_PV = cp.Variable((4, n_hours))          # PV reactive power (4 PVs)
-        P_ch = cp.Variable((n_berths, n_vessels, n_hours))  # Charging power
-        
-        # Vessel selection variables (which Ta-SOCa pair to choose)
-        vessel_selection = {}
-        for vessel_id in Ta_SOCa_pairs_all:
-            n_pairs = len(Ta_SOCa_pairs_all[vessel_id])
-            vessel_selection[vessel_id] = cp.Variable(n_pairs, boolean=True)
-        
-        # Objective: minimize power losses (simplified as total charging power deviation)
-        objective = cp.Minimize(cp.sum(cp.square(P_ch)))
+        n_pv = self.network.n_pv if self.network else 4
+        tap = cp.Variable(n_hours, integer=binary)  # OLTC tap position
+        Q_PV = cp.Variable((n_pv, n_hours))       # PV reactive power (kVar)
+        P_ch = grid.variable()                    # Charging power set-point
+        z = grid.variable()                       # Delivered charging power = P_ch * omega
         
-        constraints = []
-        
-        # Berth allocation constraints
-        for t in range(n_hours):
-            for m in range(n_berths):
-                # Each berth serves at most one vessel
-                constraints.append(cp.sum([omega[m, k, t] for k in range(n_vessels)]) <= 1)
-            
-            for k in range(n_vessels):
-                # Each vessel at most one berth
-                constraints.append(cp.sum([omega[m, k, t] for m in range(n_berths)]) <= 1)
+        # Vessel selection variables (which Ta-SOCa pair to choose), one block per vessel
+        S = self.selection_matrix(Ta_SOCa_pairs_all)
+        selection = cp.Variable(n_pairs, boolean=binary)
+        pair_cost = parameters.get('pair_cost', np.array([pair['cost'] for pair in all_pairs]))
+        pair_SOC = np.array([pair['SOC_a'] for pair in all_pairs])
+        pair_Ta = np.array([pair['T_a'] for pair in all_pairs])
+        pair_offsets = np.concatenate([[0], np.cumsum(S.sum(axis=1).A1)]).astype(int)
+
+        # arrival[k, t] = 1 iff the selected pair of vessel k has T_a <= t
+        hours = np.arange(n_hours)
+        arrived = (pair_Ta[:, None] <= hours[None, :]).astype(float)       # (n_pairs, n_hours)
+        pair_vessel = np.repeat(np.arange(n_vessels),
+                                [len(pairs) for pairs in Ta_SOCa_pairs_all.values()])
+        if parametric:
+            arrival = S @ cp.multiply(parameters['arrived'],
+                                      cp.reshape(selection, (n_pairs, 1), order='C')
+                                      @ np.ones((1, n_hours)))
+        else:
+            M_arrival = sp.csr_matrix(
+                (arrived.ravel(),
+                 ((pair_vessel[:, None] * n_hours + hours[None, :]).ravel(),
+                  np.repeat(np.arange(n_pairs), n_hours))),
+                shape=(n_vessels * n_hours, n_pairs))
+            arrival = cp.reshape(M_arrival @ selection, (n_vessels, n_hours), order='C')
         
-        # Vessel selection constraints
-        for vessel_id in vessel_selection:
-            constraints.append(cp.sum(vessel_selection[vessel_id]) == 1)
+        # Objective: selected voyage cost + losses (LinDistFlow) or net-load-weighted charging
+        network_constraints, network_vars = [], {}
+        if self.network:
+            network_constraints, losses, network_vars = self.network.constraints(
+                tap, Q_PV, grid.per_step(z), pv_forecast, load_forecast,
+                terms={name: parameters[name] for name in
+                       ('p_fixed', 'q_fixed', 'q_limit', 'loss_P', 'loss_Q')} if parametric else None)
+            # Small tap-deviation penalty picks the neutral tap among loss-equivalent ones
+            loss_term = (self.dt * self.network.base_kva * losses
+                         + self.tap_weight * cp.sum(cp.abs(tap)))
+        else:
+            net_load = parameters.get('net_load', np.asarray(load_forecast, dtype=float)
+                                      - np.asarray(pv_forecast, dtype=float))
+            loss_term = self.dt * (grid.per_step(z) @ net_load)
+        cost = (pair_cost @ selection + self.loss_weight * loss_term
+                + self.energy_price * self.dt * cp.sum(z))
         
-        # Power flow constraints (simplified)
-        for t in range(n_hours):
-            total_charging = cp.sum([P_ch[m, k, t] * omega[m, k, t] 
-                                   for m in range(n_berths) for k in range(n_vessels)])
-            
+        # Berth occupied by each (berth, vessel) row at the step before the window
+        omega_prev = np.zeros(n_bk)
+        for i, vessel_id in enumerate(vessel_ids):
+            if vessel_id in state.berthed:
+                omega_prev[state.berth[vessel_id] * n_vessels + i] = 1.0
+        constraints = [
+            # Berth allocation: each berth serves at most one vessel,
+            # each vessel occupies at most one berth, and only after arrival
+            grid.per_berth(omega) <= 1,
+            grid.per_vessel(omega) <= arrival,
+            # Vessel selection: exactly one Ta-SOCa pair per vessel
+            S @ selection == 1,
+            # McCormick envelope of z = P_ch * omega with 0 <= P_ch <= P_ch_max
+            z >= 0,
+            z <= self.P_ch_max * omega,
+            z <= P_ch,
+            z >= P_ch - self.P_ch_max * (1 - omega),
             # Power balance (simplified - assuming radial network)
-            constraints.append(total_charging <= 1000)  # Maximum port capacity
-        
-        # OLTC constraints
-        constraints.append(tap >= -10)
-        constraints.append(tap <= 10)
-        
-        # PV reactive power constraints
-        for i in range(4):
-            for t in range(n_hours):
-                constraints.append(Q_PV[i, t] >= -50)  # -50 kVar
-                constraints.append(Q_PV[i, t] <= 50)   # +50 kVar
-        
-        # Charging power constraints
-        constraints.append(P_ch >= 0)
-        constraints.append(P_ch <= 200)  # Maximum charging power
+            grid.per_step(z) <= self.port_capacity,  # Maximum port capacity
+            # OLTC constraints
+            tap >= -10, tap <= 10,
+            # PV reactive power constraints (kVar)
+            Q_PV >= -50, Q_PV <= 50,
+            # Charging power constraints
+            P_ch >= 0, P_ch <= self.P_ch_max,
+            # Service start: mu marks 0 -> 1 transitions of omega
+            *grid.starts(mu, omega, omega_prev),
+        ] + network_constraints
+        if parametric:
+            constraints.append(selection <= parameters['enabled'])
+
+        # Daily OLTC switching budget: sum |tap_t+1 - tap_t| <= tap_max
+        taps_left = self.params.tap_max if state.taps_left is None else state.taps_left
+        steps = tap if state.tap is None else cp.hstack([np.array([state.tap]), tap])
+        if steps.size > 1:
+            gamma = cp.Variable(steps.size - 1, integer=binary)
+            constraints += [gamma >= steps[1:] - steps[:-1], gamma >= steps[:-1] - steps[1:],
+                            cp.sum(gamma) <= taps_left]
+
+        y, energy = None, None
+        if fleet and n_vessels:
+            E_ESS = np.array([fleet[k].E_ESS for k in vessel_ids])
+            delta = np.array([[self.service_steps(m, fleet[k].vessel_type)
+                               for k in vessel_ids] for m in range(n_berths)])
+            served = np.array([state.served.get(k, 0) for k in vessel_ids])
+            charged_before = np.array([state.charged.get(k, 0.0) for k in vessel_ids])
+            at_berth = np.isin(vessel_ids, state.berthed)[pair_vessel]
+
+            # Service still due per (berth, pair); a vessel already at berth may
+            # run past a non-final window, everyone else must finish inside it
+            remaining = np.maximum(delta - served, 0)[:, pair_vessel]     # (n_berths, n_pairs)
+            due = remaining
+            if not state.final:
+                due = np.where(at_berth, np.minimum(remaining, n_hours), remaining)
+            available = n_hours - np.clip(pair_Ta, 0, None)
+            fits = state.final | at_berth | (due <= available)
+            share = np.where(remaining > 0, due / np.maximum(remaining, 1), 1.0)
+            energy = E_ESS[pair_vessel] * (self.SOC_target - pair_SOC) - charged_before[pair_vessel]
+
+            # (berth, vessel)-row x pair matrices: requirements and blocked pairs
+            rows = (np.arange(n_berths)[:, None] * n_vessels + pair_vessel[None, :]).ravel()
+            cols = np.tile(np.arange(n_pairs), n_berths)
+            def pair_matrix(values):
+                return sp.csr_matrix((values.ravel(), (rows, cols)), shape=(n_bk, n_pairs))
+            R_hours = pair_matrix(np.where(fits, due, 0.0))
+            R_energy = pair_matrix(np.where(fits, energy * share, 0.0))
+            blocked = pair_matrix((~fits).astype(float))
+            M_hours = np.maximum(R_hours.max(axis=1).toarray().ravel(), 0.0)
+            M_energy = np.maximum(R_energy.max(axis=1).toarray().ravel(), 0.0)
+
+            y = cp.Variable(n_bk, boolean=binary)  # vessel k assigned to berth m
+            # Rows whose service is due: the assigned berth in the final window;
+            # before that only a stay that starts (or continues) in this window
+            engaged = y
+            if not state.final:
+                continuing = np.tile(np.isin(vessel_ids, state.berthed), n_berths)
+                engaged = grid.per_row(mu) + cp.multiply(continuing.astype(float), y)
+            constraints += [
+                grid.A_vessel @ y == 1,
+                omega <= grid.broadcast_rows(y),
+                omega <= 1 - grid.broadcast_rows(blocked @ selection),
+                grid.per_row(omega) >= R_hours @ selection - cp.multiply(M_hours, 1 - engaged),
+                # one contiguous stay, none left for vessels that already started
+                grid.per_row(mu) <= 1 - np.tile(served > 0, n_berths),
+            ]
+            required = R_energy @ selection
+            if parametric:
+                required = pair_matrix(np.ones((n_berths, n_pairs))) @ cp.multiply(
+                    parameters['pair_energy'], selection)
+                M_energy = parameters['M_energy']
+            energy = self.eta_ch * self.dt * grid.per_row(z) >= (
+                required - cp.multiply(M_energy, 1 - engaged))
+            constraints.append(energy)
+
+            # Vessels that started service keep their berth; those at berth stay until served
+            held = np.zeros((n_bk, n_hours))
+            for i, vessel_id in enumerate(vessel_ids):
+                if vessel_id in state.berth:
+                    row = state.berth[vessel_id] * n_vessels + i
+                    constraints.append(y[row] == 1)
+                    if vessel_id in state.berthed:
+                        hours_left = max(delta[state.berth[vessel_id], i] - served[i], 0)
+                        held[row, :min(hours_left, n_hours)] = 1.0
+            if held.any():
+                constraints.append(omega >= grid.gather(held))
+
+        report = None
+        if self.presolve and parametric:
+            report = {'enabled': False,
+                      'reason': 'parametric model: pair data change between solves'}
+        elif presolve:
+            presolve_start = time.perf_counter()
+            report = {'enabled': True, 'dense_cells': n_bk * n_hours, 'cells': grid.size,
+                      'fixed_y': 0, 'fixed_pairs': 0, 'berth_classes': [],
+                      'vessel_classes': [], 'ordering_constraints': 0}
+            if rolling:
+                report['reason'] = ('rolling window: no zero fixing, symmetry breaking '
+                                    'only among uncommitted berths and vessels')
+            if y is not None:
+                if not rolling:
+                    # Rows with an empty window and pairs no berth can serve in time
+                    empty = np.flatnonzero(grid.lengths == 0)
+                    late = np.flatnonzero(pair_Ta + delta.min(axis=0)[pair_vessel] > n_hours)
+                    if len(empty):
+                        constraints.append(y[empty] == 0)
+                    if len(late):
+                        constraints.append(selection[late] == 0)
+                    report.update(fixed_y=len(empty), fixed_pairs=len(late))
+                if binary:
+                    berth_classes, vessel_classes = self.symmetry_classes(Ta_SOCa_pairs_all,
+                                                                          aes_fleet)
+                    if rolling:
+                        berth_classes, vessel_classes = self._uncommitted_classes(
+                            berth_classes, vessel_classes, vessel_ids, state)
+                    ordering = self._symmetry_constraints(y, selection, n_vessels, pair_offsets,
+                                                          berth_classes, vessel_classes)
+                    constraints += ordering
+                    report.update(berth_classes=berth_classes, vessel_classes=vessel_classes,
+                                  ordering_constraints=sum(c.size for c in ordering))
+            report['time'] = time.perf_counter() - presolve_start
+        objective = cp.Minimize(cost)
         
-        # Create and solve problem
-        problem = cp.Problem(objective, constraints)
+        if relax:
+            # Unit box the binaries no longer imply
+            binaries = [omega, mu, selection] + ([y] if y is not None else [])
+            constraints += [b >= 0 for b in binaries] + [b <= 1 for b in binaries]
+
+        return {
+            'problem': cp.Problem(objective, constraints),
+            'omega': omega, 'mu': mu, 'tap': tap, 'Q_PV': Q_PV, 'P_ch': P_ch, 'z': z,
+            'selection': selection, 'y': y, 'energy': energy, 'network_vars': network_vars,
+            'parameters': parameters, 'grid': grid, 'presolve': report,
+            'shape': (n_berths, n_vessels, n_hours),
+            'vessel_ids': vessel_ids,
+            'pair_offsets': pair_offsets,
+        }
+
+    @staticmethod
+    def _uncommitted_classes(berth_classes: List[List[int]], vessel_classes: List[List[int]],
+                             vessel_ids: List[int], state: HorizonState
+                             ) -> Tuple[List[List[int]], List[List[int]]]:
+        """Symmetry classes restricted to what a committed plan leaves free
+
+        A vessel that has started service or charging is pinned to its berth,
+        so neither it nor that berth can be swapped with an identical one.
+        """
+        committed = {k for k, vessel_id in enumerate(vessel_ids)
+                     if vessel_id in state.berth or state.served.get(vessel_id, 0) > 0
+                     or state.charged.get(vessel_id, 0.0) > 0}
+        held = {state.berth[vessel_id] for vessel_id in vessel_ids if vessel_id in state.berth}
+
+        def free(classes, taken):
+            groups = [[i for i in group if i not in taken] for group in classes]
+            return [group for group in groups if len(group) > 1]
+        return free(berth_classes, held), free(vessel_classes, committed)
+
+    @staticmethod
+    def _symmetry_constraints(y: cp.Variable, selection: cp.Variable, n_vessels: int,
+                              pair_offsets: np.ndarray, berth_classes: List[List[int]],
+                              vessel_classes: List[List[int]]) -> List[cp.Constraint]:
+        """Ordering constraints that keep one of each set of equivalent allocations
+
+        Identical berths are ordered by the first vessel they serve: vessel k
+        may use a berth only if its predecessor in the class serves a vessel
+        before k (so empty berths come last). Identical vessels, whose pair
+        lists are equal, are ordered by the position of their selected pair.
+        Any solution can be brought into this order by first swapping the
+        schedules of identical vessels, then relabelling identical berths.
+        """
+        constraints = []
+        earlier = sp.csr_matrix(np.tril(np.ones((n_vessels, n_vessels)), -1))
+        for berths in berth_classes:
+            for a, b in zip(berths, berths[1:]):
+                constraints.append(y[b * n_vessels:(b + 1) * n_vessels]
+                                   <= earlier @ y[a * n_vessels:(a + 1) * n_vessels])
+        for vessels in vessel_classes:
+            position = np.arange(pair_offsets[vessels[0] + 1] - pair_offsets[vessels[0]])
+            chosen = [position @ selection[pair_offsets[k]:pair_offsets[k + 1]] for k in vessels]
+            constraints += [a <= b for a, b in zip(chosen, chosen[1:])]
+        return constraints
+
+    def model_parameters(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                         pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                         aes_fleet: List[AESParameters] = None) -> Dict[str, np.ndarray]:
+        """Values of a parametric build_model's cp.Parameters for the given inputs
+
+        Pair data ('pair_cost', 'arrived', 'enabled', with a fleet 'pair_energy'
+        and its big-M 'M_energy') and the forecast terms of the loss model
+        ('net_load', or the LinDistFlow forecast_terms with a network).
+        """
+        Ta_SOCa_pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        all_pairs = [pair for pairs in Ta_SOCa_pairs_all.values() for pair in pairs]
+        n_hours = len(pv_forecast)
+        pair_Ta = np.array([pair['T_a'] for pair in all_pairs], dtype=float)
+        values = {
+            'pair_cost': np.array([pair['cost'] for pair in all_pairs], dtype=float),
+            'arrived': (pair_Ta[:, None] <= np.arange(n_hours)[None, :]).astype(float),
+            'enabled': (pair_Ta < n_hours).astype(float),
+        }
+        if self.network:
+            values.update(self.network.forecast_terms(pv_forecast, load_forecast))
+        else:
+            values['net_load'] = (np.asarray(load_forecast, dtype=float)
+                                  - np.asarray(pv_forecast, dtype=float))
+        if aes_fleet:
+            fleet = {aes.vessel_id: aes for aes in aes_fleet}
+            counts = [len(pairs) for pairs in Ta_SOCa_pairs_all.values()]
+            pair_vessel = np.repeat(np.arange(len(counts)), counts)
+            E_ESS = np.array([fleet[k].E_ESS for k in Ta_SOCa_pairs_all], dtype=float)
+            pair_SOC = np.array([pair['SOC_a'] for pair in all_pairs], dtype=float)
+            energy = E_ESS[pair_vessel] * (self.SOC_target - pair_SOC)
+            # Big-M of each (berth, vessel) row: the vessel's largest requirement
+            M_energy = np.zeros(len(counts))
+            np.maximum.at(M_energy, pair_vessel, energy)
+            values['pair_energy'] = energy
+            values['M_energy'] = np.tile(M_energy, self.params.n_berths)
+        return values
+
+    def energy_prices(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                      pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                      aes_fleet: List[AESParameters], result: Dict) -> Dict[int, float]:
+        """Marginal port cost ($/kWh) of each vessel's required charging energy
+
+        Re-solves the model as an LP with the berth schedule, pair selection and
+        taps of a solved ``result`` fixed; the duals of the energy constraints
+        are the prices. Vessels get 0.0 if the LP cannot be solved.
+        """
+        model = self.build_model(Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet,
+                                 relax=True)
+        prices = {vessel_id: 0.0 for vessel_id in model['vessel_ids']}
+        if model['energy'] is None:
+            return prices
+
+        n_berths, n_vessels, n_hours = model['shape']
+        omega = np.round(result['omega']).reshape(n_berths * n_vessels, n_hours)
+        selection = np.concatenate([np.round(result['vessel_selection'][vessel_id])
+                                    for vessel_id in model['vessel_ids']])
+        fixed = [model['omega'] == model['grid'].gather(omega),
+                 model['y'] == (omega.sum(axis=1) > 0).astype(float),
+                 model['selection'] == selection,
+                 model['tap'] == np.round(result['tap'])]
+        problem = cp.Problem(model['problem'].objective, model['problem'].constraints + fixed)
+        lp_solver = cp.HIGHS if cp.HIGHS in cp.installed_solvers() else cp.CLARABEL
+        try:
+            problem.solve(solver=lp_solver)
+        except cp.error.SolverError as e:
+            print(f"Energy pricing failed: {e}")
+            return prices
+        if problem.status != cp.OPTIMAL or model['energy'].dual_value is None:
+            return prices
+
+        duals = np.asarray(model['energy'].dual_value).reshape(n_berths, n_vessels)
+        return {vessel_id: float(max(duals[:, i].max(), 0.0))
+                for i, vessel_id in enumerate(model['vessel_ids'])}
+
+    def solve_model(self, model: Dict, build_time: float = 0.0, warm_start: bool = False) -> Dict:
+        """Solve a model from build_model and unpack the allocation
+
+        With ``warm_start`` the variables' current values are offered to the
+        solver as a starting point (used by solvers that accept one). The
+        model's presolve report, if any, is returned under 'presolve'.
+        """
+        problem = model['problem']
+        timing = {'build': build_time}
+        self.last_timing = timing
+        presolved = {} if model.get('presolve') is None else {'presolve': model['presolve']}
         
         try:
-            problem.solve(solver=cp.CBC, verbose=False)  # Using open-source CBC solver
+            solve_start = time.perf_counter()
+            problem.solve(solver=self.solver, verbose=False, warm_start=warm_start)
+            solve_wall = time.perf_counter() - solve_start
+            timing['canonicalization'] = problem.compilation_time
+            timing['solve'] = (problem.solver_stats.solve_time
+                               if problem.solver_stats.solve_time is not None
+                               else solve_wall - problem.compilation_time)
+            timing['total'] = build_time + solve_wall
             
-            if problem.status == cp.OPTIMAL:
+            if problem.status in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+                offsets = model['pair_offsets']
+                selection = model['selection'].value
+                network = {}
+                if model['network_vars']:
+                    P, Q = model['network_vars']['P_branch'].value, model['network_vars']['Q_branch'].value
+                    network = {'V': model['network_vars']['V'].value,
+                               'losses_kw': self.network.losses_kw(P, Q)}
+                grid = model['grid']
                 return {
                     'success': True,
-                    'omega': omega.value,
-                    'tap': tap.value,
-                    'Q_PV': Q_PV.value,
-                    'P_ch': P_ch.value,
+                    'omega': grid.scatter(model['omega'].value).reshape(model['shape']),
+                    'tap': model['tap'].value,
+                    'Q_PV': model['Q_PV'].value,
+                    'P_ch': grid.scatter(model['z'].value).reshape(model['shape']),
                     'objective_value': problem.value,
-                    'vessel_selection': {k: v.value for k, v in vessel_selection.items()}
+                    'mip_gap': mip_gap(problem),
+                    **solver_iterations(problem),
+                    **network,
+                    'vessel_selection': {vessel_id: selection[offsets[i]:offsets[i + 1]]
+                                         for i, vessel_id in enumerate(model['vessel_ids'])},
+                    'timing': timing,
+                    **presolved
                 }
             else:
-                return {'success': False, 'status': problem.status}
+                return {'success': False, 'status': problem.status, 'timing': timing,
+                        **presolved}
                 
         except Exception as e:
             print(f"Voltage regulation optimization failed: {e}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), 'timing': timing, **presolved}
 
 class CoordinatedOptimizer:
     """Main coordinated optimization procedure (Algorithm 1)"""
     
-    def __init__(self, aes_fleet: List[AESParameters], seaport_params: SeaportParameters):
+    def __init__(self, aes_fleet: List[AESParameters], seaport_params: SeaportParameters,
+                 n_workers: int = 1, chunk_size: int = None, d_route: float = 30.0,
+                 voyage_backend: str = 'slsqp', network: LinDistFlow = None,
+                 rolling_horizon: Tuple[int, int] = None, cache: SolveCache = None,
+                 store: ResultsStore = None, method: str = 'Proposed',
+                 tracer: Tracer = None, shared_results: bool = False,
+                 persistent_model: bool = False, steps_per_hour: int = 1,
+                 verbose: bool = True, presolve: bool = False):
         self.aes_fleet = aes_fleet
         self.seaport_params = seaport_params
+        self.n_workers = n_workers    # >1 runs Step 3 in a process pool
+        # Arrival times per (vessel, T_a-range) job; None: whole windows, split
+        # only as far as needed to give every worker a job
+        self.chunk_size = chunk_size
+        self.d_route = d_route        # sailing distance of default_route
+        # (origin, destination) of vessels without an entry in vessel_routes
+        self.default_route = ((0, 0), (9, 9))
+        self.voyage_backend = voyage_backend  # 'slsqp' or 'cvxpy' (see VoyageScheduler)
         self.route_optimizer = RouteOptimizer()
-        self.voltage_regulator = VoltageRegulator(seaport_params)
+        self.route_service = RouteService()
+        self.cache = cache            # persistent voyage/regulation results, see solve_cache
+        # Model resolution: arrival times, forecasts and plans are per step
+        self.steps_per_hour = steps_per_hour
+        # presolve: zero fixing and symmetry breaking in the berth MILP, reported
+        # in the Step 5 result (see VoltageRegulator.build_model)
+        self.voltage_regulator = VoltageRegulator(seaport_params, network=network, cache=cache,
+                                                  steps_per_hour=steps_per_hour,
+                                                  presolve=presolve)
+        # (window, stride[, min_vessels]): solve Step 5 with RollingHorizonRegulator
+        self.rolling_horizon = rolling_horizon
+        self.store = store            # successful runs are written here under `method`
+        self.method = method
+        self.tracer = tracer          # per-step timings and solver counters, see profiling
+        # Pool workers write voyage profiles into one shared PackedVoyages buffer
+        self.shared_results = shared_results
+        self.executor = None          # long-lived pool for Step 3 instead of one per call
+        # Step 5 re-solves one compiled, warm-started MILP across runs (see PersistentRegulator)
+        self.persistent_regulator = None
+        if persistent_model:
+            from persistent import PersistentRegulator
+            self.persistent_regulator = PersistentRegulator(self.voltage_regulator)
+        # Step banners and per-vessel progress; failures are always printed
+        self.verbose = verbose
         
     def run_coordinated_optimization(self, wind_conditions: np.ndarray, 
                                    pv_forecast: np.ndarray, 
-                                   load_forecast: np.ndarray) -> Dict:
-        """Execute Algorithm 1: Customized Coordinated Optimization Procedure"""
-        
-        print("Step 1: Initialization completed")
+                                   load_forecast: np.ndarray,
+                                   vessel_routes: Dict[int, Tuple[Tuple[int, int], Tuple[int, int]]] = None,
+                                   resistance_profile: List[float] = None) -> Dict:
+        """Execute Algorithm 1: Customized Coordinated Optimization Procedure
+
+        ``vessel_routes`` optionally maps vessel_id -> (origin, destination);
+        other vessels sail ``default_route``. All routes are answered by the
+        RouteService (one cached distance field per origin and weather
+        snapshot) and set each vessel's voyage inputs, see voyage_inputs.
+        ``resistance_profile`` is the hourly sea resistance along every voyage;
+        without it vessels with their own route use the resistance along it.
+        Forecasts are per model step (see ``steps_per_hour``; e.g.
+        np.repeat(hourly, steps_per_hour)).
+        With a tracer every step is recorded as a span (see profiling.Tracer)
+        and the run's spans are returned under 'trace'.
+        """
+        first_event = len(self.tracer.events) if self.tracer is not None else 0
+        with self._trace('algorithm1', n_vessels=len(self.aes_fleet)) as run:
+            result = self._run_steps(wind_conditions, pv_forecast, load_forecast,
+                                     vessel_routes, resistance_profile)
+            run['success'] = result['success']
+        if self.tracer is not None:
+            result['trace'] = self.tracer.events[first_event:]
+        return result
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def _trace(self, name: str, **attrs):
+        """Tracer span for one step (a plain counter dict when not tracing)"""
+        if self.tracer is None:
+            return contextlib.nullcontext(dict(attrs))
+        return self.tracer.step(name, **attrs)
+
+    def _run_steps(self, wind_conditions: np.ndarray, pv_forecast: np.ndarray,
+                   load_forecast: np.ndarray, vessel_routes: Dict, resistance_profile: List[float]):
+        self._log("Step 1: Initialization completed")
         
         # Step 2: Solve optimal route planning
-        print("Step 2: Solving route planning...")
-        resistance_map = self.route_optimizer.generate_resistance_map(wind_conditions)
-        optimal_route, total_resistance = self.route_optimizer.dijkstra_route_planning(
-            resistance_map, (0, 0), (9, 9)
-        )
-        print(f"Optimal route found with total resistance: {total_resistance:.3f}")
+        self._log("Step 2: Solving route planning...")
+        with self._trace('route_planning') as span:
+            resistance_map = self.route_optimizer.generate_resistance_map(wind_conditions)
+            self.route_service.set_resistance_map(resistance_map)
+            queries = {aes.vessel_id: self.default_route for aes in self.aes_fleet}
+            queries.update(vessel_routes or {})
+            planned_routes = self.route_service.routes(queries)
+            optimal_route, total_resistance = self.route_service.route(*self.default_route)
+            self._log(f"Optimal route found with total resistance: {total_resistance:.3f}")
+            self._log(f"Planned {len(planned_routes)} vessel routes "
+                      f"({self.route_service.stats()['misses']} distance fields computed)")
+            span['routes'] = len(planned_routes)
         
         # Step 3: Solve voyage scheduling for all AES
-        print("Step 3: Solving voyage scheduling...")
-        all_Ta_SOCa_pairs = {}
-        
-        for aes in self.aes_fleet:
-            voyage_scheduler = VoyageScheduler(aes)
-            pairs = []
-            
-            # Generate resistance profile (simplified)
-            resistance_profile = [0.15, 0.20, 0.18, 0.22]
-            
-            for T_a in range(aes.T_low, aes.T_up + 1):
-                result = voyage_scheduler.optimize_voyage(T_a, resistance_profile)
-                if result and result['success']:
-                    pairs.append(result)
-            
-            all_Ta_SOCa_pairs[aes.vessel_id] = pairs
-            print(f"AES {aes.vessel_id}: Generated {len(pairs)} T_a-SOC_a pairs")
+        self._log("Step 3: Solving voyage scheduling...")
+        distances, profiles = self.voyage_inputs(planned_routes, vessel_routes or {},
+                                                 resistance_profile)
+
+        with self._trace('voyage_scheduling', workers=self.n_workers) as span:
+            try:
+                all_Ta_SOCa_pairs = self.schedule_voyages(profiles, distances=distances)
+            except RuntimeError as e:
+                print(f"Voyage scheduling failed: {e}")
+                span['error'] = str(e)
+                return {'success': False, 'error': str(e)}
+            span.update(solver_counts(pair for pairs in all_Ta_SOCa_pairs.values()
+                                      for pair in pairs))
+
+        for vessel_id, pairs in all_Ta_SOCa_pairs.items():
+            self._log(f"AES {vessel_id}: Generated {len(pairs)} T_a-SOC_a pairs")
         
+        result = self.plan_berths(all_Ta_SOCa_pairs, pv_forecast, load_forecast)
+        if result['success']:
+            result = {'success': True, 'route': optimal_route, 'vessel_routes': planned_routes,
+                      **{k: v for k, v in result.items() if k != 'success'}}
+            if self.store is not None:
+                self.store.write(self.method, result, all_Ta_SOCa_pairs, self.steps_per_hour)
+                self._log(f"Results stored as '{self.method}' in {self.store.path}")
+        return result
+
+    def plan_berths(self, all_Ta_SOCa_pairs: Dict[int, List[Dict]], pv_forecast: np.ndarray,
+                    load_forecast: np.ndarray) -> Dict:
+        """Steps 4-6: SI filtering, voltage regulation and the final strategies
+
+        Takes Step 3's pairs as returned by schedule_voyages (they get their
+        'SI'); the result has the run_coordinated_optimization layout without
+        the route entries.
+        """
         # Step 4: Selection based on satisfactory index
-        print("Step 4: Filtering T_a-SOC_a pairs based on SI...")
+        self._log("Step 4: Filtering T_a-SOC_a pairs based on SI...")
         filtered_pairs = {}
         
-        for vessel_id, pairs in all_Ta_SOCa_pairs.items():
-            aes_params = next(aes for aes in self.aes_fleet if aes.vessel_id == vessel_id)
-            filtered = SatisfactoryIndex.filter_by_threshold(pairs, aes_params.beta_k)
-            filtered_pairs[vessel_id] = filtered
-            print(f"AES {vessel_id}: {len(filtered)} pairs after SI filtering (β_k={aes_params.beta_k})")
+        with self._trace('si_filter') as span:
+            for vessel_id, pairs in all_Ta_SOCa_pairs.items():
+                aes_params = next(aes for aes in self.aes_fleet if aes.vessel_id == vessel_id)
+                filtered = SatisfactoryIndex.filter_by_threshold(pairs, aes_params.beta_k)
+                filtered_pairs[vessel_id] = filtered
+                self._log(f"AES {vessel_id}: {len(filtered)} pairs after SI filtering (β_k={aes_params.beta_k})")
+            span['pairs_kept'] = sum(len(pairs) for pairs in filtered_pairs.values())
         
         # Step 5: Solve voltage regulation with berth allocation
-        print("Step 5: Solving voltage regulation...")
-        voltage_result = self.voltage_regulator.optimize_voltage_regulation(
-            filtered_pairs, pv_forecast, load_forecast
-        )
+        self._log("Step 5: Solving voltage regulation...")
+        with self._trace('voltage_regulation') as span:
+            if self.rolling_horizon:
+                from rolling_horizon import RollingHorizonRegulator
+                voltage_result = RollingHorizonRegulator(
+                    self.voltage_regulator, *self.rolling_horizon
+                ).optimize(filtered_pairs, pv_forecast, load_forecast, self.aes_fleet)
+            elif self.persistent_regulator is not None:
+                voltage_result = self.persistent_regulator.optimize(
+                    filtered_pairs, pv_forecast, load_forecast, self.aes_fleet)
+            else:
+                voltage_result = self.voltage_regulator.optimize_voltage_regulation(
+                    filtered_pairs, pv_forecast, load_forecast, self.aes_fleet
+                )
+            timing = voltage_result.get('timing', {})
+            span.update(solver_counts(timing.get('windows') or [voltage_result]))
+            span.update({name: timing[name] for name in ('build', 'canonicalization', 'solve')
+                         if name in timing})
         
         # Step 6: Determine final voyage scheduling strategy
-        print("Step 6: Finalizing strategies...")
+        self._log("Step 6: Finalizing strategies...")
         final_strategies = {}
         
         if voltage_result['success']:
-            for vessel_id, pairs in filtered_pairs.items():
-                if pairs:  # If there are valid pairs
-                    # Select the pair with best SI (simplified selection)
-                    best_pair = max(pairs, key=lambda x: x['SI'])
-                    final_strategies[vessel_id] = best_pair
-                    
-            print("Coordinated optimization completed successfully!")
-            
-            return {
-                'success': True,
-                'route': optimal_route,
-                'vessel_strategies': final_strategies,
-                'voltage_control': voltage_result,
-                'summary': self._generate_summary(final_strategies, voltage_result)
-            }
+            with self._trace('finalize'):
+                selected = voltage_result.get('vessel_selection', {})
+                for vessel_id, pairs in filtered_pairs.items():
+                    if vessel_id in selected:
+                        # Pair chosen by the berth/charging MILP
+                        final_strategies[vessel_id] = pairs[int(np.argmax(selected[vessel_id]))]
+                    elif pairs:  # If there are valid pairs
+                        # Select the pair with best SI (simplified selection)
+                        final_strategies[vessel_id] = CandidatePairs.from_pairs(pairs).best()
+                        
+                self._log("Coordinated optimization completed successfully!")
+                
+                result = {
+                    'success': True,
+                    'vessel_strategies': final_strategies,
+                    'voltage_control': voltage_result,
+                    'summary': self._generate_summary(final_strategies, voltage_result)
+                }
+            return result
         else:
             print("Voltage regulation failed!")
             return {'success': False, 'error': 'Voltage regulation optimization failed'}
     
+    def voyage_inputs(self, planned_routes: Dict[int, Tuple[List[Tuple[int, int]], float]],
+                      own_routes=(), resistance_profile: List[float] = None
+                      ) -> Tuple[Dict[int, float], Dict[int, List[float]]]:
+        """Per-vessel voyage distance and hourly resistance from the planned routes
+
+        ``d_route`` is the distance of ``default_route``; a vessel's distance
+        scales it by the length of its planned path. Vessels in ``own_routes``
+        sample the resistance map along their path over their longest cruise,
+        unless ``resistance_profile`` is given; the others use
+        ``resistance_profile`` or DEFAULT_RESISTANCE_PROFILE.
+        """
+        reference = path_length(self.route_service.route(*self.default_route)[0])
+        resistance_map = self.route_service.resistance_map
+        distances, profiles = {}, {}
+        for aes in self.aes_fleet:
+            path, _ = planned_routes[aes.vessel_id]
+            distances[aes.vessel_id] = (self.d_route * (path_length(path) / reference)
+                                        if reference > 0 else self.d_route)
+            if resistance_profile is None and aes.vessel_id in own_routes:
+                hours = max(aes.T_up - VoyageScheduler.T_s, 1)
+                cells = np.round((np.arange(hours) + 0.5) / hours * (len(path) - 1)).astype(int)
+                profiles[aes.vessel_id] = [float(resistance_map[path[i]]) for i in cells]
+            else:
+                profiles[aes.vessel_id] = list(resistance_profile or DEFAULT_RESISTANCE_PROFILE)
+        return distances, profiles
+
+    def arrival_steps(self, aes: AESParameters) -> range:
+        """Candidate arrival steps of a vessel: its [T_low, T_up] hours at model resolution"""
+        return range(aes.T_low * self.steps_per_hour, aes.T_up * self.steps_per_hour + 1)
+
+    def _voyage_jobs(self, vessel_ids=None) -> List[Tuple[int, AESParameters, List[int]]]:
+        """Split every vessel's arrival steps into chunks of consecutive arrival times"""
+        vessels = [(index, aes) for index, aes in enumerate(self.aes_fleet)
+                   if vessel_ids is None or aes.vessel_id in vessel_ids]
+        parts = -(-max(self.n_workers, 1) // max(len(vessels), 1))
+        jobs = []
+        for index, aes in vessels:
+            T_a_values = list(self.arrival_steps(aes))
+            size = self.chunk_size or max(-(-len(T_a_values) // parts), 1)
+            for start in range(0, len(T_a_values), size):
+                jobs.append((index, aes, T_a_values[start:start + size]))
+        return jobs
+
+    def schedule_voyages(self, resistance_profile,
+                         soc_prices: Dict[int, float] = None,
+                         vessel_ids=None,
+                         distances: Dict[int, float] = None) -> Dict[int, List[Dict]]:
+        """Step 3: T_a-SOC_a pairs for every AES, serially or in a process pool
+
+        Results are assembled in fleet order and ascending T_a regardless of
+        completion order. A failing job cancels the remaining ones and is
+        re-raised as RuntimeError naming the vessel and T_a range.
+        With ``shared_results`` pool workers write their profiles into one
+        shared-memory PackedVoyages instead of pickling them back; the pairs
+        then view a private copy of that buffer and carry only T_a, SOC_a,
+        cost, the profiles and the solver counters.
+        ``soc_prices`` (vessel_id -> $/kWh) prices the arrival SOC deficit,
+        see VoyageScheduler.soc_price. ``vessel_ids`` restricts the solves
+        (and the result) to those vessels. ``resistance_profile`` is one hourly
+        profile or a vessel_id -> profile dict; ``distances`` (vessel_id -> nmi,
+        default d_route) is the voyage distance, see voyage_inputs.
+        """
+        jobs = self._voyage_jobs(vessel_ids)
+        soc_prices = soc_prices or {}
+        all_Ta_SOCa_pairs = {aes.vessel_id: [] for aes in self.aes_fleet
+                             if vessel_ids is None or aes.vessel_id in vessel_ids}
+        distances = distances or {}
+        if not isinstance(resistance_profile, dict):
+            resistance_profile = {aes.vessel_id: resistance_profile for aes in self.aes_fleet}
+        args = [(aes, T_a_values, resistance_profile[aes.vessel_id],
+                 distances.get(aes.vessel_id, self.d_route), self.voyage_backend,
+                 soc_prices.get(aes.vessel_id, 0.0), self.cache, self.steps_per_hour)
+                for _, aes, T_a_values in jobs]
+
+        if self.n_workers <= 1 and self.executor is None:
+            from voyage_pool import solve_voyage_chunk
+            outputs = []
+            for job_args, (_, aes, T_a_values) in zip(args, jobs):
+                try:
+                    outputs.append(solve_voyage_chunk(*job_args))
+                except Exception as e:
+                    raise RuntimeError(f"AES {aes.vessel_id}, T_a {T_a_values[0]}-"
+                                       f"{T_a_values[-1]}: {e}") from e
+        elif self.shared_results:
+            buffer = self._voyage_buffer()
+            try:
+                # Vessel rows start at its offset, one row per arrival step
+                offsets = buffer.arrays['offsets']
+                self._run_pool(jobs, [
+                    job_args + (buffer, int(offsets[index]) + T_a_values[0]
+                                - self.arrival_steps(aes).start)
+                    for job_args, (index, aes, T_a_values) in zip(args, jobs)])
+                packed = buffer.copy()
+            finally:
+                buffer.close()
+            return {vessel_id: pairs for vessel_id, pairs in packed.to_results().items()
+                    if vessel_id in all_Ta_SOCa_pairs}
+        else:
+            outputs = self._run_pool(jobs, args)
+
+        for (_, aes, _), pairs in zip(jobs, outputs):
+            all_Ta_SOCa_pairs[aes.vessel_id].extend(pairs)
+        return all_Ta_SOCa_pairs
+
+    def _run_pool(self, jobs: List[Tuple[int, AESParameters, List[int]]], args: List[Tuple]) -> List:
+        """solve_voyage_chunk(*args) for every job in a process pool, in job order"""
+        from voyage_pool import solve_voyage_chunk
+        with contextlib.ExitStack() as stack:
+            pool = self.executor or stack.enter_context(
+                ProcessPoolExecutor(max_workers=self.n_workers))
+            futures = [pool.submit(solve_voyage_chunk, *job_args) for job_args in args]
+            outputs = []
+            for future, (_, aes, T_a_values) in zip(futures, jobs):
+                try:
+                    outputs.append(future.result())
+                except Exception as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise RuntimeError(f"AES {aes.vessel_id}, T_a {T_a_values[0]}-"
+                                       f"{T_a_values[-1]}: {e}") from e
+        return outputs
+
+    def _voyage_buffer(self) -> PackedVoyages:
+        """Shared buffer with one row per (vessel, T_a) of the fleet's arrival windows"""
+        return PackedVoyages.allocate(
+            [(aes.vessel_id, len(self.arrival_steps(aes))) for aes in self.aes_fleet],
+            max(self.arrival_steps(aes).stop - 1 for aes in self.aes_fleet)
+            - VoyageScheduler.T_s * self.steps_per_hour, shared=True)
+
     def _generate_summary(self, strategies: Dict, voltage_result: Dict) -> Dict:
         """Generate optimization summary"""
         total_cost = sum(strategy['cost'] for strategy in strategies.values())
@@ -448,16 +1786,16 @@ class CoordinatedOptimizer:
         return {
             'total_operation_cost': total_cost,
             'average_SI': avg_SI,
-            'power_losses': voltage_result.get('objective_value', 0),
+            'power_losses': (float(np.sum(voltage_result['losses_kw']))
+                             if 'losses_kw' in voltage_result
+                             else voltage_result.get('objective_value', 0)),
             'n_vessels_optimized': len(strategies)
         }
 
 # Example usage and testing
-def run_example():
-    """Run example optimization"""
-    
-    # Define AES fleet
-    aes_fleet = [
+def example_fleet() -> List[AESParameters]:
+    """Two-vessel fleet of the example case"""
+    return [
         AESParameters(
             vessel_id=1, P_DSG_max=300, P_DSG_min=80, P_ramp=200,
             E_ESS=120, P_dis_max=60, P_dis_min=10, P_sv1=10, P_sv2=10,
@@ -468,23 +1806,41 @@ def run_example():
             vessel_id=2, P_DSG_max=400, P_DSG_min=120, P_ramp=200,
             E_ESS=180, P_dis_max=90, P_dis_min=10, P_sv1=20, P_sv2=20,
             c0=3.02e-5, c1=0.37, c2=0.01, TC_ESS=600,
-            T_low=10, T_up=12, beta_k=0.5
+            T_low=10, T_up=12, beta_k=0.5, vessel_type=2
         )
     ]
-    
-    # Seaport parameters
-    seaport_params = SeaportParameters(
-        n_buses=16, n_berths=3, V_min=0.95, V_max=1.05, tap_max=10,
+
+def example_seaport(tap_max: int = 10) -> SeaportParameters:
+    """Three-berth seaport on the 16-bus microgrid"""
+    return SeaportParameters(
+        n_buses=16, n_berths=3, V_min=0.95, V_max=1.05, tap_max=tap_max,
         berth_times={0: [2, 4, 6], 1: [2, 4, 6], 2: [1, 2, 3]}
     )
+
+def example_forecasts() -> Tuple[np.ndarray, np.ndarray]:
+    """(pv_forecast, load_forecast) of the example case, 25 hourly steps"""
+    pv_forecast = np.array([0, 0, 0.2, 0.6, 0.8, 1.0, 0.9, 0.6, 0.3, 0.1] + [0]*15)
+    load_forecast = np.array([0.7, 0.6, 0.7, 0.8, 0.9, 0.85, 0.8, 0.9, 1.0, 0.8] + [0.7]*15)
+    return pv_forecast, load_forecast
+
+def run_example():
+    """Run example optimization"""
+    
+    # Define AES fleet
+    aes_fleet = example_fleet()
+    
+    # Seaport parameters
+    seaport_params = example_seaport()
+    
+    # 16-bus seaport microgrid (Table A1) for voltage regulation
+    network = LinDistFlow(load_feeder(), V_min=seaport_params.V_min, V_max=seaport_params.V_max)
     
     # Initialize optimizer
-    optimizer = CoordinatedOptimizer(aes_fleet, seaport_params)
+    optimizer = CoordinatedOptimizer(aes_fleet, seaport_params, network=network)
     
     # Generate sample data
     wind_conditions = np.random.randint(0, 4, size=(10, 10))
-    pv_forecast = np.array([0, 0, 0.2, 0.6, 0.8, 1.0, 0.9, 0.6, 0.3, 0.1] + [0]*15)
-    load_forecast = np.array([0.7, 0.6, 0.7, 0.8, 0.9, 0.85, 0.8, 0.9, 1.0, 0.8] + [0.7]*15)
+    pv_forecast, load_forecast = example_forecasts()
     
     # Run optimization
     result = optimizer.run_coordinated_optimization(wind_conditions, pv_forecast, load_forecast)
@@ -4,46 +4,165 @@ Main script to automate running figure plotting scripts (fig2.py to fig12.py, an
 """
 
 import os
-import sys
-import subprocess
+import re
+import io
+import json
+import hashlib
+import contextlib
 import argparse
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+# Data files a figure script reads, found by name in its source
+INPUT_PATTERN = re.compile(r"""['"]([\w./-]+\.(?:csv|json|npy|npz|txt))['"]""")
+MANIFEST = ".manifest.json"
+# Modules every figure script draws with
+SHARED_INPUTS = ["figstyle.py", "figures.py"]
+
 def run_script(script_name):
-    """Run a single Python script and handle errors."""
+    """Draw and show a figure script's plot in this process and handle errors."""
+    if not Path(script_name).exists():
+        print(f"✗ Script {script_name} not found!")
+        return False
     try:
         print(f"Running {script_name}...")
         start_time = time.time()
-        
-        # Run the script and capture output
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=True, 
-                              text=True, 
-                              check=True)
-        
+
+        import matplotlib.pyplot as plt
+        from figures import figure_module
+
+        # Imported once per process; numpy/matplotlib are already loaded
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            figure_module(figure_number(script_name)).plot()
+        plt.show()
+        plt.close("all")
+
         end_time = time.time()
         print(f"✓ {script_name} completed successfully in {end_time - start_time:.2f}s")
-        
+
         # Print any output from the script
-        if result.stdout:
-            print(f"  Output: {result.stdout.strip()}")
-            
+        if stdout.getvalue():
+            print(f"  Output: {stdout.getvalue().strip()}")
+
         return True
-        
-    except subprocess.CalledProcessError as e:
+
+    except Exception as e:
         print(f"✗ Error running {script_name}:")
-        print(f"  Exit code: {e.returncode}")
-        if e.stdout:
-            print(f"  Stdout: {e.stdout}")
-        if e.stderr:
-            print(f"  Stderr: {e.stderr}")
-        return False
-    
-    except FileNotFoundError:
-        print(f"✗ Script {script_name} not found!")
+        print(f"  {type(e).__name__}: {e}")
         return False
 
+def script_inputs(script_name):
+    """Existing data files referenced by a figure script, relative to its directory."""
+    script = Path(script_name)
+    names = set(INPUT_PATTERN.findall(script.read_text())) | set(SHARED_INPUTS)
+    return sorted(str(script.parent / name) for name in names
+                  if (script.parent / name).is_file())
+
+def figure_hash(script_name, fmt, dpi):
+    """Hash of the script, its input files and the render settings."""
+    import matplotlib
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{matplotlib.__version__}:{fmt}:{dpi}".encode())
+    for path in [script_name] + script_inputs(script_name):
+        digest.update(f"{path}:".encode())
+        digest.update(Path(path).read_bytes())
+    # Data-driven figures read the results store named by AES_RESULTS
+    index = Path(os.environ.get("AES_RESULTS", "")) / "index.json"
+    if os.environ.get("AES_RESULTS") and index.is_file():
+        digest.update(index.read_bytes())
+    return digest.hexdigest()
+
+def init_render_worker():
+    """Pool initializer: select the Agg backend and pay the pyplot import once per worker."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import figures  # noqa: F401
+
+def figure_number(script_name):
+    """Figure number of a figN.py script name."""
+    return int(Path(script_name).stem.replace("fig", ""))
+
+def render_figure(script_name, output_dir, fmt="png", dpi=150):
+    """Render a figure script's plot() in this process to output_dir/<stem>.<fmt>."""
+    from figures import render
+
+    start_time = time.perf_counter()
+    stdout = io.StringIO()
+    outputs = []
+    try:
+        with contextlib.redirect_stdout(stdout):
+            path = Path(output_dir) / f"{Path(script_name).stem}.{fmt}"
+            outputs.append(render(figure_number(script_name), path, fmt, dpi))
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {"script": script_name, "success": error is None, "outputs": outputs,
+            "time": time.perf_counter() - start_time, "output": stdout.getvalue().strip(),
+            "error": error}
+
+def run_batch(scripts, output_dir="figures", jobs=None, fmt="png", dpi=150, force=False,
+              continue_on_error=False):
+    """Render scripts to files in a worker pool, skipping unchanged figures.
+
+    A figure is skipped when the hash of its script, inputs and render settings
+    matches the manifest in output_dir and all its outputs still exist.
+    Returns (successful, failed) counts.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    report = {}
+    to_render = {}
+    for script in scripts:
+        digest = figure_hash(script, fmt, dpi)
+        entry = manifest.get(script)
+        if (not force and entry and entry["hash"] == digest and entry["outputs"]
+                and all(Path(path).exists() for path in entry["outputs"])):
+            report[script] = ("cached", 0.0, entry["outputs"])
+        else:
+            to_render[script] = digest
+
+    jobs = jobs or min(len(to_render), os.cpu_count() or 1) or 1
+    print(f"Rendering {len(to_render)} figure(s) with {jobs} worker(s), "
+          f"{len(scripts) - len(to_render)} unchanged")
+    successful, failed = len(scripts) - len(to_render), 0
+    if to_render:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_render_worker) as pool:
+            futures = {pool.submit(render_figure, script, str(output_dir), fmt, dpi): script
+                       for script in to_render}
+            for future in as_completed(futures):
+                result = future.result()
+                script = result["script"]
+                if result["success"]:
+                    successful += 1
+                    manifest[script] = {"hash": to_render[script], "outputs": result["outputs"],
+                                        "time": result["time"]}
+                    report[script] = ("rendered", result["time"], result["outputs"])
+                    print(f"✓ {script} rendered in {result['time']:.2f}s")
+                    if result["output"]:
+                        print(f"  Output: {result['output']}")
+                else:
+                    failed += 1
+                    manifest.pop(script, None)
+                    report[script] = ("failed", result["time"], [])
+                    print(f"✗ Error rendering {script}: {result['error']}")
+                    if not continue_on_error:
+                        for pending in futures:
+                            pending.cancel()
+                        print("Use --continue-on-error to continue despite failures")
+                        break
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    print(f"\n{'figure':<10} {'status':<9} {'time (s)':>9}  outputs")
+    for script in scripts:
+        status, elapsed, outputs = report.get(script, ("cancelled", 0.0, []))
+        print(f"{Path(script).stem:<10} {status:<9} {elapsed:9.2f}  {', '.join(outputs)}")
+    return successful, failed
+
 def get_available_scripts():
     """Get list of available fig*.py scripts in current directory."""
     scripts = []
@@ -63,8 +182,24 @@ def main():
                        help="List available figure scripts")
     parser.add_argument("--continue-on-error", "-c", action="store_true", 
                        help="Continue running scripts even if one fails")
+    parser.add_argument("--batch", "-b", action="store_true",
+                       help="Render figures to files in parallel (Agg backend), "
+                            "skipping unchanged ones; defaults to all figures")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                       help="Worker processes for --batch (default: CPU count)")
+    parser.add_argument("--output-dir", "-o", default="figures",
+                       help="Output directory for --batch")
+    parser.add_argument("--format", default="png", help="Image format for --batch")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution for --batch")
+    parser.add_argument("--force", action="store_true",
+                       help="Re-render every figure in --batch mode")
+    parser.add_argument("--results", "-r", default=None,
+                       help="ResultsStore directory for the data-driven figures (3, 5, 6, 9); "
+                            "sets AES_RESULTS")
     
     args = parser.parse_args()
+    if args.results:
+        os.environ["AES_RESULTS"] = args.results
     
     # Get available scripts
     available_scripts = get_available_scripts()
@@ -82,7 +217,7 @@ def main():
     # Determine which scripts to run
     scripts_to_run = []
     
-    if args.all:
+    if args.all or (args.batch and not args.figures):
         scripts_to_run = available_scripts
     elif args.figures:
         for fig_num in args.figures:
@@ -123,6 +258,16 @@ def main():
         print("No scripts selected to run.")
         return
     
+    if args.batch:
+        total_start_time = time.time()
+        successful, failed = run_batch(scripts_to_run, args.output_dir, args.jobs, args.format,
+                                       args.dpi, args.force, args.continue_on_error)
+        print("\nSUMMARY:")
+        print(f"Total time: {time.time() - total_start_time:.2f}s")
+        print(f"Successful: {successful}")
+        print(f"Failed: {failed}")
+        return
+
     # Run selected scripts
     print(f"\nRunning {len(scripts_to_run)} script(s)...")
     print("=" * 50)
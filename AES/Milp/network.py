@@ -0,0 +1,210 @@
+"""
+Radial feeder model and linearized DistFlow (LinDistFlow) constraints for VoltageRegulator
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+
+TABLE_A1 = Path(__file__).with_name("table_A1.csv")
+
+@dataclass
+class Feeder:
+    """Radial network: branches (0-based bus indices) with r/x and rated bus loads, all in p.u."""
+    from_bus: np.ndarray
+    to_bus: np.ndarray
+    r: np.ndarray
+    x: np.ndarray
+    PL: np.ndarray    # rated active load per bus (p.u.)
+    QL: np.ndarray    # rated reactive load per bus (p.u.)
+    root: int = 0     # slack/OLTC bus
+
+    @property
+    def n_buses(self) -> int:
+        return len(self.PL)
+
+    @property
+    def n_branches(self) -> int:
+        return len(self.r)
+
+    def incidence(self) -> sp.csr_matrix:
+        """(n_branches, n_buses) incidence: +1 at the sending bus, -1 at the receiving bus"""
+        rows = np.concatenate([np.arange(self.n_branches)] * 2)
+        cols = np.concatenate([self.from_bus, self.to_bus])
+        data = np.concatenate([np.ones(self.n_branches), -np.ones(self.n_branches)])
+        return sp.csr_matrix((data, (rows, cols)), shape=(self.n_branches, self.n_buses))
+
+    def base_flows(self, p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lossless branch flows for bus withdrawals p, q (n_buses[, n_steps])
+
+        Solves KCL A_r^T F = -p on the non-root buses; A_r is square for a tree.
+        """
+        A_r = self.incidence()[:, self.non_root].tocsc()
+        P = spsolve(A_r.T.tocsc(), -p[self.non_root])
+        Q = spsolve(A_r.T.tocsc(), -q[self.non_root])
+        return np.asarray(P), np.asarray(Q)
+
+    @property
+    def non_root(self) -> np.ndarray:
+        return np.delete(np.arange(self.n_buses), self.root)
+
+def load_feeder(path: Path = TABLE_A1) -> Feeder:
+    """Parse table_A1.csv (1-based bus numbers) into a Feeder rooted at bus 1."""
+    table = pd.read_csv(path)
+    branches = table.dropna(subset=["from_bus", "to_bus"])
+    buses = table.sort_values("bus_no")
+    return Feeder(
+        from_bus=branches["from_bus"].to_numpy(dtype=int) - 1,
+        to_bus=branches["to_bus"].to_numpy(dtype=int) - 1,
+        r=branches["r_ij_pu"].to_numpy(dtype=float),
+        x=branches["x_ij_pu"].to_numpy(dtype=float),
+        PL=buses["PL_pu"].to_numpy(dtype=float),
+        QL=buses["QL_pu"].to_numpy(dtype=float),
+    )
+
+def synthetic_feeder(n_buses: int, seed: int = 0) -> Feeder:
+    """Random radial feeder with table_A1-like impedances and loads, for scaling tests."""
+    rng = np.random.default_rng(seed)
+    # Random recursive tree: each new bus hangs off a uniformly chosen earlier bus
+    parents = np.array([rng.integers(0, j) for j in range(1, n_buses)])
+    loads = rng.uniform(0.0, 0.15, n_buses) * (rng.random(n_buses) < 0.8)
+    loads[0] = 0.0
+    # Keep total load and path impedance comparable to the 16-bus feeder so
+    # voltages stay regulable as the feeder grows
+    loads *= 0.6 / max(loads.sum(), 1e-9)
+    scale = 0.5 * min(1.0, 16.0 / n_buses) ** 0.5
+    return Feeder(
+        from_bus=parents,
+        to_bus=np.arange(1, n_buses),
+        r=scale * rng.uniform(0.02, 0.12, n_buses - 1),
+        x=scale * rng.uniform(0.005, 0.05, n_buses - 1),
+        PL=loads,
+        QL=loads * 0.49,
+    )
+
+@dataclass
+class LinDistFlow:
+    """LinDistFlow voltage model with OLTC at the root and controllable PV reactive power
+
+    Following the paper (eqs. 12-16): V_i - V_j = (r_ij P_ij + x_ij Q_ij) / V_s,
+    V_root = V_s + tap * dV_T, V_min <= V <= V_max, |Q_PV| <= sqrt(S_PV^2 - P_PV^2).
+    Defaults are the modified EU 16-bus microgrid: PVs (100 kW) at buses 4, 7, 14
+    and 16, the seaport at bus 15 (1-based) and a 1 MVA power base.
+    """
+    feeder: Feeder
+    V_min: float = 0.95
+    V_max: float = 1.05
+    V_s: float = 1.0
+    dV_T: float = 0.005
+    pv_buses: Sequence[int] = (4, 7, 14, 16)   # 1-based
+    port_bus: int = 15                          # 1-based
+    pv_capacity_kw: float = 100.0
+    base_kva: float = 1000.0
+    _A: sp.csr_matrix = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._A = self.feeder.incidence()
+
+    @property
+    def n_pv(self) -> int:
+        return len(self.pv_buses)
+
+    def injection_matrix(self, buses: Sequence[int]) -> sp.csr_matrix:
+        """(n_buses, len(buses)) 0/1 map from devices to their (1-based) buses"""
+        buses = np.asarray(buses, dtype=int) - 1
+        return sp.csr_matrix((np.ones(len(buses)), (buses, np.arange(len(buses)))),
+                             shape=(self.feeder.n_buses, len(buses)))
+
+    def q_pv_limit(self, pv_forecast: np.ndarray) -> np.ndarray:
+        """Inverter reactive capability (kVar) per step, eq. (16) with S_PV = rated PV power"""
+        P_pv = self.pv_capacity_kw * np.asarray(pv_forecast, dtype=float)
+        return np.sqrt(np.maximum(self.pv_capacity_kw ** 2 - P_pv ** 2, 0.0))
+
+    def withdrawals(self, pv_forecast: np.ndarray, load_forecast: np.ndarray
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Fixed bus withdrawals (p.u.) from load and PV active power, before charging/Q_PV"""
+        pv = np.asarray(pv_forecast, dtype=float)
+        load = np.asarray(load_forecast, dtype=float)
+        C_pv = self.injection_matrix(self.pv_buses)
+        p = (np.outer(self.feeder.PL, load) -
+             C_pv @ np.tile(self.pv_capacity_kw * pv / self.base_kva, (self.n_pv, 1)))
+        q = np.outer(self.feeder.QL, load)
+        return p, q
+
+    def forecast_terms(self, pv_forecast: np.ndarray, load_forecast: np.ndarray
+                       ) -> Dict[str, np.ndarray]:
+        """Forecast-dependent data of constraints(), each (rows, n_steps)
+
+        p_fixed / q_fixed: fixed withdrawals (see withdrawals); q_limit: PV
+        inverter capability per PV unit; loss_P / loss_Q: coefficients of the
+        loss term linearized at the charging-free flows. A parametrized model
+        holds these as cp.Parameters and refreshes them from new forecasts.
+        """
+        feeder = self.feeder
+        n_steps = len(pv_forecast)
+        p_fixed, q_fixed = self.withdrawals(pv_forecast, load_forecast)
+        P0, Q0 = feeder.base_flows(p_fixed, q_fixed)
+        P0, Q0 = P0.reshape(feeder.n_branches, n_steps), Q0.reshape(feeder.n_branches, n_steps)
+        weight = 2 * feeder.r[:, None] / self.V_s ** 2
+        return {'p_fixed': p_fixed, 'q_fixed': q_fixed,
+                'q_limit': np.tile(self.q_pv_limit(pv_forecast), (self.n_pv, 1)),
+                'loss_P': weight * P0, 'loss_Q': weight * Q0}
+
+    def constraints(self, tap: cp.Variable, Q_PV: cp.Variable, port_power: cp.Expression,
+                    pv_forecast: np.ndarray, load_forecast: np.ndarray, terms: Dict = None
+                    ) -> Tuple[List[cp.Constraint], cp.Expression, Dict[str, cp.Variable]]:
+        """Vectorized LinDistFlow constraints for all steps
+
+        tap: (n_steps,) OLTC position; Q_PV: (n_pv, n_steps) in kVar; port_power:
+        (n_steps,) total charging power at the port bus in kW.
+        Returns (constraints, linearized loss expression, variables), where the
+        loss term is eq. (11) linearized around the charging-free flows.
+        ``terms`` replaces forecast_terms(pv_forecast, load_forecast), e.g. by
+        cp.Parameters of the same shapes.
+        """
+        feeder = self.feeder
+        n_steps = len(pv_forecast)
+        terms = terms or self.forecast_terms(pv_forecast, load_forecast)
+        C_pv = self.injection_matrix(self.pv_buses)
+        port = np.zeros((feeder.n_buses, 1))
+        port[self.port_bus - 1, 0] = 1.0
+
+        P = cp.Variable((feeder.n_branches, n_steps))  # branch active flow (p.u.)
+        Q = cp.Variable((feeder.n_branches, n_steps))  # branch reactive flow (p.u.)
+        V = cp.Variable((feeder.n_buses, n_steps))     # bus voltage magnitude (p.u.)
+
+        p = terms['p_fixed'] + port @ cp.reshape(port_power / self.base_kva, (1, n_steps),
+                                                 order='C')
+        q = terms['q_fixed'] - C_pv @ (Q_PV / self.base_kva)
+
+        non_root = feeder.non_root
+        A_T = self._A.T.tocsr()
+        constraints = [
+            # (12) KCL at every non-root bus: inflow - outflow = withdrawal
+            -A_T[non_root] @ P == p[non_root],
+            -A_T[non_root] @ Q == q[non_root],
+            # (13) voltage drop along each branch
+            self._A @ V == (sp.diags(feeder.r) @ P + sp.diags(feeder.x) @ Q) / self.V_s,
+            # (14) voltage limits and OLTC at the root
+            V >= self.V_min, V <= self.V_max,
+            V[feeder.root] == self.V_s + self.dV_T * tap,
+            # (16) PV inverter capability
+            Q_PV <= terms['q_limit'],
+            Q_PV >= -terms['q_limit'],
+        ]
+
+        # (11) sum r (P^2 + Q^2) / V_s^2 linearized at the charging-free operating point
+        losses = cp.sum(cp.multiply(terms['loss_P'], P) + cp.multiply(terms['loss_Q'], Q))
+
+        return constraints, losses, {'P_branch': P, 'Q_branch': Q, 'V': V}
+
+    def losses_kw(self, P: np.ndarray, Q: np.ndarray) -> np.ndarray:
+        """Branch losses sum r (P^2 + Q^2) / V_s^2 per step, in kW, from solved flows"""
+        r = self.feeder.r[:, None]
+        return self.base_kva * np.sum(r * (P ** 2 + Q ** 2), axis=0) / self.V_s ** 2
@@ -0,0 +1,214 @@
+"""
+Packed voyage results: every (vessel, T_a) voyage profile in one contiguous
+buffer, optionally placed in shared memory so worker processes write their
+results in place instead of pickling them back
+"""
+
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Profile channels of the (rows, 3, hours) buffer, in order
+CHANNELS = ('velocity_profile', 'P_DSG_profile', 'P_dis_profile')
+
+# Per-row scalars; counters are -1 when the backend does not report them
+SCALARS = {'vessel_id': np.int64, 'T_a': np.int64, 'hours': np.int32, 'valid': np.bool_,
+           'SOC_a': np.float64, 'cost': np.float64,
+           'nit': np.int32, 'nfev': np.int32, 'num_iters': np.int32}
+
+_ALIGN = 64
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """Map an existing segment; only the creating process unlinks it
+
+    Before Python 3.13 attaching registers the name with the resource tracker
+    again. Pool workers share their parent's tracker, where that is a no-op;
+    unregistering here would drop the creator's registration instead.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+class SharedArrays:
+    """Named NumPy arrays laid out in one shared-memory segment
+
+    Pickling sends only the segment name and layout; the receiving process
+    maps the same memory (see __reduce__). The creator calls unlink() once
+    every process is done; every process calls close() on its mapping.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory, layout: Dict, owner: bool):
+        self.segment = segment
+        self.layout = layout          # name -> (offset, shape, dtype str)
+        self.owner = owner
+        self.arrays = {name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf,
+                                        offset=offset)
+                       for name, (offset, shape, dtype) in layout.items()}
+
+    @classmethod
+    def create(cls, specs: Dict[str, Tuple[Tuple[int, ...], object]]) -> 'SharedArrays':
+        """Zero-initialized arrays of the given (shape, dtype), 64-byte aligned"""
+        layout, size = {}, 0
+        for name, (shape, dtype) in specs.items():
+            dtype = np.dtype(dtype)
+            layout[name] = (size, tuple(shape), dtype.str)
+            nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+            size += -(-nbytes // _ALIGN) * _ALIGN
+        segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        return cls(segment, layout, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, layout: Dict) -> 'SharedArrays':
+        return cls(_attach_segment(name), layout, owner=False)
+
+    def __reduce__(self):
+        return SharedArrays.attach, (self.segment.name, self.layout)
+
+    def close(self):
+        """Drop this process's mapping (views into it become invalid)"""
+        self.arrays = {}
+        self.segment.close()
+
+    def unlink(self):
+        if self.owner:
+            self.segment.unlink()
+
+class PackedVoyages:
+    """Voyage results of a fleet in one (rows, 3, max_hours) profile buffer
+
+    Rows are grouped by vessel: vessel k owns rows offsets[k]:offsets[k + 1]
+    (one per arrival time it may be solved for). Row r holds the velocity,
+    P_DSG and P_dis profiles in profiles[r, :, :hours[r]] and its scalars in
+    the SCALARS columns; rows whose solve failed or was skipped have
+    valid[r] = False. result(r) returns the usual result dict whose profiles
+    are views into the buffer.
+
+    With ``shared=True`` the arrays live in a SharedArrays segment, so a
+    PackedVoyages pickled to a worker maps the same memory and write() there
+    is visible to the parent without copying.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], shared: SharedArrays = None):
+        self.arrays = arrays
+        self.shared = shared
+
+    @classmethod
+    def allocate(cls, rows_per_vessel: Sequence[Tuple[int, int]], max_hours: int,
+                 shared: bool = False) -> 'PackedVoyages':
+        """Empty buffer for [(vessel_id, n_rows), ...] and voyages up to ``max_hours``"""
+        counts = np.array([n for _, n in rows_per_vessel], dtype=np.int64)
+        n_rows = int(counts.sum())
+        specs = {'profiles': ((n_rows, len(CHANNELS), max(max_hours, 0)), np.float64),
+                 'offsets': ((len(counts) + 1,), np.int64),
+                 'vessel_ids': ((len(counts),), np.int64),
+                 **{name: ((n_rows,), dtype) for name, dtype in SCALARS.items()}}
+        if shared:
+            block = SharedArrays.create(specs)
+            arrays = block.arrays
+        else:
+            block = None
+            arrays = {name: np.zeros(shape, dtype=dtype) for name, (shape, dtype) in specs.items()}
+        arrays['offsets'][1:] = np.cumsum(counts)
+        arrays['vessel_ids'][:] = [v for v, _ in rows_per_vessel]
+        arrays['vessel_id'][:] = np.repeat([v for v, _ in rows_per_vessel], counts)
+        for name in ('nit', 'nfev', 'num_iters'):
+            arrays[name][:] = -1
+        return cls(arrays, block)
+
+    @classmethod
+    def from_results(cls, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                     shared: bool = False) -> 'PackedVoyages':
+        """Pack {vessel_id: [result, ...]} as returned by schedule_voyages"""
+        max_hours = max((len(pair['velocity_profile'])
+                         for pairs in Ta_SOCa_pairs_all.values() for pair in pairs), default=0)
+        packed = cls.allocate([(v, len(pairs)) for v, pairs in Ta_SOCa_pairs_all.items()],
+                              max_hours, shared)
+        row = 0
+        for pairs in Ta_SOCa_pairs_all.values():
+            for pair in pairs:
+                packed.write(row, pair)
+                row += 1
+        return packed
+
+    def __getstate__(self):
+        # A shared buffer travels as its segment handle, a private one as its arrays
+        return {'shared': self.shared} if self.shared else {'arrays': self.arrays}
+
+    def __setstate__(self, state):
+        self.shared = state.get('shared')
+        self.arrays = self.shared.arrays if self.shared else state['arrays']
+
+    def __len__(self) -> int:
+        return len(self.arrays['T_a'])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def vessel_rows(self, index: int) -> range:
+        """Rows of the ``index``-th vessel"""
+        offsets = self.arrays['offsets']
+        return range(int(offsets[index]), int(offsets[index + 1]))
+
+    def write(self, row: int, result: Dict):
+        """Store a voyage result dict (None marks the row invalid)"""
+        arrays = self.arrays
+        if result is None:
+            arrays['valid'][row] = False
+            return
+        hours = len(result['velocity_profile'])
+        for channel, name in enumerate(CHANNELS):
+            arrays['profiles'][row, channel, :hours] = result[name]
+        arrays['hours'][row] = hours
+        arrays['T_a'][row] = result['T_a']
+        arrays['SOC_a'][row] = result['SOC_a']
+        arrays['cost'][row] = result['cost']
+        for name in ('nit', 'nfev', 'num_iters'):
+            if result.get(name) is not None:
+                arrays[name][row] = result[name]
+        arrays['valid'][row] = True
+
+    def result(self, row: int) -> Dict:
+        """Result dict of a row; profiles are views into the buffer"""
+        arrays = self.arrays
+        hours = int(arrays['hours'][row])
+        result = {'success': True, 'T_a': int(arrays['T_a'][row]),
+                  'SOC_a': float(arrays['SOC_a'][row]), 'cost': float(arrays['cost'][row])}
+        for channel, name in enumerate(CHANNELS):
+            result[name] = arrays['profiles'][row, channel, :hours]
+        for name in ('nit', 'nfev', 'num_iters'):
+            if arrays[name][row] >= 0:
+                result[name] = int(arrays[name][row])
+        return result
+
+    def to_results(self) -> Dict[int, List[Dict]]:
+        """{vessel_id: [result, ...]} of the valid rows in T_a order, like schedule_voyages"""
+        arrays = self.arrays
+        results = {}
+        for index, vessel_id in enumerate(arrays['vessel_ids'].tolist()):
+            rows = [row for row in self.vessel_rows(index) if arrays['valid'][row]]
+            rows.sort(key=lambda row: arrays['T_a'][row])
+            results.setdefault(vessel_id, []).extend(self.result(row) for row in rows)
+        return results
+
+    def copy(self) -> 'PackedVoyages':
+        """Private (non-shared) copy, e.g. to keep results after releasing the segment"""
+        return PackedVoyages({name: array.copy() for name, array in self.arrays.items()})
+
+    def detach(self):
+        """Unmap a shared buffer received by a worker (no-op in the creating process)"""
+        if self.shared is not None and not self.shared.owner:
+            self.close()
+
+    def close(self):
+        """Release a shared buffer: unmap it, and unlink it in the creating process
+
+        Result dicts from result() must not outlive this (their profiles are
+        views); take a copy() first to keep them.
+        """
+        if self.shared is not None:
+            shared, self.shared, self.arrays = self.shared, None, {}
+            shared.close()
+            shared.unlink()
@@ -0,0 +1,83 @@
+"""
+Berth/charging MILP compiled once and re-solved through parameter updates
+"""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from logic import AESParameters, VoltageRegulator
+
+class PersistentRegulator:
+    """Berth/charging MILP compiled once and re-solved as its inputs change
+
+    The model is built with build_model(parametric=True): the forecasts and
+    the pairs' arrival times (the vessel windows), SOC_a and cost are
+    cp.Parameters, so CVXPY canonicalizes the problem on the first solve and
+    later solves only refresh parameter values. Every re-solve is warm-started:
+    the solver gets the previous solution (berth allocation omega, taps, pair
+    selection) as its starting incumbent.
+
+    Each vessel gets at least ``slots`` pair slots; unused slots are disabled.
+    The model is rebuilt when the vessels, their types, the horizon length or
+    a vessel's pair count no longer fit it. Regulator settings (P_ch_max,
+    weights, network) are read at build time.
+    """
+
+    def __init__(self, regulator: VoltageRegulator, slots: int = 0):
+        self.regulator = regulator
+        self.slots = slots
+        self.model = None
+        self.layout = None      # (n_hours, ((vessel_id, n_slots, vessel_type), ...))
+        self.history = []       # timing of every solve, with 'rebuilt'
+
+    def optimize(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                 pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                 aes_fleet: List[AESParameters] = None) -> Dict:
+        """Persistent counterpart of VoltageRegulator.optimize_voltage_regulation
+
+        Returns the same result layout; 'timing' also holds 'rebuilt' (whether
+        this solve built and compiled the model).
+        """
+        start_time = time.perf_counter()
+        regulator = self.regulator
+        pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        n_hours = len(pv_forecast)
+        types = {aes.vessel_id: aes.vessel_type for aes in aes_fleet or []}
+
+        rebuilt = not self._fits(pairs_all, n_hours, types)
+        if rebuilt:
+            self.layout = (n_hours, tuple((k, max(len(pairs), self.slots), types.get(k))
+                                          for k, pairs in pairs_all.items()))
+        padded = self._pad(pairs_all, n_hours)
+        if rebuilt:
+            self.model = regulator.build_model(padded, pv_forecast, load_forecast, aes_fleet,
+                                               parametric=True)
+        else:
+            values = regulator.model_parameters(padded, pv_forecast, load_forecast, aes_fleet)
+            for name, value in values.items():
+                self.model['parameters'][name].value = value
+        result = regulator.solve_model(self.model, build_time=time.perf_counter() - start_time,
+                                       warm_start=not rebuilt)
+        result['timing']['rebuilt'] = rebuilt
+        self.history.append(result['timing'])
+        if result['success']:
+            result['vessel_selection'] = {k: selection[:len(pairs_all[k])]
+                                          for k, selection in result['vessel_selection'].items()}
+        return result
+
+    def _fits(self, pairs_all: Dict[int, List[Dict]], n_hours: int, types: Dict) -> bool:
+        """Whether the compiled model can take these inputs by a parameter update"""
+        if self.model is None:
+            return False
+        horizon, layout = self.layout
+        return (horizon == n_hours and [k for k, _, _ in layout] == list(pairs_all)
+                and all(len(pairs_all[k]) <= slots and types.get(k) == vessel_type
+                        for k, slots, vessel_type in layout))
+
+    def _pad(self, pairs_all: Dict[int, List[Dict]], n_hours: int) -> Dict[int, List[Dict]]:
+        """Pairs filled up to the layout's slots with disabled (never arriving) pairs"""
+        idle = {'T_a': n_hours, 'SOC_a': self.regulator.SOC_target, 'cost': 0.0}
+        return {k: pairs_all[k] + [idle] * (slots - len(pairs_all[k]))
+                for k, slots, _ in self.layout[1]}
@@ -0,0 +1,208 @@
+"""
+Step-level instrumentation for the coordinated optimization (Algorithm 1)
+
+A Tracer times named spans (wall and CPU), tracks the peak Python heap of each
+span with tracemalloc, collects solver counters reported by the code inside the
+span and writes one JSON object per span to a JSON-lines file, plus optionally
+a Chrome trace (chrome://tracing, Perfetto). One span can be run under cProfile.
+"""
+
+import cProfile
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Solver counters summed over a step's results (see solver_counts)
+COUNTERS = ('nit', 'nfev', 'njev', 'num_iters', 'simplex_iters', 'mip_nodes', 'cached',
+            'solves')
+
+def solver_counts(results: Iterable[Dict]) -> Dict[str, int]:
+    """Sum of the iteration / function-evaluation counters found in solve results
+
+    Voyage results carry SLSQP's nit / nfev (CVXPY's num_iters with the convex
+    backend), MILP results the simplex iterations and branch-and-bound nodes;
+    every result counts as one solve. Cache hits only count as 'cached', as
+    their counters belong to the run that solved them.
+    """
+    totals = {}
+    for result in results:
+        if not result:
+            continue
+        if result.get('cached'):
+            totals['cached'] = totals.get('cached', 0) + 1
+            continue
+        totals['solves'] = totals.get('solves', 0) + 1
+        for name in COUNTERS[:-2]:
+            value = result.get(name)
+            if value is not None:
+                totals[name] = totals.get(name, 0) + int(value)
+    return totals
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+class Tracer:
+    """Record timed spans as JSON lines and, optionally, a Chrome trace
+
+    ``path``: JSON-lines file, one object per finished span (appended and
+    flushed as spans end, so a crashed run keeps its completed steps).
+    ``chrome_path``: Chrome trace-event file written by close().
+    ``profile_step``: name of the span to run under cProfile; its stats are
+    dumped next to ``path`` (or to ``profile_path``) and the top functions by
+    cumulative time are added to the span's record.
+    ``memory``: track each span's peak heap with tracemalloc (off by default:
+    tracing every allocation made the two-vessel example run ~2.8x slower, and
+    SLSQP-heavy Step 3 is hit hardest; NumPy buffers are included).
+    Every span gets an ``id`` unique within the tracer; ``parent`` is the
+    enclosing span's id (None at the top level).
+
+    CPU time and memory are those of this process: work done in a process pool
+    shows up in wall time and in the solver counters the results carry.
+    """
+
+    def __init__(self, path: str = None, chrome_path: str = None, profile_step: str = None,
+                 profile_path: str = None, memory: bool = False, run_id: str = None):
+        self.path = Path(path) if path else None
+        self.chrome_path = Path(chrome_path) if chrome_path else None
+        self.profile_step = profile_step
+        self.profile_path = profile_path
+        self.memory = memory
+        self.run_id = run_id or f"{os.getpid()}-{int(time.time())}"
+        self.events: List[Dict] = []
+        self._stack: List[list] = []  # [span id, peak seen in nested spans]
+        self._next_id = 0
+        self._origin = time.perf_counter()
+        self._file = open(self.path, 'a') if self.path else None
+        self._started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @contextlib.contextmanager
+    def step(self, name: str, **attrs):
+        """Time the body as span ``name``; yields a dict for counters/attributes
+
+        Nested spans record their parent's id; the parent's peak memory covers
+        its children. Exceptions are recorded (``error``) and re-raised.
+        """
+        counters = dict(attrs)
+        parent = self._stack[-1][0] if self._stack else None
+        span_id = self._next_id
+        self._next_id += 1
+        if self.memory:
+            # tracemalloc keeps a single peak: fold it into the enclosing span
+            # before resetting it for this one
+            base, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        self._stack.append([span_id, 0])
+        profiler = cProfile.Profile() if name == self.profile_step else None
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        error = None
+        if profiler:
+            profiler.enable()
+        try:
+            yield counters
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            _, own_peak = self._stack.pop()
+            event = {'run': self.run_id, 'id': span_id, 'step': name, 'parent': parent,
+                     'start': start_wall - self._origin, 'wall': wall, 'cpu': cpu}
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, own_peak)
+                event['peak_mb'] = (peak - base) / 2**20
+                event['delta_mb'] = (current - base) / 2**20
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+            if profiler:
+                event['profile'] = self._dump_profile(profiler, name)
+            if error:
+                event['error'] = error
+            event.update(counters)
+            self._record(event)
+
+    def _dump_profile(self, profiler: cProfile.Profile, name: str) -> Dict:
+        import pstats
+        target = self.profile_path
+        if target is None:
+            stem = self.path.with_suffix('') if self.path else Path('trace')
+            target = f"{stem}.{name.replace(' ', '_')}.prof"
+        profiler.dump_stats(target)
+        stats = pstats.Stats(profiler)
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:10]
+        return {'path': str(target),
+                'top': [{'function': f"{file}:{line}({func})", 'calls': calls,
+                         'cumtime': cumtime}
+                        for (file, line, func), (_, calls, _, cumtime, _) in top]}
+
+    def _record(self, event: Dict):
+        self.events.append(event)
+        if self._file:
+            self._file.write(json.dumps(event, default=_jsonable) + '\n')
+            self._file.flush()
+
+    def chrome_trace(self) -> Dict:
+        """Events in Chrome trace-event format (complete 'X' events, microseconds)"""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = []
+        for event in self.events:
+            args = {k: v for k, v in event.items()
+                    if k not in ('run', 'id', 'step', 'parent', 'start', 'wall')}
+            events.append({'name': event['step'], 'cat': 'algorithm1', 'ph': 'X',
+                           'ts': event['start'] * 1e6, 'dur': event['wall'] * 1e6,
+                           'pid': pid, 'tid': tid, 'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'run': self.run_id}}
+
+    def summary(self) -> str:
+        """Table of the recorded spans"""
+        lines = [f"{'Step':<28} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak MB':>8}  Counters"]
+        parents = {event['id']: event['parent'] for event in self.events}
+        for event in sorted(self.events, key=lambda e: e['start']):
+            depth = 0
+            parent = event['parent']
+            while parent is not None:
+                depth += 1
+                parent = parents.get(parent)
+            counts = ' '.join(f"{name}={event[name]}" for name in COUNTERS if name in event)
+            peak = f"{event['peak_mb']:>8.1f}" if 'peak_mb' in event else f"{'-':>8}"
+            lines.append(f"{'  ' * depth + event['step']:<28} {event['wall']:>9.3f} "
+                         f"{event['cpu']:>9.3f} {peak}  {counts}")
+        return '\n'.join(lines)
+
+    def close(self):
+        """Write the Chrome trace (if requested) and release the JSON-lines file"""
+        if self.chrome_path:
+            with open(self.chrome_path, 'w') as f:
+                json.dump(self.chrome_trace(), f, default=_jsonable)
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,189 @@
+"""
+Columnar on-disk store of coordinated-optimization results for the figure scripts
+
+Layout: one directory per written version of a method with one ``.npy`` file
+per column and an ``index.json`` naming each method's current directory.
+Ragged per-vessel data (voyage profiles, T_a-SOC_a pairs) are stored flat with
+an offsets column, so readers can memory-map every column and slice a vessel
+out without copying.
+"""
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: index updates are not serialized across processes
+    fcntl = None
+
+STORE_VERSION = 1
+INDEX = "index.json"
+LOCK = ".index.lock"
+
+# Per-vessel voyage profiles of the selected T_a-SOC_a pair
+PROFILE_COLUMNS = ['velocity_profile', 'P_DSG_profile', 'P_dis_profile']
+# Port-side schedules from VoltageRegulator (V only with a network model)
+PORT_COLUMNS = ['omega', 'P_ch', 'tap', 'Q_PV', 'V']
+
+def _ragged(arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """(flat values, offsets) of a list of 1-D arrays"""
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(a) for a in arrays])
+    flat = np.concatenate(arrays).astype(float) if arrays else np.zeros(0)
+    return flat, offsets
+
+class MethodResults:
+    """Read-only view of one method's columns, memory-mapped on first access"""
+
+    def __init__(self, directory: Path, meta: Dict):
+        self.directory = directory
+        self.meta = meta
+        self._columns = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.meta['columns']
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            if name not in self:
+                raise KeyError(f"No column {name!r} for method {self.meta['method']!r}")
+            self._columns[name] = np.load(self.directory / f"{name}.npy", mmap_mode='r')
+        return self._columns[name]
+
+    @property
+    def vessel_ids(self) -> List[int]:
+        return [int(v) for v in self['vessel_id']]
+
+    def _row(self, vessel_id: int) -> int:
+        matches = np.flatnonzero(self['vessel_id'] == vessel_id)
+        if not len(matches):
+            raise KeyError(f"AES {vessel_id} not in method {self.meta['method']!r}")
+        return int(matches[0])
+
+    @property
+    def steps_per_hour(self) -> int:
+        """Model resolution of the run; T_a columns and profiles are in its steps"""
+        return self.meta.get('steps_per_hour', 1)
+
+    def profile(self, name: str, vessel_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(hours, values) of a voyage profile; values is a view into the memmap
+
+        hours are the start times of the profile's steps, in hours.
+        """
+        row = self._row(vessel_id)
+        offsets = self['voyage_offsets']
+        values = self[name][offsets[row]:offsets[row + 1]]
+        T_a = int(self['T_a'][row])
+        return np.arange(T_a - len(values), T_a) / self.steps_per_hour, values
+
+    def pairs(self, vessel_id: int) -> Dict[str, np.ndarray]:
+        """All T_a-SOC_a pairs of a vessel (T_a, SOC_a, SI, cost) as memmap views"""
+        row = self._row(vessel_id)
+        offsets = self['pair_offsets']
+        window = slice(offsets[row], offsets[row + 1])
+        return {name: self[f'pair_{name}'][window] for name in ('T_a', 'SOC_a', 'SI', 'cost')}
+
+class ResultsStore:
+    """Directory of per-method columnar results written by CoordinatedOptimizer"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _index(self) -> Dict:
+        index_path = self.path / INDEX
+        if not index_path.exists():
+            return {'version': STORE_VERSION, 'methods': {}}
+        return json.loads(index_path.read_text())
+
+    def methods(self) -> List[str]:
+        return list(self._index()['methods'])
+
+    def __contains__(self, method: str) -> bool:
+        return method in self._index()['methods']
+
+    def load(self, method: str) -> MethodResults:
+        meta = self._index()['methods'].get(method)
+        if meta is None:
+            raise KeyError(f"No results for method {method!r} in {self.path}")
+        return MethodResults(self.path / meta['directory'], meta)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Exclusive lock on the index for a read-modify-write"""
+        with open(self.path / LOCK, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def write(self, method: str, result: Dict, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+              steps_per_hour: int = 1):
+        """Store a successful run_coordinated_optimization result under ``method``
+
+        ``Ta_SOCa_pairs_all`` are the Step 3 pairs (with SI from Step 4), in
+        fleet order; ``steps_per_hour`` is the run's model resolution. The
+        columns go to a new directory and a single index replace publishes
+        them, so readers see either the old or the new entry. Index updates
+        hold a file lock; the replaced directory is removed afterwards.
+        """
+        strategies = result['vessel_strategies']
+        vessel_ids = [v for v in Ta_SOCa_pairs_all if v in strategies]
+        columns = {
+            'vessel_id': np.array(vessel_ids, dtype=np.int64),
+            'T_a': np.array([strategies[v]['T_a'] for v in vessel_ids], dtype=np.int64),
+            'SOC_a': np.array([strategies[v]['SOC_a'] for v in vessel_ids], dtype=float),
+            'SI': np.array([strategies[v]['SI'] for v in vessel_ids], dtype=float),
+            'cost': np.array([strategies[v]['cost'] for v in vessel_ids], dtype=float),
+        }
+        for name in PROFILE_COLUMNS:
+            columns[name], columns['voyage_offsets'] = _ragged(
+                [np.asarray(strategies[v][name], dtype=float) for v in vessel_ids])
+
+        pairs = [Ta_SOCa_pairs_all[v] for v in vessel_ids]
+        columns['pair_offsets'] = _ragged([np.zeros(len(p)) for p in pairs])[1]
+        for name in ('T_a', 'SOC_a', 'SI', 'cost'):
+            columns[f'pair_{name}'] = np.array(
+                [pair.get(name, np.nan) for vessel_pairs in pairs for pair in vessel_pairs],
+                dtype=float)
+
+        voltage = result['voltage_control']
+        columns['port_vessel_id'] = np.array(list(voltage.get('vessel_selection', {})),
+                                             dtype=np.int64)
+        for name in PORT_COLUMNS:
+            if voltage.get(name) is not None:
+                columns[name] = np.asarray(voltage[name], dtype=float)
+
+        name = re.sub(r'[^\w.-]+', '_', method).strip('_') or 'method'
+        directory = f"{name}.{time.time_ns()}.{os.getpid()}"
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / directory).mkdir()
+        for column, values in columns.items():
+            np.save(self.path / directory / f"{column}.npy", np.ascontiguousarray(values))
+
+        with self._locked():
+            index = self._index()
+            previous = index['methods'].get(method, {}).get('directory')
+            index['methods'][method] = {
+                'method': method, 'directory': directory, 'written': time.time(),
+                'steps_per_hour': steps_per_hour,
+                'columns': {column: {'shape': list(values.shape), 'dtype': values.dtype.str}
+                            for column, values in columns.items()},
+                'summary': {key: float(value) for key, value in result['summary'].items()},
+            }
+            staging_index = self.path / f".{INDEX}.tmp{os.getpid()}"
+            staging_index.write_text(json.dumps(index, indent=2))
+            os.replace(staging_index, self.path / INDEX)
+        # Open memory maps of the old version stay valid after the unlink
+        if previous and previous != directory:
+            shutil.rmtree(self.path / previous, ignore_errors=True)
@@ -0,0 +1,275 @@
+"""
+Receding-horizon solve of the seaport berth/charging MILP over committed windows
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from logic import AESParameters, HorizonState, VoltageRegulator, solver_iterations
+
+class RollingHorizonRegulator:
+    """Receding-horizon driver around VoltageRegulator
+
+    Solves ``window`` steps, commits the first ``stride`` of them and re-solves
+    from the committed state until the horizon is covered. The tap position and
+    the remaining daily tap_max budget, berth occupancy, and the service hours
+    and energy already delivered carry across windows (see HorizonState); each
+    window is offered the previous plan, shifted by ``stride``, as a warm start.
+
+    Fleets with fewer than ``min_vessels`` vessels with pairs are solved
+    monolithically: on 24-96 h horizons (window 12, stride 6) rolling windows
+    ran 0.4-0.6x the monolithic speed at 4 vessels on 24-48 h and 1.8-20x
+    faster from 8 vessels on.
+    """
+
+    def __init__(self, regulator: VoltageRegulator, window: int = 8, stride: int = 4,
+                 min_vessels: int = 8):
+        if not 0 < stride <= window:
+            raise ValueError(f"Need 0 < stride <= window, got stride={stride}, window={window}")
+        self.regulator = regulator
+        self.window = window
+        self.stride = stride
+        self.min_vessels = min_vessels
+
+    def optimize(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                 pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                 aes_fleet: List[AESParameters] = None) -> Dict:
+        """Rolling-horizon counterpart of VoltageRegulator.optimize_voltage_regulation
+
+        Returns the same result layout over the full horizon. 'objective_value'
+        is re-evaluated on the committed plan (selected voyage cost, energy cost
+        and loss_weight times losses); 'timing' holds the end-to-end time and
+        one entry per window. An infeasible window is first extended to the end
+        of the horizon; if that fails too, the whole horizon is solved
+        monolithically and 'fallback' names the failed window. Every failed
+        window is printed and listed in 'window_failures' with its solver
+        status or error. With the regulator's ``presolve`` each window's report
+        is listed under 'presolve'. Below ``min_vessels`` the result is the
+        monolithic one with 'rolling' False.
+        """
+        start_time = time.perf_counter()
+        regulator = self.regulator
+        pairs_all = {k: pairs for k, pairs in Ta_SOCa_pairs_all.items() if pairs}
+        if len(pairs_all) < self.min_vessels:
+            result = regulator.optimize_voltage_regulation(
+                Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet)
+            result['rolling'] = False
+            return result
+        vessel_ids = list(pairs_all)
+        column = {vessel_id: k for k, vessel_id in enumerate(vessel_ids)}
+        pv = np.asarray(pv_forecast, dtype=float)
+        load = np.asarray(load_forecast, dtype=float)
+        n_hours, n_berths = len(pv), regulator.params.n_berths
+        n_pv = regulator.network.n_pv if regulator.network else 4
+
+        plan = {
+            'omega': np.zeros((n_berths, len(vessel_ids), n_hours)),
+            'P_ch': np.zeros((n_berths, len(vessel_ids), n_hours)),
+            'tap': np.zeros(n_hours),
+            'Q_PV': np.zeros((n_pv, n_hours)),
+        }
+        if regulator.network:
+            plan['V'] = np.zeros((regulator.network.feeder.n_buses, n_hours))
+            plan['losses_kw'] = np.zeros(n_hours)
+        selected = {}  # vessel -> index of its committed pair
+        state = HorizonState(taps_left=regulator.params.tap_max)
+        windows, failures, presolved, previous = [], [], [], None
+
+        def solve_window(start: int, end: int):
+            state.final = end == n_hours
+            window_pairs, candidates = self._window_pairs(pairs_all, selected, state, start, end)
+            build_start = time.perf_counter()
+            model = regulator.build_model(window_pairs, pv[start:end], load[start:end],
+                                          aes_fleet, state)
+            build_time = time.perf_counter() - build_start
+            warm = previous is not None and self._warm_start(model, previous)
+            result = regulator.solve_model(model, build_time=build_time, warm_start=warm)
+            windows.append({'start': start, 'end': end, 'n_vessels': len(window_pairs),
+                            **result['timing'], **solver_iterations(model['problem'])})
+            if 'presolve' in result:
+                presolved.append({'start': start, 'end': end, **result['presolve']})
+            if not result['success']:
+                cause = result.get('error') or result.get('status') or 'unknown'
+                failures.append({'start': start, 'end': end, 'cause': cause,
+                                 'n_vessels': len(window_pairs)})
+                print(f"Rolling horizon: window {start}-{end} ({len(window_pairs)} vessels) "
+                      f"failed: {cause}")
+            return model, result, candidates
+
+        start = 0
+        while start < n_hours:
+            end = min(start + self.window, n_hours)
+            model, result, candidates = solve_window(start, end)
+            if not result['success'] and end < n_hours:
+                # The commitments so far leave this window infeasible (e.g. every
+                # berth is needed later): close out the horizon in one solve
+                print(f"Rolling horizon: solving {start}-{n_hours} at once")
+                end = n_hours
+                model, result, candidates = solve_window(start, end)
+            if not result['success']:
+                # Earlier windows committed a schedule the rest of the horizon
+                # cannot complete (saturated berths): solve the whole horizon
+                print("Rolling horizon: falling back to a monolithic solve")
+                result = regulator.optimize_voltage_regulation(
+                    Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet)
+                result['fallback'] = (start, end)
+                result['window_failures'] = failures
+                result['timing'] = {'total': time.perf_counter() - start_time,
+                                    'windows': windows, 'monolithic': result['timing']}
+                return result
+            commit = end - start if state.final else self.stride
+
+            self._commit(plan, result, model['vessel_ids'], column, start, commit)
+            self._advance(state, plan, result, pairs_all, candidates, selected,
+                          column, start, commit)
+            previous = {'result': result, 'vessel_ids': model['vessel_ids'], 'shift': commit}
+            start += commit
+
+        voyage_cost = sum(pairs_all[k][j]['cost'] for k, j in selected.items())
+        if regulator.network:
+            loss_term = float(np.sum(plan['losses_kw']))
+        else:
+            loss_term = float(np.sum(plan['P_ch'], axis=(0, 1)) @ (load - pv))
+        energy = regulator.dt * float(np.sum(plan['P_ch']))
+        return {
+            'success': True,
+            **plan,
+            'objective_value': (voyage_cost + regulator.loss_weight * regulator.dt * loss_term
+                                + regulator.energy_price * energy),
+            'voyage_cost': voyage_cost,
+            'vessel_selection': {k: np.eye(len(pairs_all[k]))[j] for k, j in selected.items()},
+            'window_failures': failures,
+            **({'presolve': presolved} if presolved else {}),
+            'timing': {'total': time.perf_counter() - start_time, 'windows': windows},
+        }
+
+    def compare_monolithic(self, Ta_SOCa_pairs_all: Dict[int, List[Dict]],
+                           pv_forecast: np.ndarray, load_forecast: np.ndarray,
+                           aes_fleet: List[AESParameters] = None) -> Dict:
+        """End-to-end time and plan quality of the rolling-horizon vs. a monolithic solve"""
+        report = {}
+        for mode, solve in (('rolling', self.optimize),
+                            ('monolithic', self.regulator.optimize_voltage_regulation)):
+            start_time = time.perf_counter()
+            result = solve(Ta_SOCa_pairs_all, pv_forecast, load_forecast, aes_fleet)
+            elapsed = time.perf_counter() - start_time
+            entry = {'success': result['success'], 'time': elapsed}
+            if result['success']:
+                entry['voyage_cost'] = sum(
+                    Ta_SOCa_pairs_all[k][int(np.argmax(sel))]['cost']
+                    for k, sel in result['vessel_selection'].items())
+                entry['tap_switches'] = int(np.sum(np.abs(np.diff(np.round(result['tap'])))))
+                if 'losses_kw' in result:
+                    entry['losses_kwh'] = float(np.sum(result['losses_kw']))
+            report[mode] = entry
+        report['speedup'] = report['monolithic']['time'] / report['rolling']['time']
+        return report
+
+    @staticmethod
+    def _window_pairs(pairs_all: Dict[int, List[Dict]], selected: Dict[int, int],
+                      state: HorizonState, start: int, end: int
+                      ) -> Tuple[Dict[int, List[Dict]], Dict[int, List[int]]]:
+        """Candidate pairs per vessel in window-local time, and their original indices
+
+        Committed vessels keep their pair; others may only pick arrivals not yet
+        in the past. Vessels that finished service, or cannot arrive before a
+        non-final window ends, are left out.
+        """
+        window_pairs, candidates = {}, {}
+        for vessel_id, pairs in pairs_all.items():
+            if state.served.get(vessel_id, 0) > 0 and vessel_id not in state.berthed:
+                continue
+            if vessel_id in selected:
+                indices = [selected[vessel_id]]
+            else:
+                indices = [j for j, pair in enumerate(pairs) if pair['T_a'] >= start]
+                indices = indices or list(range(len(pairs)))
+            if not state.final and min(pairs[j]['T_a'] for j in indices) >= end:
+                continue
+            candidates[vessel_id] = indices
+            window_pairs[vessel_id] = [{**pairs[j], 'T_a': max(pairs[j]['T_a'] - start, 0)}
+                                       for j in indices]
+        return window_pairs, candidates
+
+    def _commit(self, plan: Dict, result: Dict, vessel_ids: List[int],
+                column: Dict[int, int], start: int, commit: int):
+        """Copy the first ``commit`` steps of a window solution into the full plan"""
+        steps = slice(start, start + commit)
+        columns = [column[k] for k in vessel_ids]
+        plan['omega'][:, columns, steps] = np.round(result['omega'][:, :, :commit])
+        plan['P_ch'][:, columns, steps] = result['P_ch'][:, :, :commit]
+        plan['tap'][steps] = np.round(result['tap'][:commit])
+        plan['Q_PV'][:, steps] = result['Q_PV'][:, :commit]
+        if 'V' in plan:
+            plan['V'][:, steps] = result['V'][:, :commit]
+            plan['losses_kw'][steps] = result['losses_kw'][:commit]
+
+    def _advance(self, state: HorizonState, plan: Dict, result: Dict,
+                 pairs_all: Dict[int, List[Dict]], candidates: Dict[int, List[int]],
+                 selected: Dict[int, int], column: Dict[int, int], start: int, commit: int):
+        """Update the boundary state after committing steps [start, start + commit)"""
+        end = start + commit
+        committed_taps = plan['tap'][start:end]
+        if state.tap is not None:
+            committed_taps = np.concatenate([[state.tap], committed_taps])
+        state.taps_left -= int(np.sum(np.abs(np.diff(committed_taps))))
+        state.tap = float(plan['tap'][end - 1])
+
+        berthed = []
+        for vessel_id, indices in candidates.items():
+            k = column[vessel_id]
+            occupancy = plan['omega'][:, k, :end].sum(axis=1)
+            state.served[vessel_id] = int(occupancy.sum())
+            state.charged[vessel_id] = float(plan['P_ch'][:, k, :end].sum())
+            if occupancy.any():
+                state.berth[vessel_id] = int(np.argmax(occupancy))
+            if plan['omega'][:, k, end - 1].any():
+                berthed.append(vessel_id)
+            # The pair is committed once its arrival falls in the committed steps
+            j = indices[int(np.argmax(result['vessel_selection'][vessel_id]))]
+            if pairs_all[vessel_id][j]['T_a'] < end or state.final:
+                selected[vessel_id] = j
+        state.berthed = tuple(berthed)
+
+    @staticmethod
+    def _warm_start(model: Dict, previous: Dict) -> bool:
+        """Seed the model's variables with the previous window's plan shifted in time"""
+        shift, result = previous['shift'], previous['result']
+        tap = model['tap']
+        n_steps = tap.shape[0]
+
+        def shifted(values: np.ndarray) -> np.ndarray:
+            """Drop the committed steps, hold the last value to fill the window"""
+            values = values[..., shift:]
+            if values.shape[-1] == 0:
+                return None
+            pad = n_steps - values.shape[-1]
+            if pad > 0:
+                values = np.concatenate([values, np.repeat(values[..., -1:], pad, axis=-1)],
+                                        axis=-1)
+            return values[..., :n_steps]
+
+        seeded = False
+        for name in ('tap', 'Q_PV'):
+            values = shifted(result[name])
+            if values is not None:
+                model[name].value = np.round(values) if name == 'tap' else values
+                seeded = True
+
+        n_berths, n_vessels, _ = model['shape']
+        rows = {k: i for i, k in enumerate(previous['vessel_ids'])}
+        omega = np.zeros((n_berths, n_vessels, n_steps))
+        z = np.zeros((n_berths, n_vessels, n_steps))
+        for i, vessel_id in enumerate(model['vessel_ids']):
+            if vessel_id in rows:
+                values = shifted(result['omega'][:, rows[vessel_id]])
+                if values is not None:
+                    omega[:, i] = np.round(values)
+                    z[:, i] = shifted(result['P_ch'][:, rows[vessel_id]]) * omega[:, i]
+        if seeded and n_vessels:
+            model['omega'].value = omega.reshape(n_berths * n_vessels, n_steps)
+            model['z'].value = z.reshape(n_berths * n_vessels, n_steps)
+            model['P_ch'].value = model['z'].value
+        return seeded
@@ -0,0 +1,443 @@
+"""
+Shortest-path search engines on resistance grids for RouteOptimizer
+"""
+
+import hashlib
+import heapq
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+SQRT2 = math.sqrt(2.0)
+
+# 8-directional moves (dx, dy), same order as the original Dijkstra planner
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0),
+              (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+@dataclass
+class SearchResult:
+    """Outcome of a grid search; `predecessors` is flat (row*cols+col), -1 = none"""
+    path: List[Tuple[int, int]]
+    cost: float
+    expanded: int
+    predecessors: np.ndarray
+    engine: str
+
+class GridGraph:
+    """Flat-indexed 8-neighbour view of a resistance map
+
+    Moving into cell v costs resistance[v], multiplied by sqrt(2) for diagonal
+    moves when `diagonal_weighting` is enabled.
+    """
+
+    def __init__(self, resistance_map: np.ndarray, diagonal_weighting: bool = False):
+        self.rows, self.cols = resistance_map.shape
+        self.n_nodes = self.rows * self.cols
+        self.resistance = np.ascontiguousarray(resistance_map, dtype=float).ravel().tolist()
+        self.diagonal_weighting = diagonal_weighting
+        self.moves = [(dx, dy, dx * self.cols + dy,
+                       SQRT2 if (diagonal_weighting and dx and dy) else 1.0)
+                      for dx, dy in DIRECTIONS]
+        self.min_resistance = float(resistance_map.min()) if self.n_nodes else 0.0
+
+    def index(self, cell: Tuple[int, int]) -> int:
+        return cell[0] * self.cols + cell[1]
+
+    def cell(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def neighbours(self, u: int):
+        """Yield (v, step_length) for every in-grid neighbour of u."""
+        r, c = divmod(u, self.cols)
+        rows, cols = self.rows, self.cols
+        for dx, dy, offset, length in self.moves:
+            nr, nc = r + dx, c + dy
+            if 0 <= nr < rows and 0 <= nc < cols:
+                yield u + offset, length
+
+    def heuristic(self, u: int, target: int) -> float:
+        """Admissible lower bound: min cell resistance times the fewest-move distance."""
+        r, c = divmod(u, self.cols)
+        tr, tc = divmod(target, self.cols)
+        dr, dc = abs(r - tr), abs(c - tc)
+        if self.diagonal_weighting:
+            # octile distance
+            steps = max(dr, dc) + (SQRT2 - 1.0) * min(dr, dc)
+        else:
+            steps = max(dr, dc)
+        return self.min_resistance * steps
+
+    def path_from(self, predecessors, start: int, end: int) -> List[Tuple[int, int]]:
+        """Follow flat predecessors back from `end` to `start`."""
+        path = []
+        current = end
+        while current != start and predecessors[current] != -1:
+            path.append(self.cell(current))
+            current = predecessors[current]
+        path.append(self.cell(start))
+        path.reverse()
+        return path
+
+def dijkstra_search(graph: GridGraph, start: int, end: int) -> SearchResult:
+    """Unidirectional Dijkstra with flat distance/predecessor arrays."""
+    return _best_first(graph, start, end, use_heuristic=False, engine="dijkstra")
+
+def astar_search(graph: GridGraph, start: int, end: int) -> SearchResult:
+    """A* guided by GridGraph.heuristic; reduces to Dijkstra when min resistance is 0."""
+    return _best_first(graph, start, end, use_heuristic=True, engine="astar")
+
+def _best_first(graph: GridGraph, start: int, end: int, use_heuristic: bool,
+                engine: str) -> SearchResult:
+    distances, predecessors, expanded = _settle(graph, start, end, use_heuristic)
+    return SearchResult(
+        path=graph.path_from(predecessors, start, end),
+        cost=distances[end],
+        expanded=expanded,
+        predecessors=np.asarray(predecessors, dtype=np.int64),
+        engine=engine,
+    )
+
+def _settle(graph: GridGraph, start: int, end: int = -1, use_heuristic: bool = False):
+    """Best-first search from `start`; settles every node when `end` is -1.
+
+    Returns flat (distances, predecessors, expanded) as Python lists/int.
+    """
+    resistance = graph.resistance
+    distances = [math.inf] * graph.n_nodes
+    predecessors = [-1] * graph.n_nodes
+    closed = bytearray(graph.n_nodes)
+    distances[start] = 0.0
+
+    h = (lambda u: graph.heuristic(u, end)) if use_heuristic else (lambda u: 0.0)
+    pq = [(h(start), 0.0, start)]
+    expanded = 0
+
+    while pq:
+        _, current_dist, current = heapq.heappop(pq)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+
+        if current == end:
+            break
+
+        for neighbour, length in graph.neighbours(current):
+            if closed[neighbour]:
+                continue
+            new_dist = current_dist + resistance[neighbour] * length
+            if new_dist < distances[neighbour]:
+                distances[neighbour] = new_dist
+                predecessors[neighbour] = current
+                heapq.heappush(pq, (new_dist + h(neighbour), new_dist, neighbour))
+
+    return distances, predecessors, expanded
+
+def bidirectional_search(graph: GridGraph, start: int, end: int) -> SearchResult:
+    """Bidirectional Dijkstra meeting in the middle.
+
+    The backward search walks edges in reverse: stepping from x back to y costs
+    what the forward move y -> x costs, i.e. resistance[x] * length.
+    """
+    resistance = graph.resistance
+    n = graph.n_nodes
+    dist = ([math.inf] * n, [math.inf] * n)
+    pred = ([-1] * n, [-1] * n)     # forward predecessors / backward successors
+    closed = (bytearray(n), bytearray(n))
+    dist[0][start] = 0.0
+    dist[1][end] = 0.0
+    queues = ([(0.0, start)], [(0.0, end)])
+
+    best, meeting = (0.0, start) if start == end else (math.inf, -1)
+    expanded = 0
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_dist, current = heapq.heappop(queues[side])
+        if closed[side][current]:
+            continue
+        closed[side][current] = 1
+        expanded += 1
+
+        d_here, d_other = dist[side], dist[1 - side]
+        p_here = pred[side]
+        for neighbour, length in graph.neighbours(current):
+            # forward: enter neighbour; backward: neighbour -> current enters current
+            step = resistance[neighbour if side == 0 else current] * length
+            new_dist = current_dist + step
+            if new_dist < d_here[neighbour]:
+                d_here[neighbour] = new_dist
+                p_here[neighbour] = current
+                heapq.heappush(queues[side], (new_dist, neighbour))
+            through = d_here[neighbour] + d_other[neighbour]
+            if through < best:
+                best, meeting = through, neighbour
+
+    if meeting == -1:
+        return SearchResult(path=[graph.cell(start)], cost=math.inf, expanded=expanded,
+                            predecessors=np.asarray(pred[0], dtype=np.int64),
+                            engine="bidirectional")
+
+    # Splice the backward half onto the forward predecessor array
+    predecessors = pred[0]
+    current = meeting
+    while current != end:
+        successor = pred[1][current]
+        predecessors[successor] = current
+        current = successor
+
+    return SearchResult(
+        path=graph.path_from(predecessors, start, end),
+        cost=best,
+        expanded=expanded,
+        predecessors=np.asarray(predecessors, dtype=np.int64),
+        engine="bidirectional",
+    )
+
+SEARCH_ENGINES: Dict[str, Callable[[GridGraph, int, int], SearchResult]] = {
+    "dijkstra": dijkstra_search,
+    "astar": astar_search,
+    "bidirectional": bidirectional_search,
+}
+
+def register_search_engine(name: str, engine: Callable[[GridGraph, int, int], SearchResult]):
+    """Make a custom engine selectable by name in RouteOptimizer."""
+    SEARCH_ENGINES[name] = engine
+
+def search(resistance_map: np.ndarray, start: Tuple[int, int], end: Tuple[int, int],
+           engine: str = "dijkstra", diagonal_weighting: bool = False) -> SearchResult:
+    """Run the named engine between two (row, col) cells."""
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"Unknown search engine '{engine}', "
+                         f"choose from {sorted(SEARCH_ENGINES)}")
+    graph = GridGraph(resistance_map, diagonal_weighting)
+    return SEARCH_ENGINES[engine](graph, graph.index(start), graph.index(end))
+
+def resistance_map_key(resistance_map: np.ndarray) -> str:
+    """Stable content hash of a resistance map (values, shape and dtype)."""
+    data = np.ascontiguousarray(resistance_map)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str((data.shape, data.dtype.str)).encode())
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
+def path_length(path: List[Tuple[int, int]]) -> float:
+    """Geometric length of a cell path in grid steps (diagonal moves count sqrt(2))."""
+    return float(sum(math.hypot(r1 - r0, c1 - c0) for (r0, c0), (r1, c1) in zip(path, path[1:])))
+
+@dataclass
+class DistanceField:
+    """One-to-all shortest-path tree from a single origin"""
+    origin: Tuple[int, int]
+    distances: np.ndarray      # (rows, cols) cost from origin, inf if unreachable
+    predecessors: np.ndarray   # flat predecessor array, -1 = none
+    expanded: int
+
+    def cost_to(self, destination: Tuple[int, int]) -> float:
+        return float(self.distances[destination])
+
+    def path_to(self, destination: Tuple[int, int]) -> List[Tuple[int, int]]:
+        cols = self.distances.shape[1]
+        start = self.origin[0] * cols + self.origin[1]
+        current = destination[0] * cols + destination[1]
+        path = []
+        while current != start and self.predecessors[current] != -1:
+            path.append(divmod(current, cols))
+            current = int(self.predecessors[current])
+        path.append(self.origin)
+        path.reverse()
+        return path
+
+def distance_field(resistance_map: np.ndarray, origin: Tuple[int, int],
+                   diagonal_weighting: bool = False) -> DistanceField:
+    """Settle every cell reachable from `origin` (full Dijkstra, no early exit)."""
+    graph = GridGraph(resistance_map, diagonal_weighting)
+    distances, predecessors, expanded = _settle(graph, graph.index(origin))
+    return DistanceField(
+        origin=tuple(origin),
+        distances=np.asarray(distances).reshape(graph.rows, graph.cols),
+        predecessors=np.asarray(predecessors, dtype=np.int64),
+        expanded=expanded,
+    )
+
+class RouteService:
+    """Many-to-many route queries answered from cached one-to-all distance fields
+
+    Fields are computed once per (weather snapshot, origin) and kept in an LRU
+    cache keyed by the resistance-map hash. Loading a new forecast with
+    `set_resistance_map` drops every field computed for the previous one.
+    """
+
+    def __init__(self, max_fields: int = 64, diagonal_weighting: bool = False):
+        self.max_fields = max_fields
+        self.diagonal_weighting = diagonal_weighting
+        self.resistance_map = None
+        self.map_key = None
+        self._fields: "OrderedDict[Tuple[str, Tuple[int, int]], DistanceField]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def set_resistance_map(self, resistance_map: np.ndarray) -> str:
+        """Install the current weather snapshot; returns its cache key."""
+        key = resistance_map_key(resistance_map)
+        if key != self.map_key:
+            self.invalidate()
+            self.resistance_map = np.array(resistance_map, copy=True)
+            self.map_key = key
+        return key
+
+    def invalidate(self, map_key: str = None):
+        """Forget cached fields for `map_key` (default: every snapshot)."""
+        if map_key is None:
+            self._fields.clear()
+        else:
+            for cache_key in [k for k in self._fields if k[0] == map_key]:
+                del self._fields[cache_key]
+
+    def field(self, origin: Tuple[int, int]) -> DistanceField:
+        if self.resistance_map is None:
+            raise RuntimeError("RouteService has no resistance map; call set_resistance_map first")
+        cache_key = (self.map_key, tuple(origin))
+        cached = self._fields.get(cache_key)
+        if cached is not None:
+            self._fields.move_to_end(cache_key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = distance_field(self.resistance_map, origin, self.diagonal_weighting)
+        self._fields[cache_key] = result
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return result
+
+    def route(self, origin: Tuple[int, int],
+              destination: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], float]:
+        field = self.field(origin)
+        return field.path_to(destination), field.cost_to(destination)
+
+    def routes(self, queries: Dict[int, Tuple[Tuple[int, int], Tuple[int, int]]]
+               ) -> Dict[int, Tuple[List[Tuple[int, int]], float]]:
+        """Answer {vessel_id: (origin, destination)} with one field per distinct origin."""
+        return {vessel_id: self.route(origin, destination)
+                for vessel_id, (origin, destination) in queries.items()}
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'cached_fields': len(self._fields)}
+
+class IncrementalRouter:
+    """Shortest-path tree from one origin that is repaired in place on weather updates
+
+    LPA*-style repair for a one-to-all tree: cells whose tree path crosses a
+    cell that got more expensive are reset and re-seeded from their unaffected
+    neighbours, cheaper cells are re-seeded directly, and a Dijkstra sweep
+    propagates from those seeds only. Everything else keeps its distance.
+    """
+
+    def __init__(self, resistance_map: np.ndarray, origin: Tuple[int, int],
+                 diagonal_weighting: bool = False):
+        self.graph = GridGraph(resistance_map, diagonal_weighting)
+        self.origin = tuple(origin)
+        self.start = self.graph.index(origin)
+        self.distances, self.predecessors, self.last_expanded = _settle(self.graph, self.start)
+
+    @property
+    def field(self) -> DistanceField:
+        return DistanceField(
+            origin=self.origin,
+            distances=np.asarray(self.distances).reshape(self.graph.rows, self.graph.cols),
+            predecessors=np.asarray(self.predecessors, dtype=np.int64),
+            expanded=self.last_expanded,
+        )
+
+    def route(self, destination: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], float]:
+        end = self.graph.index(destination)
+        return self.graph.path_from(self.predecessors, self.start, end), self.distances[end]
+
+    def _subtree(self, roots: np.ndarray) -> np.ndarray:
+        """Flat indices of `roots` and all their descendants in the current tree."""
+        predecessors = np.asarray(self.predecessors, dtype=np.int64)
+        order = np.argsort(predecessors, kind="stable")
+        sorted_pred = predecessors[order]
+        lo = np.searchsorted(sorted_pred, np.arange(self.graph.n_nodes), side="left")
+        hi = np.searchsorted(sorted_pred, np.arange(self.graph.n_nodes), side="right")
+
+        affected = np.zeros(self.graph.n_nodes, dtype=bool)
+        affected[roots] = True
+        frontier = np.asarray(roots, dtype=np.int64)
+        while frontier.size:
+            children = np.concatenate([order[lo[u]:hi[u]] for u in frontier.tolist()]
+                                      or [np.empty(0, dtype=np.int64)])
+            children = children[~affected[children]]
+            affected[children] = True
+            frontier = children
+        return np.flatnonzero(affected)
+
+    def update(self, cells, resistances) -> Dict[str, int]:
+        """Apply new resistances to `cells` ((row, col) pairs) and repair the tree.
+
+        Returns counts of changed cells, reset cells and repair expansions.
+        """
+        graph = self.graph
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        flat = cells[:, 0] * graph.cols + cells[:, 1]
+        new_values = np.broadcast_to(np.asarray(resistances, dtype=float), flat.shape)
+
+        old_values = np.asarray([graph.resistance[u] for u in flat.tolist()])
+        increased = flat[(new_values > old_values) & (flat != self.start)]
+        decreased = flat[(new_values < old_values) & (flat != self.start)]
+        for u, value in zip(flat.tolist(), new_values.tolist()):
+            graph.resistance[u] = value
+        graph.min_resistance = min(graph.resistance)
+
+        distances, predecessors = self.distances, self.predecessors
+        resistance = graph.resistance
+
+        reset = self._subtree(increased) if increased.size else np.empty(0, dtype=np.int64)
+        reset_mask = bytearray(graph.n_nodes)
+        for u in reset.tolist():
+            reset_mask[u] = 1
+            distances[u] = math.inf
+            predecessors[u] = -1
+
+        pq = []
+        # Re-seed reset and cheaper cells from their best settled neighbour
+        for v in set(reset.tolist()) | set(decreased.tolist()):
+            best, best_pred = distances[v], predecessors[v]
+            for u, length in graph.neighbours(v):
+                if reset_mask[u]:
+                    continue
+                candidate = distances[u] + resistance[v] * length
+                if candidate < best:
+                    best, best_pred = candidate, u
+            if best < distances[v] or (reset_mask[v] and best < math.inf):
+                distances[v], predecessors[v] = best, best_pred
+                heapq.heappush(pq, (best, v))
+
+        expanded = 0
+        while pq:
+            current_dist, current = heapq.heappop(pq)
+            if current_dist > distances[current]:
+                continue
+            expanded += 1
+            for neighbour, length in graph.neighbours(current):
+                new_dist = current_dist + resistance[neighbour] * length
+                if new_dist < distances[neighbour]:
+                    distances[neighbour] = new_dist
+                    predecessors[neighbour] = current
+                    heapq.heappush(pq, (new_dist, neighbour))
+
+        self.last_expanded = expanded
+        return {'changed': int(flat.size), 'reset': int(reset.size), 'expanded': expanded}
+
+    def update_map(self, resistance_map: np.ndarray) -> Dict[str, int]:
+        """Diff a full new resistance map against the current one and repair."""
+        current = np.asarray(self.graph.resistance).reshape(self.graph.rows, self.graph.cols)
+        rows, cols = np.nonzero(resistance_map != current)
+        return self.update(np.column_stack([rows, cols]), resistance_map[rows, cols])
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Online re-optimization service around CoordinatedOptimizer (asyncio)
+
+Forecast updates, vessel delays and new vessels arrive as events on a queue.
+Bursts are coalesced into one re-optimization, only the voyages of the
+affected vessels are re-solved (in a process pool), Steps 4-6 are re-run on
+the updated pairs and every new berth/charging plan is published to the
+subscribers together with its latency.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from logic import (AESParameters, CoordinatedOptimizer, DEFAULT_RESISTANCE_PROFILE,
+                   example_fleet, example_forecasts, example_seaport)
+
+@dataclass
+class ForecastUpdate:
+    """New forecasts; fields left at None keep their current value
+
+    PV/load changes only re-run the port side (Steps 4-6); a new wind field
+    re-plans the route and a new voyage resistance profile re-solves every
+    vessel's voyages.
+    """
+    pv_forecast: np.ndarray = None
+    load_forecast: np.ndarray = None
+    wind_conditions: np.ndarray = None
+    resistance_profile: List[float] = None
+
+@dataclass
+class VesselDelay:
+    """A vessel's arrival window [T_low, T_up] moves by ``hours`` (negative: earlier)"""
+    vessel_id: int
+    hours: int
+
+@dataclass
+class NewVessel:
+    """A vessel joins the fleet (or replaces the one with the same vessel_id)"""
+    aes: AESParameters
+
+class ReoptimizationService:
+    """Event-driven re-optimization of a CoordinatedOptimizer's plan
+
+    run() publishes an initial plan, then waits for events. The first event
+    of a burst opens a ``coalesce``-second window; everything queued by then
+    (at most ``max_batch`` events) is applied in order and answered by one
+    re-optimization. Events that arrive during a solve form the next burst.
+    Plans go to every queue returned by subscribe() as dicts with 'version',
+    'result' (the run_coordinated_optimization layout), 'events', 'affected'
+    vessel ids and 'latency' in seconds: 'queue' (oldest event to solve
+    start), 'voyage', 'port' and 'total' (oldest event to publication).
+
+    Solves run in threads so the event loop stays responsive; with
+    ``n_workers`` > 1 the voyage subproblems go to one long-lived process
+    pool. stop() lets the queued events finish before run() returns.
+    """
+
+    def __init__(self, optimizer: CoordinatedOptimizer, pv_forecast: np.ndarray,
+                 load_forecast: np.ndarray, wind_conditions: np.ndarray = None,
+                 resistance_profile: List[float] = None, coalesce: float = 0.05,
+                 max_batch: int = 100, n_workers: int = 1, verbose: bool = False):
+        self.optimizer = optimizer
+        optimizer.aes_fleet = list(optimizer.aes_fleet)
+        self.pv_forecast = np.asarray(pv_forecast, dtype=float)
+        self.load_forecast = np.asarray(load_forecast, dtype=float)
+        self.wind_conditions = (np.zeros((10, 10), dtype=int) if wind_conditions is None
+                                else wind_conditions)
+        self.resistance_profile = resistance_profile or list(DEFAULT_RESISTANCE_PROFILE)
+        self.coalesce = coalesce
+        self.max_batch = max_batch
+        self.n_workers = n_workers
+        # Step banners of the optimizer (its failure messages always print)
+        optimizer.verbose = verbose
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.pairs: Dict[int, List[Dict]] = {}   # current Step 3 pairs per vessel
+        self.route = None
+        self.latest = None
+        self.version = 0
+        self._subscribers: List[asyncio.Queue] = []
+        self._stopping = False
+
+    async def submit(self, event):
+        """Queue an event (ForecastUpdate, VesselDelay or NewVessel)"""
+        await self.events.put((time.perf_counter(), event))
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving every plan published from now on"""
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    async def stop(self):
+        """Finish the events queued so far, then end run()"""
+        await self.events.put(None)
+
+    async def run(self):
+        executor = ProcessPoolExecutor(max_workers=self.n_workers) if self.n_workers > 1 else None
+        self.optimizer.executor = executor
+        try:
+            vessel_ids = {aes.vessel_id for aes in self.optimizer.aes_fleet}
+            await self._reoptimize([], vessel_ids, replan_route=True, received=time.perf_counter())
+            while not self._stopping:
+                batch = await self._next_batch()
+                if batch:
+                    affected, replan_route = set(), False
+                    for _, event in batch:
+                        vessels, route = self.apply(event)
+                        affected |= vessels
+                        replan_route |= route
+                    await self._reoptimize(batch, affected, replan_route,
+                                           received=min(received for received, _ in batch))
+        finally:
+            self.optimizer.executor = None
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    async def _next_batch(self) -> List[Tuple[float, object]]:
+        """The next burst of events (empty once stop() has been reached)"""
+        item = await self.events.get()
+        if item is None:
+            self._stopping = True
+            return []
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.coalesce
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            try:
+                item = (self.events.get_nowait() if timeout <= 0
+                        else await asyncio.wait_for(self.events.get(), timeout))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is None:
+                self._stopping = True
+                break
+            batch.append(item)
+        return batch
+
+    def apply(self, event) -> Tuple[Set[int], bool]:
+        """Update the service state; returns (vessels to re-solve, re-plan route)"""
+        fleet = self.optimizer.aes_fleet
+        if isinstance(event, ForecastUpdate):
+            if event.pv_forecast is not None:
+                self.pv_forecast = np.asarray(event.pv_forecast, dtype=float)
+            if event.load_forecast is not None:
+                self.load_forecast = np.asarray(event.load_forecast, dtype=float)
+            if event.wind_conditions is not None:
+                self.wind_conditions = event.wind_conditions
+            vessels = set()
+            if event.resistance_profile is not None:
+                self.resistance_profile = list(event.resistance_profile)
+                vessels = {aes.vessel_id for aes in fleet}
+            return vessels, event.wind_conditions is not None
+        if isinstance(event, VesselDelay):
+            for index, aes in enumerate(fleet):
+                if aes.vessel_id == event.vessel_id:
+                    fleet[index] = dataclasses.replace(aes, T_low=aes.T_low + event.hours,
+                                                       T_up=aes.T_up + event.hours)
+                    return {aes.vessel_id}, False
+            print(f"Ignoring delay of unknown AES {event.vessel_id}")
+            return set(), False
+        if isinstance(event, NewVessel):
+            index = next((i for i, aes in enumerate(fleet)
+                          if aes.vessel_id == event.aes.vessel_id), None)
+            if index is None:
+                fleet.append(event.aes)
+            else:
+                fleet[index] = event.aes
+            return {event.aes.vessel_id}, False
+        raise TypeError(f"Unknown event type {type(event).__name__}")
+
+    async def _reoptimize(self, batch: List, affected: Set[int], replan_route: bool,
+                          received: float):
+        optimizer = self.optimizer
+        start = time.perf_counter()
+        if replan_route:
+            resistance_map = optimizer.route_optimizer.generate_resistance_map(self.wind_conditions)
+            optimizer.route_service.set_resistance_map(resistance_map)
+            self.route = await asyncio.to_thread(
+                optimizer.route_service.route, *optimizer.default_route)
+
+        t_voyage = time.perf_counter()
+        result = None
+        if affected:
+            try:
+                self.pairs.update(await asyncio.to_thread(
+                    optimizer.schedule_voyages, self.resistance_profile, None,
+                    affected))
+            except RuntimeError as e:
+                print(f"Voyage re-optimization failed: {e}")
+                result = {'success': False, 'error': str(e)}
+        t_port = time.perf_counter()
+        if result is None:
+            pairs = {aes.vessel_id: self.pairs.get(aes.vessel_id, [])
+                     for aes in optimizer.aes_fleet}
+            result = await asyncio.to_thread(optimizer.plan_berths, pairs,
+                                             self.pv_forecast, self.load_forecast)
+            if result['success'] and self.route is not None:
+                result['route'] = self.route[0]
+        end = time.perf_counter()
+
+        plan = {
+            'version': self.version,
+            'result': result,
+            'events': len(batch),
+            'affected': sorted(affected),
+            'latency': {'queue': start - received, 'voyage': t_port - t_voyage,
+                        'port': end - t_port, 'total': end - received},
+        }
+        self.version += 1
+        self.latest = plan
+        for queue in self._subscribers:
+            queue.put_nowait(plan)
+
+async def replay(service: ReoptimizationService, schedule: Iterable[Tuple[float, object]]):
+    """Local event source: submit each event ``delay`` seconds after the previous one"""
+    for delay, event in schedule:
+        await asyncio.sleep(delay)
+        await service.submit(event)
+
+def demo_events() -> List[Tuple[float, object]]:
+    """Updates for the example fleet: a burst of forecasts, an early arrival, a newcomer"""
+    pv_forecast, load_forecast = example_forecasts()
+    cloudy = np.clip(0.5 * pv_forecast, 0, 1)
+    newcomer = dataclasses.replace(example_fleet()[0], vessel_id=3)
+    return [
+        (0.0, ForecastUpdate(pv_forecast=cloudy)),
+        (0.01, ForecastUpdate(load_forecast=1.1 * load_forecast)),
+        (0.01, ForecastUpdate(resistance_profile=[0.20, 0.25, 0.22, 0.26])),
+        (0.5, VesselDelay(vessel_id=2, hours=-1)),
+        (0.5, NewVessel(newcomer)),
+        (0.5, ForecastUpdate(wind_conditions=np.random.default_rng(1).integers(0, 4, (10, 10)))),
+    ]
+
+async def _print_plans(plans: asyncio.Queue):
+    while True:
+        plan = await plans.get()
+        result, latency = plan['result'], plan['latency']
+        outcome = (f"cost ${result['summary']['total_operation_cost']:.2f}, "
+                   f"arrivals {({v: s['T_a'] for v, s in result['vessel_strategies'].items()})}"
+                   if result['success'] else f"failed ({result.get('error')})")
+        print(f"plan v{plan['version']}: {plan['events']} event(s), re-solved "
+              f"{plan['affected'] or 'no voyages'}; {outcome}")
+        print(f"    latency total {latency['total']:.3f}s (queue {latency['queue']:.3f}, "
+              f"voyage {latency['voyage']:.3f}, port {latency['port']:.3f})")
+
+async def demo(coalesce: float, n_workers: int):
+    pv_forecast, load_forecast = example_forecasts()
+    optimizer = CoordinatedOptimizer(example_fleet(), example_seaport(), persistent_model=True)
+    service = ReoptimizationService(optimizer, pv_forecast, load_forecast,
+                                    coalesce=coalesce, n_workers=n_workers)
+    printer = asyncio.create_task(_print_plans(service.subscribe()))
+    runner = asyncio.create_task(service.run())
+    await replay(service, demo_events())
+    await service.stop()
+    await runner
+    await asyncio.sleep(0)
+    printer.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a day of updates through the re-optimization service")
+    parser.add_argument("--coalesce", type=float, default=0.05,
+                        help="seconds to gather a burst of events into one re-solve")
+    parser.add_argument("--workers", type=int, default=1, help="voyage process pool size")
+    args = parser.parse_args()
+    asyncio.run(demo(args.coalesce, args.workers))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Persistent content-addressed cache of voyage and voltage-regulation solve results
+"""
+
+import dataclasses
+import hashlib
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+# Bump when a model change makes previously cached results stale
+CACHE_VERSION = 2
+
+def cache_hit(result: Any, lookup_time: float) -> Any:
+    """Copy of a cached solve result, marked as a hit
+
+    'timing' becomes the lookup time with 'cached': True; the timing stored
+    with the result (the run that solved it) moves to timing['solved'].
+    """
+    if not isinstance(result, dict):
+        return result
+    timing = {'total': lookup_time, 'cached': True}
+    if 'timing' in result:
+        timing['solved'] = result['timing']
+    return {**result, 'cached': True, 'timing': timing}
+
+def _feed(digest, value):
+    """Write a canonical, type-tagged encoding of ``value`` into ``digest``"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        digest.update(f"dc:{type(value).__name__}(".encode())
+        # Fields with init=False are derived from the others
+        for item in (f for f in dataclasses.fields(value) if f.init):
+            digest.update(f"{item.name}=".encode())
+            _feed(digest, getattr(value, item.name))
+        digest.update(b")")
+    elif isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        digest.update(f"nd:{data.shape}:{data.dtype.str}:".encode())
+        digest.update(data.tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+        digest.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"seq{len(value)}[".encode())
+        for item in value:
+            _feed(digest, item)
+        digest.update(b"]")
+    elif isinstance(value, (bool, np.bool_)) or value is None or isinstance(value, str):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (int, np.integer)):
+        digest.update(f"int:{int(value)};".encode())
+    elif isinstance(value, (float, np.floating)):
+        digest.update(f"float:{float(value)!r};".encode())
+    else:
+        raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+def fingerprint(*parts) -> str:
+    """Stable content hash of dataclasses, arrays, containers and scalars
+
+    Lists of floats and float arrays hash differently, so callers should pass
+    numeric profiles consistently (e.g. as float64 arrays).
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    _feed(digest, CACHE_VERSION)
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+class SolveCache:
+    """On-disk (SQLite) store of pickled solve results keyed by fingerprint
+
+    Entries older than ``max_age`` seconds count as misses and are removed;
+    when the stored payload exceeds ``max_bytes`` the least recently used
+    entries are evicted. Hit/miss/eviction counters live in the database, so
+    they include lookups made by worker processes. The object only holds the
+    path between calls and can be pickled into a process pool.
+    """
+
+    def __init__(self, path, max_bytes: int = 256 * 2 ** 20, max_age: float = 7 * 86400.0):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._connection = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            connection.executemany("INSERT OR IGNORE INTO counters VALUES (?, 0)",
+                                   [('hits',), ('misses',), ('evictions',)])
+            self._connection = connection
+        return self._connection
+
+    def _count(self, name: str, n: int = 1):
+        self.connection.execute("UPDATE counters SET value = value + ? WHERE name = ?", (n, name))
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(True, value) for a fresh entry, (False, None) otherwise"""
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] > self.max_age:
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count('evictions')
+            row = None
+        if row is None:
+            self._count('misses')
+            return False, None
+        self.connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Store ``value`` (any picklable result, including None) under ``key``"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(blob), len(blob), now, now))
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries until under max_bytes; returns the count"""
+        connection = self.connection
+        removed = connection.execute("DELETE FROM entries WHERE created < ?",
+                                     (time.time() - self.max_age,)).rowcount
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            victims, freed = [], 0
+            for key, size in connection.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed"):
+                if freed >= excess:
+                    break
+                victims.append((key,))
+                freed += size
+            connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+            removed += len(victims)
+        if removed:
+            self._count('evictions', removed)
+        return removed
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        self.connection.execute("DELETE FROM entries")
+        self.connection.execute("UPDATE counters SET value = 0")
+
+    def stats(self) -> Dict[str, int]:
+        counters = dict(self.connection.execute("SELECT name, value FROM counters"))
+        entries, size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {**counters, 'entries': entries, 'bytes': size}
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Scenario sweeps of the coordinated optimization (Algorithm 1) across a process pool
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from logic import (AESParameters, CoordinatedOptimizer, example_fleet, example_forecasts,
+                   example_seaport)
+from fleet_table import FleetTable
+from network import LinDistFlow, load_feeder
+from solve_cache import SolveCache
+
+def table_fleet(T_low: int = 10, T_up: int = 12, beta_k: float = 0.5) -> List[AESParameters]:
+    """Four-vessel fleet of Tables II/III"""
+    return FleetTable.from_tables(T_low=T_low, T_up=T_up, beta_k=beta_k).to_fleet()
+
+def _scaled_forecasts(pv_scale: float = 1.0, load_scale: float = 1.0):
+    pv_forecast, load_forecast = example_forecasts()
+    return np.clip(pv_scale * pv_forecast, 0.0, 1.0), load_scale * load_forecast
+
+FLEETS = {
+    'example': example_fleet,
+    'table-ii': table_fleet,
+}
+
+PROFILES = {
+    'example': example_forecasts,
+    'cloudy': lambda: _scaled_forecasts(pv_scale=0.4),
+    'peak-load': lambda: _scaled_forecasts(load_scale=1.3),
+}
+
+@dataclass(frozen=True)
+class Scenario:
+    """One point of a sweep; fleet and profile name entries of FLEETS / PROFILES"""
+    scenario_id: int
+    fleet: str = 'example'
+    profile: str = 'example'
+    beta_k: float = None      # overrides every vessel's SI threshold
+    wind_seed: int = 0
+    tap_max: int = 10
+
+def scenario_grid(fleets: Sequence[str] = ('example',), profiles: Sequence[str] = ('example',),
+                  beta_k: Sequence[float] = (None,), wind_seeds: Sequence[int] = (0,),
+                  tap_max: Sequence[int] = (10,)) -> Iterator[Scenario]:
+    """Lazily enumerate the Cartesian product of the given settings"""
+    for scenario_id, (fleet, profile, beta, seed, taps) in enumerate(
+            itertools.product(fleets, profiles, beta_k, wind_seeds, tap_max)):
+        yield Scenario(scenario_id, fleet, profile, beta, seed, taps)
+
+# Row layout shared by the CSV and Parquet writers
+COLUMNS = ['scenario_id', 'fleet', 'profile', 'beta_k', 'wind_seed', 'tap_max', 'success',
+           'total_operation_cost', 'average_SI', 'power_losses', 'n_vessels_optimized',
+           'route_resistance', 'time', 'error']
+
+def run_scenario(scenario: Scenario, cache: SolveCache = None) -> Dict:
+    """Worker entry point: run Algorithm 1 for one scenario and return its flat result row
+
+    The pipeline's progress output is suppressed; failures are reported in the
+    row ('success' False, 'error') rather than raised.
+    """
+    row = {column: None for column in COLUMNS}
+    row.update(asdict(scenario), success=False)
+    start_time = time.perf_counter()
+    try:
+        fleet = FLEETS[scenario.fleet]()
+        if scenario.beta_k is not None:
+            fleet = [replace(aes, beta_k=scenario.beta_k) for aes in fleet]
+        pv_forecast, load_forecast = PROFILES[scenario.profile]()
+        seaport_params = example_seaport(scenario.tap_max)
+        network = LinDistFlow(load_feeder(), V_min=seaport_params.V_min,
+                              V_max=seaport_params.V_max)
+        optimizer = CoordinatedOptimizer(fleet, seaport_params, network=network, cache=cache)
+        wind_conditions = np.random.default_rng(scenario.wind_seed).integers(0, 4, size=(10, 10))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = optimizer.run_coordinated_optimization(wind_conditions, pv_forecast,
+                                                            load_forecast)
+        if result['success']:
+            row.update({key: float(value) for key, value in result['summary'].items()},
+                       success=True)
+            row['n_vessels_optimized'] = int(row['n_vessels_optimized'])
+            resistance_map = optimizer.route_optimizer.generate_resistance_map(wind_conditions)
+            row['route_resistance'] = float(sum(resistance_map[cell] for cell in result['route']))
+        else:
+            row['error'] = result.get('error', 'optimization failed')
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    row['time'] = time.perf_counter() - start_time
+    return row
+
+class _CsvSink:
+    def __init__(self, path: Path):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, row: Dict):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class _ParquetSink:
+    """Writes one row group per ``batch_size`` rows so memory stays bounded"""
+
+    def __init__(self, path: Path, batch_size: int = 64):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow; use a .csv path instead") from e
+        self.pa = pa
+        self.schema = pa.schema([
+            ('scenario_id', pa.int64()), ('fleet', pa.string()), ('profile', pa.string()),
+            ('beta_k', pa.float64()), ('wind_seed', pa.int64()), ('tap_max', pa.int64()),
+            ('success', pa.bool_()), ('total_operation_cost', pa.float64()),
+            ('average_SI', pa.float64()), ('power_losses', pa.float64()),
+            ('n_vessels_optimized', pa.int64()), ('route_resistance', pa.float64()),
+            ('time', pa.float64()), ('error', pa.string())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.rows = []
+
+    def write(self, row: Dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def open_sink(path):
+    """Row writer chosen by suffix: .parquet (needs pyarrow) or .csv"""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return _ParquetSink(path)
+    if path.suffix == '.csv':
+        return _CsvSink(path)
+    raise ValueError(f"Unsupported output format {path.suffix!r} (use .csv or .parquet)")
+
+def run_sweep(scenarios: Iterable[Scenario], output, n_workers: int = 1,
+              cache_path=None, max_pending: int = None, verbose: bool = True) -> Dict:
+    """Run every scenario and stream its row to ``output`` as soon as it finishes
+
+    At most ``max_pending`` (default 2 * n_workers) scenarios are in flight, so
+    neither the scenario iterator nor the results are held in memory. With
+    ``cache_path`` all workers share one SolveCache; voyage entries ignore
+    port-side parameters (beta_k, tap_max, forecasts), so scenarios differing
+    only in those reuse each other's Step 3 solves. Rows are written in
+    completion order; sort by scenario_id to restore grid order.
+    """
+    cache = SolveCache(cache_path) if cache_path else None
+    sink = open_sink(output)
+    max_pending = max_pending or 2 * max(n_workers, 1)
+    counts = {'n_scenarios': 0, 'n_failed': 0}
+    start_time = time.perf_counter()
+
+    def record(row):
+        sink.write(row)
+        counts['n_scenarios'] += 1
+        counts['n_failed'] += not row['success']
+        if verbose:
+            status = (f"cost ${row['total_operation_cost']:.2f}, SI {row['average_SI']:.3f}"
+                      if row['success'] else f"failed: {row['error']}")
+            print(f"[{counts['n_scenarios']}] scenario {row['scenario_id']} "
+                  f"({row['fleet']}, {row['profile']}, beta_k={row['beta_k']}, "
+                  f"seed={row['wind_seed']}): {status} in {row['time']:.2f}s")
+
+    try:
+        if n_workers <= 1:
+            for scenario in scenarios:
+                record(run_scenario(scenario, cache))
+        else:
+            scenarios = iter(scenarios)
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                pending = set()
+                for scenario in itertools.islice(scenarios, max_pending):
+                    pending.add(pool.submit(run_scenario, scenario, cache))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result())
+                    for scenario in itertools.islice(scenarios, len(done)):
+                        pending.add(pool.submit(run_scenario, scenario, cache))
+    finally:
+        sink.close()
+
+    summary = {**counts, 'time': time.perf_counter() - start_time, 'output': str(output)}
+    if cache is not None:
+        summary['cache'] = cache.stats()
+        cache.close()
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Algorithm 1 over a grid of scenarios")
+    parser.add_argument("--fleets", nargs="+", default=['example'], choices=sorted(FLEETS))
+    parser.add_argument("--profiles", nargs="+", default=['example'], choices=sorted(PROFILES))
+    parser.add_argument("--beta-k", nargs="+", type=float, default=[None],
+                        help="SI thresholds applied to every vessel (default: fleet values)")
+    parser.add_argument("--wind-seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--tap-max", nargs="+", type=int, default=[10])
+    parser.add_argument("--workers", "-j", type=int, default=1)
+    parser.add_argument("--output", "-o", default="sweep.csv",
+                        help="results file, .csv or .parquet")
+    parser.add_argument("--cache", default=None,
+                        help="SolveCache file shared by the workers (e.g. sweep_cache.sqlite)")
+    args = parser.parse_args()
+
+    scenarios = scenario_grid(args.fleets, args.profiles, args.beta_k, args.wind_seeds,
+                              args.tap_max)
+    summary = run_sweep(scenarios, args.output, args.workers, args.cache)
+    print(f"\n{summary['n_scenarios']} scenarios ({summary['n_failed']} failed) in "
+          f"{summary['time']:.2f}s -> {summary['output']}")
+    if 'cache' in summary:
+        stats = summary['cache']
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+
+if __name__ == "__main__":
+    main()
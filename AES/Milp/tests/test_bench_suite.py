@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import bench_suite
+
+def test_registered_benchmarks():
+    assert {'resistance_map', 'route_planning', 'optimize_voyage', 'filter_by_threshold',
+            'candidate_selection', 'optimize_voltage_regulation'} <= set(bench_suite.BENCHMARKS)
+    assert all(spec['doc'] and spec['params'] for spec in bench_suite.BENCHMARKS.values())
+    assert bench_suite.case_name('route_planning', {'grid': 10}) == 'route_planning[grid=10]'
+
+def test_quick_run_times_smallest_cases():
+    results = bench_suite.run_suite('resistance_map|filter_by_threshold|candidate_selection',
+                                    quick=True, repeat=2)
+    assert sorted(results) == ['candidate_selection[pairs=1000]',
+                               'filter_by_threshold[pairs=100]', 'resistance_map[grid=10]']
+    for result in results.values():
+        assert result['repeat'] == 2 and 0 < result['min'] <= result['median']
+
+def test_failing_case_is_reported(monkeypatch):
+    def broken(size):
+        raise RuntimeError("no instance")
+    monkeypatch.setitem(bench_suite.BENCHMARKS, 'broken',
+                        {'setup': broken, 'params': {'size': [1, 2]}, 'repeat': 1, 'doc': ''})
+    results = bench_suite.run_suite('^broken$')
+    assert results == {'broken[size=1]': {'error': 'RuntimeError: no instance'},
+                       'broken[size=2]': {'error': 'RuntimeError: no instance'}}
+
+def test_compare_flags_regressions(capsys):
+    env = {'commit': 'abc'}
+    baseline = {'env': env, 'results': {'a': {'min': 1.0}, 'b': {'min': 1.0},
+                                        'c': {'min': 1.0}, 'd': {'error': 'x'}}}
+    current = {'env': env, 'results': {'a': {'min': 1.5}, 'b': {'min': 0.5},
+                                       'c': {'min': 1.1}, 'd': {'min': 1.0},
+                                       'e': {'min': 1.0}}}
+    assert bench_suite.compare(baseline, current) == ['a']
+    out = capsys.readouterr().out
+    assert 'slower' in out and 'faster' in out
+
+def test_saved_results_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr('sys.argv', ['bench_suite.py', '-k', '^resistance_map$', '--quick',
+                                     '--repeat', '1', '--save', str(tmp_path / 'base.json')])
+    bench_suite.main()
+    saved = json.loads((tmp_path / 'base.json').read_text())
+    assert list(saved['results']) == ['resistance_map[grid=10]']
+    assert {'commit', 'numpy', 'cvxpy', 'python'} <= set(saved['env'])
+
+    # A much slower baseline is not a regression; a much faster one is
+    saved['results']['resistance_map[grid=10]']['min'] *= 1e6
+    (tmp_path / 'slow.json').write_text(json.dumps(saved))
+    saved['results']['resistance_map[grid=10]']['min'] *= 1e-12
+    (tmp_path / 'fast.json').write_text(json.dumps(saved))
+    monkeypatch.setattr('sys.argv', ['bench_suite.py', '--compare', str(tmp_path / 'slow.json'),
+                                     str(tmp_path / 'base.json')])
+    bench_suite.main()
+    monkeypatch.setattr('sys.argv', ['bench_suite.py', '--compare', str(tmp_path / 'fast.json'),
+                                     str(tmp_path / 'base.json')])
+    with pytest.raises(SystemExit):
+        bench_suite.main()
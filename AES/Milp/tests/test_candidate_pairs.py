@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from logic import CandidatePairs, SatisfactoryIndex
+
+def make_pairs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'T_a': int(T_a), 'SOC_a': float(soc), 'cost': float(cost), 'velocity_profile': [k]}
+            for k, (T_a, soc, cost) in enumerate(zip(rng.integers(8, 14, n),
+                                                     rng.choice([0.1, 0.2, 0.3, 0.4], n),
+                                                     rng.choice([900.0, 1000.0, 1100.0], n)))]
+
+def dominates(a, b):
+    better_or_equal = (a['cost'] <= b['cost'] and a['T_a'] <= b['T_a']
+                       and a['SOC_a'] >= b['SOC_a'])
+    return better_or_equal and (a['cost'], a['T_a'], a['SOC_a']) != (b['cost'], b['T_a'],
+                                                                     b['SOC_a'])
+
+def test_calculate_SI():
+    assert np.allclose(SatisfactoryIndex.calculate_SI([100, 150, 200]), [1, 0.5, 0])
+    assert np.allclose(SatisfactoryIndex.calculate_SI([5, 5]), [1, 1])
+    assert SatisfactoryIndex.calculate_SI([]).size == 0
+
+def test_filter_by_threshold_keeps_dict_api():
+    pairs = [{'cost': 100}, {'cost': 200}, {'cost': 150}]
+    kept = SatisfactoryIndex.filter_by_threshold(pairs, 0.5)
+    assert kept == [pairs[0], pairs[2]] and kept[0] is pairs[0]
+    assert [pair['SI'] for pair in pairs] == [1.0, 0.0, 0.5]
+    assert SatisfactoryIndex.filter_by_threshold([], 0.5) == []
+
+def test_candidates_match_the_dict_api():
+    pairs = make_pairs(200)
+    reference = SatisfactoryIndex.filter_by_threshold([dict(p) for p in pairs], 0.4)
+    table = CandidatePairs.from_pairs(pairs).compute_SI()
+    filtered = table.filter(0.4)
+    assert [p['velocity_profile'] for p in filtered.to_pairs()] == [
+        p['velocity_profile'] for p in reference]
+    # SI is written into the original dicts, which indexing returns
+    assert filtered[0] is pairs[filtered[0]['velocity_profile'][0]]
+    assert np.allclose([pair['SI'] for pair in pairs], [pair['SI'] for pair in
+                       SatisfactoryIndex.filter_by_threshold([dict(p) for p in pairs], 0.0)])
+    assert table.best() is max(pairs, key=lambda pair: pair['SI'])
+
+def test_top_k():
+    table = CandidatePairs.from_arrays([8, 9, 10, 11], [0.1, 0.2, 0.3, 0.4],
+                                       [300.0, 100.0, 400.0, 200.0]).compute_SI()
+    assert [p['T_a'] for p in table.top_k(2).to_pairs()] == [9, 11]
+    assert [p['T_a'] for p in table.top_k(3, 'cost', largest=False).to_pairs()] == [9, 11, 8]
+    assert len(table.top_k(10)) == 4 and len(table.top_k(0)) == 0
+    assert table[0] == {'T_a': 8, 'SOC_a': 0.1, 'cost': 300.0, 'SI': pytest.approx(1 / 3)}
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pareto_front_matches_brute_force(seed):
+    pairs = make_pairs(60, seed)
+    front = CandidatePairs.from_pairs(pairs).pareto_front().to_pairs()
+    expected = []
+    for i, pair in enumerate(pairs):
+        duplicate = any((p['cost'], p['T_a'], p['SOC_a']) == (pair['cost'], pair['T_a'],
+                                                               pair['SOC_a'])
+                        for p in pairs[:i])
+        if not duplicate and not any(dominates(other, pair) for other in pairs):
+            expected.append(pair)
+    assert front == expected
+
+def test_empty_candidates():
+    table = CandidatePairs.from_pairs([]).compute_SI()
+    assert len(table.filter(0.5)) == 0 and len(table.pareto_front()) == 0
+    assert len(table.top_k(3)) == 0
@@ -0,0 +1,49 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, synthetic_fleet
+from decomposition import FleetPortDecomposition
+from logic import CoordinatedOptimizer, SatisfactoryIndex
+
+PROFILE = [0.15, 0.20, 0.18, 0.22]
+
+@pytest.fixture
+def optimizer():
+    """Six vessels with staggered 3 h windows and a shore power tariff"""
+    fleet = [dataclasses.replace(aes, T_low=10 + aes.vessel_id % 8, T_up=13 + aes.vessel_id % 8)
+             for aes in synthetic_fleet(6)]
+    optimizer = CoordinatedOptimizer(fleet, example_seaport(), d_route=80.0, verbose=False)
+    optimizer.voltage_regulator.energy_price = 3.0
+    return optimizer
+
+def test_decomposition_improves_on_the_pipeline(optimizer):
+    pv, load = daily_profiles(24)
+    pairs = optimizer.schedule_voyages(PROFILE)
+    filtered = {aes.vessel_id: SatisfactoryIndex.filter_by_threshold(pairs[aes.vessel_id],
+                                                                     aes.beta_k)
+                for aes in optimizer.aes_fleet}
+    pipeline = optimizer.voltage_regulator.optimize_voltage_regulation(
+        filtered, pv, load, optimizer.aes_fleet)
+
+    result = FleetPortDecomposition(optimizer, verbose=False).solve(pv, load, PROFILE)
+    assert result['success'] and result['converged']
+    objectives = [log['objective'] for log in result['iterations']]
+    assert objectives[0] == pytest.approx(pipeline['objective_value'])
+    assert np.all(np.diff(objectives) <= 1e-6)
+    assert result['voltage_control']['objective_value'] <= pipeline['objective_value'] + 1e-6
+    assert sum(log['columns_added'] for log in result['iterations']) > 0
+    assert all(price >= 0 for price in result['energy_prices'].values())
+
+    # Strategies only use arrival times passengers accepted before pricing
+    for vessel_id, strategy in result['vessel_strategies'].items():
+        assert strategy['T_a'] in {pair['T_a'] for pair in filtered[vessel_id]}
+
+def test_master_failure_is_reported(optimizer, monkeypatch, capsys):
+    pv, load = daily_profiles(24)
+    decomposition = FleetPortDecomposition(optimizer, verbose=False)
+    monkeypatch.setattr(decomposition, '_solve_master', lambda *args: {'success': False})
+    result = decomposition.solve(pv, load, PROFILE)
+    assert result == {'success': False, 'error': 'Master problem failed', 'iterations': []}
+    assert "master problem failed" in capsys.readouterr().out
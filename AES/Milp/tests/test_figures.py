@@ -0,0 +1,46 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import figstyle
+from figures import FIGURE_NUMBERS, figure_module, render
+
+@pytest.fixture(autouse=True)
+def paper_numbers(monkeypatch):
+    monkeypatch.delenv(figstyle.RESULTS_ENV, raising=False)
+
+def test_figure_module_is_imported_once():
+    assert figure_module(5) is figure_module(5)
+    with pytest.raises(ValueError):
+        figure_module(1)
+
+@pytest.mark.parametrize("fig_number", FIGURE_NUMBERS)
+def test_render_every_figure_to_bytes(fig_number):
+    image = render(fig_number, dpi=20)
+    assert image.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
+
+def test_render_to_file(tmp_path):
+    path = render(7, tmp_path / "fig7.svg", dpi=20)
+    assert path == str(tmp_path / "fig7.svg")
+    assert (tmp_path / "fig7.svg").read_text().lstrip().startswith("<?xml")
+    assert render(7, tmp_path / "fig7.out", fmt="pdf", dpi=20)
+    assert (tmp_path / "fig7.out").read_bytes().startswith(b"%PDF")
+    assert plt.get_fignums() == []
+
+def test_shared_style_helpers():
+    fig, ax = plt.subplots()
+    figstyle.method_bars(ax, np.arange(2), [np.ones(2)] * 4, width=0.2)
+    assert len(ax.patches) == 8
+    assert [p.get_x() + p.get_width() / 2 for p in ax.patches[::2]] == pytest.approx(
+        [-0.3, -0.1, 0.1, 0.3])
+    figstyle.aes_sections(ax, [0, 1, 2, 3], label_y=1, arrow_y=0.9)
+    assert [t.get_text() for t in ax.texts if t.get_text()] == ['AES 1', 'AES 2', 'AES 3']
+    assert [h.get_label() for h in figstyle.legend_handles()] == figstyle.AES_LABELS
+    assert figstyle.method_color('Proposed') == figstyle.COLORS[3]
+    assert figstyle.method_color('Other', 1) == 'C5'
+    plt.close(fig)
@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import main
+
+MILP_DIR = Path(__file__).resolve().parent.parent
+
+@pytest.fixture(autouse=True)
+def in_milp_dir(monkeypatch):
+    # main.py resolves figN.py scripts relative to the working directory
+    monkeypatch.chdir(MILP_DIR)
+    monkeypatch.delenv("AES_RESULTS", raising=False)
+
+def test_available_scripts_and_numbers():
+    scripts = main.get_available_scripts()
+    assert scripts == [f"fig{i}.py" for i in range(2, 13)]
+    assert main.figure_number("fig12.py") == 12
+
+def test_script_inputs_finds_referenced_data(tmp_path):
+    (tmp_path / "data.csv").write_text("a\n1\n")
+    (tmp_path / "figstyle.py").write_text("")
+    script = tmp_path / "fig99.py"
+    script.write_text("load('data.csv'); load('absent.npy')\n")
+    assert main.script_inputs(script) == [str(tmp_path / "data.csv"),
+                                          str(tmp_path / "figstyle.py")]
+
+def test_figure_hash_tracks_inputs_and_settings(tmp_path):
+    script = tmp_path / "fig99.py"
+    data = tmp_path / "data.csv"
+    script.write_text("load('data.csv')\n")
+    data.write_text("1\n")
+    digest = main.figure_hash(str(script), "png", 150)
+    assert main.figure_hash(str(script), "png", 150) == digest
+    assert main.figure_hash(str(script), "svg", 150) != digest
+    assert main.figure_hash(str(script), "png", 72) != digest
+    data.write_text("2\n")
+    assert main.figure_hash(str(script), "png", 150) != digest
+
+def test_render_figure_reports_result(tmp_path):
+    main.init_render_worker()
+    result = main.render_figure("fig2.py", tmp_path, dpi=30)
+    assert result["success"] and result["error"] is None
+    assert result["outputs"] == [str(tmp_path / "fig2.png")]
+    assert Path(result["outputs"][0]).stat().st_size > 0
+    assert result["time"] > 0
+
+def test_render_figure_captures_errors(tmp_path):
+    result = main.render_figure("fig99.py", tmp_path)
+    assert not result["success"] and result["outputs"] == []
+    assert result["error"].startswith("ValueError")
+
+def test_run_batch_skips_unchanged_figures(tmp_path, capsys):
+    scripts = ["fig2.py", "fig4.py"]
+    assert main.run_batch(scripts, tmp_path, jobs=2, dpi=30) == (2, 0)
+    manifest = json.loads((tmp_path / main.MANIFEST).read_text())
+    assert sorted(manifest) == scripts
+    assert all(Path(path).exists() for entry in manifest.values() for path in entry["outputs"])
+    capsys.readouterr()
+
+    assert main.run_batch(scripts, tmp_path, dpi=30) == (2, 0)
+    assert "Rendering 0 figure(s)" in capsys.readouterr().out
+
+    # A missing output or a change of settings re-renders
+    os.remove(tmp_path / "fig4.png")
+    assert main.run_batch(scripts, tmp_path, jobs=1, dpi=30) == (2, 0)
+    out = capsys.readouterr().out
+    assert "Rendering 1 figure(s)" in out and "fig4.py rendered" in out
+    assert main.run_batch(scripts, tmp_path, jobs=1, dpi=30, force=True) == (2, 0)
+    assert "Rendering 2 figure(s)" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+import cvxpy as cp
+import numpy as np
+import pytest
+from scipy.sparse.linalg import spsolve
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import VoltageRegulator
+from network import LinDistFlow, load_feeder, synthetic_feeder
+
+def test_table_a1_feeder_is_radial():
+    feeder = load_feeder()
+    assert feeder.n_buses == 16 and feeder.n_branches == 15
+    A = feeder.incidence().toarray()
+    assert np.all(A.sum(axis=1) == 0)
+    assert np.linalg.matrix_rank(A[:, feeder.non_root]) == feeder.n_buses - 1
+
+@pytest.mark.parametrize("feeder", [load_feeder(), synthetic_feeder(40, seed=2)])
+def test_base_flows_satisfy_kcl(feeder):
+    rng = np.random.default_rng(0)
+    p, q = rng.random((feeder.n_buses, 3)), rng.random((feeder.n_buses, 3))
+    P, Q = feeder.base_flows(p, q)
+    A_T = feeder.incidence().T.toarray()
+    np.testing.assert_allclose(-A_T[feeder.non_root] @ P, p[feeder.non_root], atol=1e-12)
+    np.testing.assert_allclose(-A_T[feeder.non_root] @ Q, q[feeder.non_root], atol=1e-12)
+
+def test_constraints_reproduce_distflow_voltages():
+    network = LinDistFlow(load_feeder())
+    feeder = network.feeder
+    pv, load = daily_profiles(4)
+    port_kw = np.array([0.0, 100.0, 200.0, 0.0])
+    tap, Q_PV = cp.Variable(4), cp.Variable((network.n_pv, 4))
+    constraints, _, variables = network.constraints(tap, Q_PV, port_kw, pv, load)
+    problem = cp.Problem(cp.Minimize(cp.sum(cp.abs(tap))), constraints + [Q_PV == 0])
+    problem.solve(solver=cp.HIGHS)
+    assert problem.status == cp.OPTIMAL
+
+    # Reference: flows from KCL, voltages down the tree from the OLTC-set root
+    p, q = network.withdrawals(pv, load)
+    p[network.port_bus - 1] += port_kw / network.base_kva
+    P, Q = feeder.base_flows(p, q)
+    A = feeder.incidence().tocsc()
+    drop = (feeder.r[:, None] * P + feeder.x[:, None] * Q) / network.V_s
+    V_root = network.V_s + network.dV_T * tap.value
+    # V_from - V_to = drop on every branch, with the root voltage known
+    root_column = A[:, feeder.root].toarray()
+    V = np.tile(V_root, (feeder.n_buses, 1))
+    V[feeder.non_root] = spsolve(A[:, feeder.non_root].tocsc(),
+                                 drop - root_column * V_root).reshape(-1, 4)
+    np.testing.assert_allclose(variables['V'].value, V, atol=1e-6)
+    np.testing.assert_allclose(variables['P_branch'].value, P, atol=1e-6)
+
+def test_q_pv_limit():
+    network = LinDistFlow(load_feeder())
+    np.testing.assert_allclose(network.q_pv_limit([0.0, 0.6, 1.0]), [100.0, 80.0, 0.0])
+
+def test_regulator_keeps_voltages_in_limits():
+    fleet = synthetic_fleet(3)
+    pv, load = daily_profiles(24)
+    network = LinDistFlow(load_feeder())
+    regulator = VoltageRegulator(example_seaport(), network=network)
+    result = regulator.optimize_voltage_regulation(fleet_pairs(fleet), pv, load, fleet)
+    assert result['success']
+    assert result['V'].shape == (16, 24)
+    assert np.all(result['V'] >= network.V_min - 1e-6) and np.all(result['V'] <= network.V_max + 1e-6)
+    assert np.all(result['losses_kw'] >= 0)
+    assert np.sum(np.abs(np.diff(np.round(result['tap'])))) <= regulator.params.tap_max
@@ -0,0 +1,94 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from fleet_table import FIELDS, FleetTable
+from logic import AESParameters, example_fleet
+from packed import CHANNELS, PackedVoyages
+
+def voyage(T_a, hours, cost, **counters):
+    return {'success': True, 'T_a': T_a, 'SOC_a': 0.2, 'cost': cost,
+            **{name: np.full(hours, k + cost) for k, name in enumerate(CHANNELS)}, **counters}
+
+@pytest.fixture
+def results():
+    return {1: [voyage(10, 2, 100.0, nit=4, nfev=9), voyage(11, 3, 90.0)],
+            2: [voyage(12, 4, 120.0, num_iters=7)]}
+
+def write_row(packed, row, result):
+    packed.write(row, result)
+    packed.detach()
+
+def test_round_trip(results):
+    packed = PackedVoyages.from_results(results)
+    assert len(packed) == 3 and packed.arrays['profiles'].shape == (3, 3, 4)
+    assert list(packed.vessel_rows(1)) == [2]
+    unpacked = packed.to_results()
+    assert list(unpacked) == [1, 2]
+    for vessel_id, pairs in results.items():
+        for original, restored in zip(pairs, unpacked[vessel_id]):
+            assert set(restored) == set(original)
+            for name in CHANNELS:
+                assert np.array_equal(restored[name], original[name])
+            assert restored['cost'] == original['cost'] and restored['T_a'] == original['T_a']
+    # Profiles are views into the buffer
+    assert np.shares_memory(unpacked[2][0]['velocity_profile'], packed.arrays['profiles'])
+
+def test_invalid_rows_are_skipped_and_rows_sorted():
+    packed = PackedVoyages.allocate([(5, 3)], max_hours=2)
+    packed.write(0, voyage(12, 2, 1.0))
+    packed.write(1, None)
+    packed.write(2, voyage(11, 1, 2.0))
+    assert [pair['T_a'] for pair in packed.to_results()[5]] == [11, 12]
+    assert PackedVoyages.allocate([(5, 0)], 0).to_results() == {5: []}
+
+def test_private_buffer_pickles_its_arrays(results):
+    packed = pickle.loads(pickle.dumps(PackedVoyages.from_results(results)))
+    assert packed.shared is None and packed.to_results()[1][1]['cost'] == 90.0
+
+def test_shared_buffer_sees_worker_writes():
+    packed = PackedVoyages.allocate([(1, 20), (2, 10)], max_hours=48, shared=True)
+    try:
+        # Pickling sends the segment handle, not the arrays
+        assert len(pickle.dumps(packed)) < packed.nbytes / 10
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(write_row, packed, 25, voyage(9, 3, 50.0, nit=2)).result()
+        assert np.flatnonzero(packed.arrays['valid']).tolist() == [25]
+        copy = packed.copy()
+    finally:
+        packed.close()
+    assert packed.arrays == {}
+    results = copy.to_results()
+    assert results[1] == [] and [pair['cost'] for pair in results[2]] == [50.0]
+    assert results[2][0]['nit'] == 2 and 'nfev' not in results[2][0]
+    assert np.array_equal(results[2][0]['P_dis_profile'], np.full(3, 52.0))
+
+def test_fleet_table_from_tables():
+    fleet = FleetTable.from_tables()
+    assert len(fleet) == 4 and [aes.vessel_id for aes in fleet] == [1, 2, 3, 4]
+    aes = fleet[3]
+    assert isinstance(aes, AESParameters) and isinstance(aes.vessel_id, int)
+    assert (aes.P_DSG_max, aes.P_DSG_min, aes.E_ESS, aes.P_sv2, aes.vessel_type) == (
+        500, 170, 240, 30, 3)
+    large = FleetTable.from_tables(n_vessels=10, T_low=np.arange(10), beta_k=0.3)
+    assert [aes.P_DSG_max for aes in large][4:8] == [300, 400, 400, 500]
+    assert large.columns['T_low'].tolist() == list(range(10))
+    assert {aes.beta_k for aes in large} == {0.3}
+
+def test_fleet_table_round_trip_and_take():
+    fleet = example_fleet()
+    table = FleetTable.from_fleet(fleet)
+    assert table.to_fleet() == fleet
+    assert pickle.loads(pickle.dumps(table)).to_fleet() == fleet
+    assert table.take([1]).to_fleet() == fleet[1:2]
+    assert table.take(table.columns['vessel_id'] > 1).to_fleet() == fleet[1:]
+    assert table.nbytes == 8 * len(FIELDS) * len(fleet)
+
+def test_fleet_table_validates_columns():
+    columns = FleetTable.from_fleet(example_fleet()).columns
+    with pytest.raises(ValueError, match="missing"):
+        FleetTable({name: column for name, column in columns.items() if name != 'c0'})
+    with pytest.raises(ValueError, match="length"):
+        FleetTable({**columns, 'c0': columns['c0'][:1]})
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import CoordinatedOptimizer, VoltageRegulator, example_fleet, example_forecasts
+from persistent import PersistentRegulator
+
+@pytest.fixture
+def instance():
+    """(pairs, pv, load, fleet) of a four-vessel day"""
+    fleet = synthetic_fleet(4)
+    return (fleet_pairs(fleet), *daily_profiles(24), fleet)
+
+@pytest.fixture
+def persistent():
+    return PersistentRegulator(VoltageRegulator(example_seaport()))
+
+def check_objective(result, pairs, pv, load, fleet):
+    """Objective of ``result`` equals a fresh model's up to the solver's reported MIP gap"""
+    fresh = VoltageRegulator(example_seaport()).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    assert fresh['success']
+    gap = max(result['mip_gap'] or 0.0, fresh['mip_gap'] or 0.0)
+    assert result['objective_value'] == pytest.approx(fresh['objective_value'], rel=gap + 1e-6)
+
+def test_parameter_update_matches_fresh_model(instance, persistent):
+    pairs, pv, load, fleet = instance
+    first = persistent.optimize(pairs, pv, load, fleet)
+    assert first['success'] and first['timing']['rebuilt']
+    model = persistent.model
+    for scale in (1.1, 0.9):
+        result = persistent.optimize(pairs, pv, scale * load, fleet)
+        assert result['success'] and not result['timing']['rebuilt']
+        assert persistent.model is model
+        check_objective(result, pairs, pv, scale * load, fleet)
+    assert [timing['rebuilt'] for timing in persistent.history] == [True, False, False]
+
+def test_fewer_pairs_reuse_padded_slots(instance, persistent):
+    pairs, pv, load, fleet = instance
+    persistent.optimize(pairs, pv, load, fleet)
+    shrunk = {**pairs, 2: pairs[2][:1]}
+    result = persistent.optimize(shrunk, pv, load, fleet)
+    assert result['success'] and not result['timing']['rebuilt']
+    # Padding slots are never selected and are cut from the selection
+    assert len(result['vessel_selection'][2]) == 1
+    assert np.round(result['vessel_selection'][2]).sum() == 1
+    check_objective(result, shrunk, pv, load, fleet)
+
+def test_layout_changes_rebuild(instance, persistent):
+    pairs, pv, load, fleet = instance
+    persistent.optimize(pairs, pv, load, fleet)
+    grown = {**pairs, 0: pairs[0] + [dict(pairs[0][0], T_a=pairs[0][0]['T_a'] + 1)]}
+    assert persistent.optimize(grown, pv, load, fleet)['timing']['rebuilt']
+    assert persistent.optimize({k: pairs[k] for k in (0, 1, 2)}, pv, load,
+                               fleet[:3])['timing']['rebuilt']
+    pv_long, load_long = daily_profiles(30)
+    assert persistent.optimize({k: pairs[k] for k in (0, 1, 2)}, pv_long, load_long,
+                               fleet[:3])['timing']['rebuilt']
+
+def test_spare_slots_absorb_growth(instance):
+    pairs, pv, load, fleet = instance
+    persistent = PersistentRegulator(VoltageRegulator(example_seaport()), slots=5)
+    persistent.optimize(pairs, pv, load, fleet)
+    grown = {**pairs, 0: pairs[0] + [dict(pairs[0][0], T_a=pairs[0][0]['T_a'] + 1)]}
+    result = persistent.optimize(grown, pv, load, fleet)
+    assert not result['timing']['rebuilt'] and len(result['vessel_selection'][0]) == 4
+
+def test_resolves_are_warm_started(instance, persistent, monkeypatch):
+    pairs, pv, load, fleet = instance
+    regulator = persistent.regulator
+    calls = []
+    solve_model = regulator.solve_model
+
+    def recording(model, build_time=0.0, warm_start=False):
+        calls.append(warm_start)
+        return solve_model(model, build_time, warm_start)
+    monkeypatch.setattr(regulator, 'solve_model', recording)
+    persistent.optimize(pairs, pv, load, fleet)
+    persistent.optimize(pairs, pv, 1.1 * load, fleet)
+    assert calls == [False, True]
+
+def test_coordinated_optimizer_reuses_the_model():
+    pv_forecast, load_forecast = example_forecasts()
+    wind = np.zeros((10, 10), dtype=int)
+    optimizer = CoordinatedOptimizer(example_fleet(), example_seaport(), persistent_model=True,
+                                     verbose=False)
+    plain = CoordinatedOptimizer(example_fleet(), example_seaport(), verbose=False)
+    expected = plain.run_coordinated_optimization(wind, pv_forecast, load_forecast)
+    for _ in range(2):
+        result = optimizer.run_coordinated_optimization(wind, pv_forecast, load_forecast)
+        # Warm-started solves may stop anywhere inside HiGHS's relative MIP gap (1e-4)
+        assert result['summary']['total_operation_cost'] == pytest.approx(
+            expected['summary']['total_operation_cost'], rel=1e-4)
+    assert [t['rebuilt'] for t in optimizer.persistent_regulator.history] == [True, False]
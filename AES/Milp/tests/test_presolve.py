@@ -0,0 +1,93 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import (CoordinatedOptimizer, HorizonState, VoltageRegulator, example_fleet,
+                   example_forecasts)
+from rolling_horizon import RollingHorizonRegulator
+
+@pytest.fixture
+def instance():
+    """(pairs, pv, load, fleet) of a day where vessels 1 and 4 are identical"""
+    fleet = synthetic_fleet(4)
+    pairs = fleet_pairs(fleet)
+    fleet.append(dataclasses.replace(fleet[1], vessel_id=4))
+    pairs[4] = [dict(pair) for pair in pairs[1]]
+    return (pairs, *daily_profiles(24), fleet)
+
+def test_symmetry_classes(instance):
+    pairs, _, _, fleet = instance
+    regulator = VoltageRegulator(example_seaport())
+    # Berths 0 and 1 have the same Table III service times
+    assert regulator.symmetry_classes(pairs, fleet) == ([[0, 1]], [[1, 4]])
+    pairs[4][0]['cost'] += 1.0
+    assert regulator.symmetry_classes(pairs, fleet) == ([[0, 1]], [])
+
+def test_uncommitted_classes():
+    state = HorizonState(berth={11: 1}, served={11: 2}, charged={12: 5.0})
+    berths, vessels = VoltageRegulator._uncommitted_classes(
+        [[0, 1, 2]], [[0, 1, 3], [2, 4]], [10, 11, 12, 13, 14], state)
+    assert berths == [[0, 2]] and vessels == [[0, 3]]
+
+def test_presolve_keeps_the_optimum(instance):
+    pairs, pv, load, fleet = instance
+    plain = VoltageRegulator(example_seaport()).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    result = VoltageRegulator(example_seaport(), presolve=True).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    assert plain['success'] and result['success'] and 'presolve' not in plain
+    gap = max(plain['mip_gap'] or 0.0, result['mip_gap'] or 0.0)
+    assert result['objective_value'] == pytest.approx(plain['objective_value'], rel=gap + 1e-6)
+
+    report = result['presolve']
+    assert report['enabled'] and 'reason' not in report
+    assert report['cells'] < report['dense_cells'] == 3 * 5 * 24
+    assert report['berth_classes'] == [[0, 1]] and report['vessel_classes'] == [[1, 4]]
+    assert report['ordering_constraints'] > 0 and report['time'] >= 0
+    # The selected pair positions of identical vessels are ordered
+    positions = [int(np.argmax(result['vessel_selection'][k])) for k in (1, 4)]
+    assert positions == sorted(positions)
+
+def test_late_pairs_are_fixed(instance):
+    pairs, pv, load, fleet = instance
+    # No berth can serve a vessel arriving at the end of the horizon
+    late = {**pairs, 0: pairs[0] + [dict(pairs[0][0], T_a=24)]}
+    regulator = VoltageRegulator(example_seaport(), presolve=True)
+    report = regulator.build_model(late, pv, load, fleet)['presolve']
+    assert report['fixed_pairs'] == 1
+    result = regulator.optimize_voltage_regulation(late, pv, load, fleet)
+    assert result['success'] and result['vessel_selection'][0][-1] < 0.5
+
+def test_parametric_model_reports_why_not(instance):
+    pairs, pv, load, fleet = instance
+    model = VoltageRegulator(example_seaport(), presolve=True).build_model(
+        pairs, pv, load, fleet, parametric=True)
+    assert model['presolve'] == {'enabled': False,
+                                 'reason': 'parametric model: pair data change between solves'}
+    assert model['grid'].windowed is False
+
+def test_rolling_windows_report_presolve(instance):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport(), presolve=True)
+    result = RollingHorizonRegulator(regulator, 12, 6, min_vessels=0).optimize(
+        pairs, pv, load, fleet)
+    assert result['success']
+    reports = result['presolve']
+    assert [(report['start'], report['end']) for report in reports] == [(0, 12), (6, 18),
+                                                                      (12, 24)]
+    for report in reports:
+        assert report['enabled'] and report['reason'].startswith('rolling window')
+        assert report['fixed_y'] == report['fixed_pairs'] == 0
+
+def test_coordinated_optimizer_passes_presolve():
+    pv_forecast, load_forecast = example_forecasts()
+    optimizer = CoordinatedOptimizer(example_fleet(), example_seaport(), presolve=True,
+                                     verbose=False)
+    assert optimizer.voltage_regulator.presolve
+    result = optimizer.run_coordinated_optimization(np.zeros((10, 10), dtype=int), pv_forecast,
+                                                    load_forecast)
+    assert result['success']
+    assert result['voltage_control']['presolve']['enabled']
+    assert result['summary']['total_operation_cost'] == pytest.approx(1533.44, abs=0.01)
@@ -0,0 +1,92 @@
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from logic import CoordinatedOptimizer, example_fleet, example_forecasts, example_seaport
+from profiling import Tracer, solver_counts
+
+def test_solver_counts_sums_fresh_solves():
+    results = [{'nit': 3, 'nfev': 10}, {'nit': 2, 'nfev': 5, 'njev': 1},
+               {'nit': 7, 'cached': True}, None,
+               {'simplex_iters': np.int64(40), 'mip_nodes': 2}]
+    assert solver_counts(results) == {'solves': 3, 'cached': 1, 'nit': 5, 'nfev': 15,
+                                      'njev': 1, 'simplex_iters': 40, 'mip_nodes': 2}
+    assert solver_counts([]) == {}
+
+def test_spans_nest_with_unique_ids(tmp_path):
+    with Tracer(tmp_path / "trace.jsonl") as tracer:
+        with tracer.step('solve', size=1) as outer:
+            with tracer.step('solve') as inner:
+                inner['nit'] = 4
+            with tracer.step('solve'):
+                pass
+            outer['nit'] = 1
+    events = {event['id']: event for event in tracer.events}
+    assert len(events) == 3
+    outer_id = next(i for i, e in events.items() if e['parent'] is None)
+    assert events[outer_id]['size'] == 1 and events[outer_id]['nit'] == 1
+    assert sorted(e['parent'] for e in events.values() if e['id'] != outer_id) == [outer_id] * 2
+    assert all(e['wall'] >= 0 and e['cpu'] >= 0 for e in events.values())
+    lines = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [line['id'] for line in lines] == [e['id'] for e in tracer.events]
+    summary = tracer.summary().splitlines()
+    assert summary[1].startswith('solve') and summary[2].startswith('  solve')
+
+def test_errors_are_recorded_and_reraised():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.step('failing'):
+            raise ValueError("bad input")
+    assert tracer.events[0]['error'] == "ValueError: bad input"
+
+def test_memory_tracking_is_opt_in():
+    tracer = Tracer()
+    with tracer.step('plain'):
+        pass
+    assert 'peak_mb' not in tracer.events[0]
+    assert not tracemalloc.is_tracing()
+
+    with Tracer(memory=True) as tracer:
+        with tracer.step('outer'):
+            with tracer.step('inner'):
+                buffer = np.ones(2**20)  # 8 MB
+                del buffer
+    assert not tracemalloc.is_tracing()
+    inner, outer = tracer.events
+    assert inner['peak_mb'] >= 7.9 and inner['delta_mb'] < 1
+    # The parent's peak covers its children
+    assert outer['peak_mb'] >= inner['peak_mb']
+
+def test_chrome_trace_and_profile(tmp_path):
+    with Tracer(tmp_path / "trace.jsonl", chrome_path=tmp_path / "trace.json",
+                profile_step='hot') as tracer:
+        with tracer.step('hot'):
+            sum(i * i for i in range(10000))
+        with tracer.step('cold'):
+            time.sleep(0.01)
+    chrome = json.loads((tmp_path / "trace.json").read_text())
+    assert [event['name'] for event in chrome['traceEvents']] == ['hot', 'cold']
+    assert chrome['traceEvents'][1]['dur'] >= 1e4
+    hot, cold = tracer.events
+    assert 'profile' not in cold
+    assert (tmp_path / "trace.hot.prof").is_file() and hot['profile']['top']
+
+def test_coordinated_run_records_every_step(tmp_path):
+    pv_forecast, load_forecast = example_forecasts()
+    with Tracer(tmp_path / "trace.jsonl") as tracer:
+        optimizer = CoordinatedOptimizer(example_fleet(), example_seaport(), tracer=tracer,
+                                         verbose=False)
+        result = optimizer.run_coordinated_optimization(np.zeros((10, 10), dtype=int),
+                                                        pv_forecast, load_forecast)
+    assert result['success']
+    steps = {event['step']: event for event in result['trace']}
+    assert set(steps) == {'algorithm1', 'route_planning', 'voyage_scheduling', 'si_filter',
+                          'voltage_regulation', 'finalize'}
+    root = steps['algorithm1']
+    assert root['parent'] is None and root['success']
+    assert all(e['parent'] == root['id'] for name, e in steps.items() if name != 'algorithm1')
+    assert steps['voyage_scheduling']['solves'] > 0 and steps['voyage_scheduling']['nit'] > 0
+    assert steps['voltage_regulation']['solves'] == 1
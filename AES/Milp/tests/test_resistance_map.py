@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from logic import BEAUFORT_RESISTANCE, RouteOptimizer
+
+def reference_map(wind, grid_size):
+    """Per-cell lookup of the original generate_resistance_map"""
+    scale = dict(enumerate(BEAUFORT_RESISTANCE))
+    out = np.zeros(grid_size)
+    for i in range(grid_size[0]):
+        for j in range(grid_size[1]):
+            out[i, j] = scale[min(int(wind[i, j]), 6)]
+    return out
+
+def test_matches_per_cell_lookup():
+    wind = np.random.default_rng(0).uniform(0, 9, size=(12, 15))
+    optimizer = RouteOptimizer(grid_size=(12, 15))
+    np.testing.assert_array_equal(optimizer.generate_resistance_map(wind),
+                                  reference_map(wind, (12, 15)))
+
+def test_chunked_into_preallocated_output():
+    wind = np.random.default_rng(1).integers(0, 8, size=(20, 10))
+    optimizer = RouteOptimizer(grid_size=(20, 10))
+    out = np.full((20, 10), -1.0, dtype=np.float32)
+    result = optimizer.generate_resistance_map(wind, chunk_rows=3, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, reference_map(wind, (20, 10)), rtol=1e-6)
+
+@pytest.mark.parametrize("bad", [np.nan, np.inf, -1.0])
+def test_rejects_invalid_wind(bad):
+    wind = np.zeros((10, 10))
+    wind[3, 4] = bad
+    with pytest.raises(ValueError):
+        RouteOptimizer().generate_resistance_map(wind)
@@ -0,0 +1,92 @@
+import cvxpy as cp
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_aes, example_seaport, fleet_pairs, synthetic_fleet
+from logic import BerthGrid, VoltageRegulator, VoyageScheduler
+
+@pytest.fixture
+def instance():
+    """(pairs, pv, load, fleet) of a four-vessel day"""
+    fleet = synthetic_fleet(4)
+    return (fleet_pairs(fleet), *daily_profiles(24), fleet)
+
+def test_berth_grid_layouts_aggregate_alike():
+    n_berths, n_vessels, n_hours = 2, 3, 6
+    rng = np.random.default_rng(0)
+    windows = np.column_stack([rng.integers(0, 3, 6), rng.integers(2, 7, 6)])
+    dense = BerthGrid(n_berths, n_vessels, n_hours)
+    windowed = BerthGrid(n_berths, n_vessels, n_hours, windows)
+    values = rng.random((6, n_hours))
+    inside = np.arange(n_hours) >= windows[:, :1]
+    inside &= np.arange(n_hours) < windows[:, 1:]
+    values[~inside] = 0
+    assert windowed.size == inside.sum() < dense.size
+    x, y = cp.Constant(values), cp.Constant(windowed.gather(values))
+    assert np.array_equal(windowed.scatter(windowed.gather(values)), values)
+    for name in ('per_step', 'per_row', 'per_berth', 'per_vessel'):
+        assert np.allclose(getattr(dense, name)(x).value, getattr(windowed, name)(y).value)
+    assert np.allclose(windowed.scatter(windowed.broadcast_rows(cp.Constant(np.arange(6.0))).value),
+                       np.where(inside, np.arange(6.0)[:, None], 0))
+
+def test_service_steps_round_up():
+    seaport = example_seaport()
+    seaport.berth_times = {0: [1.5, 4, 6], 1: [0.25, 2, 3]}
+    assert VoltageRegulator(seaport).service_steps(0, 1) == 2
+    assert VoltageRegulator(seaport, steps_per_hour=4).service_steps(0, 1) == 6
+    assert VoltageRegulator(seaport, steps_per_hour=4).service_steps(1, 1) == 1
+    assert VoltageRegulator(seaport, steps_per_hour=12).service_steps(1, 3) == 36
+
+def test_berth_windows():
+    aes = example_aes(vessel_id=1)
+    pairs = {1: [{'T_a': 10, 'SOC_a': 0.8, 'cost': 1.0}, {'T_a': 12, 'SOC_a': 0.85, 'cost': 2.0}]}
+    regulator = VoltageRegulator(example_seaport(), max_wait=1)
+    # Type 1 stays 2, 2 and 1 steps; charging 0.1 * E_ESS needs one step
+    assert regulator.berth_windows(pairs, 24, [aes]).tolist() == [[10, 15], [10, 15], [10, 14]]
+    assert regulator.berth_windows(pairs, 11, [aes]).tolist() == [[10, 10], [10, 10], [10, 11]]
+    assert regulator.berth_windows(pairs, 24).tolist() == [[10, 24]] * 3
+    regulator.max_wait = None
+    assert regulator.berth_windows(pairs, 24, [aes]).tolist() == [[10, 24]] * 3
+
+def test_windowed_model_matches_dense(instance):
+    pairs, pv, load, fleet = instance
+    dense = VoltageRegulator(example_seaport()).optimize_voltage_regulation(pairs, pv, load, fleet)
+    sizes = []
+    for max_wait in (24, 2):
+        regulator = VoltageRegulator(example_seaport(), max_wait=max_wait)
+        sizes.append(regulator.build_model(pairs, pv, load, fleet)['grid'].size)
+        result = regulator.optimize_voltage_regulation(pairs, pv, load, fleet)
+        assert result['success'] and result['omega'].shape == dense['omega'].shape
+        assert result['objective_value'] == pytest.approx(dense['objective_value'], rel=1e-6)
+    assert sizes[1] < sizes[0] < 3 * 4 * 24
+    # A tight window only removes options
+    tight = VoltageRegulator(example_seaport(), max_wait=0).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    assert tight['objective_value'] >= dense['objective_value'] - 1e-6
+
+def test_sub_hourly_berth_plan(instance):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport(), steps_per_hour=2, max_wait=2)
+    half_hourly = {k: [{**pair, 'T_a': 2 * pair['T_a']} for pair in vessel_pairs]
+                   for k, vessel_pairs in pairs.items()}
+    result = regulator.optimize_voltage_regulation(half_hourly, np.repeat(pv, 2),
+                                                   np.repeat(load, 2), fleet)
+    assert result['success'] and result['omega'].shape == (3, 4, 48)
+    omega = np.round(result['omega'])
+    for k, aes in enumerate(fleet):
+        berth = int(np.argmax(omega[:, k].sum(axis=1)))
+        assert omega[berth, k].sum() >= regulator.service_steps(berth, aes.vessel_type)
+
+def test_voyage_cost_is_resolution_independent():
+    aes = example_aes(P_dis_min=0)
+    hourly = VoyageScheduler(aes, d_route=56.0).optimize_voyage(12, [0.2] * 4)
+    for steps_per_hour in (2, 4):
+        scheduler = VoyageScheduler(aes, d_route=56.0, steps_per_hour=steps_per_hour)
+        assert scheduler.start_step == 8 * steps_per_hour
+        voyage = scheduler.optimize_voyage(12 * steps_per_hour, [0.2] * 4)
+        assert voyage['T_a'] == 12 * steps_per_hour
+        assert len(voyage['velocity_profile']) == 4 * steps_per_hour
+        assert voyage['cost'] == pytest.approx(hourly['cost'], rel=1e-6)
+        # Distance is velocity times the step length
+        assert np.sum(voyage['velocity_profile']) / steps_per_hour == pytest.approx(56.0,
+                                                                                    rel=1e-4)
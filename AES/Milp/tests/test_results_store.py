@@ -0,0 +1,119 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import figstyle
+from figures import figure_module
+from logic import CoordinatedOptimizer, example_fleet, example_forecasts, example_seaport
+from results_store import INDEX, ResultsStore
+
+def run(store, method, steps_per_hour=1):
+    pv_forecast, load_forecast = example_forecasts()
+    optimizer = CoordinatedOptimizer(example_fleet(), example_seaport(), store=store,
+                                     method=method, steps_per_hour=steps_per_hour, verbose=False)
+    result = optimizer.run_coordinated_optimization(
+        np.zeros((10, 10), dtype=int), np.repeat(pv_forecast, steps_per_hour),
+        np.repeat(load_forecast, steps_per_hour))
+    assert result['success']
+    return result
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    store = ResultsStore(tmp_path_factory.mktemp("results"))
+    store.results = {'Proposed': run(store, 'Proposed'),
+                     'Half-hourly': run(store, 'Half-hourly', 2)}
+    return store
+
+def test_columns_match_the_run(store):
+    assert store.methods() == ['Proposed', 'Half-hourly']
+    assert 'Proposed' in store and 'Method #1' not in store
+    results = store.load('Proposed')
+    strategies = store.results['Proposed']['vessel_strategies']
+    assert results.vessel_ids == list(strategies)
+    assert results.steps_per_hour == 1
+    for vessel_id, strategy in strategies.items():
+        hours, velocity = results.profile('velocity_profile', vessel_id)
+        assert isinstance(velocity, np.memmap)
+        assert np.allclose(velocity, strategy['velocity_profile'])
+        assert hours[-1] == strategy['T_a'] - 1 and len(hours) == len(velocity)
+        pairs = results.pairs(vessel_id)
+        assert len(set(len(column) for column in pairs.values())) == 1
+        assert strategy['T_a'] in pairs['T_a']
+    voltage = store.results['Proposed']['voltage_control']
+    assert np.allclose(results['tap'], voltage['tap'])
+    assert 'V' not in results
+    with pytest.raises(KeyError):
+        results['V']
+    with pytest.raises(KeyError):
+        results.profile('velocity_profile', 99)
+    with pytest.raises(KeyError):
+        store.load('Method #1')
+
+def test_profile_hours_use_the_run_resolution(store):
+    results = store.load('Half-hourly')
+    assert results.steps_per_hour == 2
+    vessel_id = results.vessel_ids[0]
+    hours, values = results.profile('P_DSG_profile', vessel_id)
+    assert np.allclose(np.diff(hours), 0.5)
+    assert hours[-1] + 0.5 == results['T_a'][0] / 2
+
+def test_voyage_sections_align_mixed_resolutions(store):
+    methods = figstyle.stored_methods(store)
+    sections = figstyle.voyage_sections(methods, 'velocity_profile')
+    assert list(sections) == store.load('Proposed').vessel_ids
+    for vessel_id, (hours, series) in sections.items():
+        assert np.allclose(np.diff(hours), 0.5)
+        assert all(len(values) == len(hours) for values in series)
+        # The hourly run holds each value over two half-hour steps
+        hourly = methods['Proposed'].profile('velocity_profile', vessel_id)[1]
+        start = int(np.flatnonzero(series[0])[0])
+        assert np.allclose(series[0][start:start + 2 * len(hourly)], np.repeat(hourly, 2))
+
+def test_rewrite_replaces_the_method_directory(tmp_path):
+    store = ResultsStore(tmp_path)
+    run(store, 'Proposed')
+    old = store.load('Proposed')
+    velocity = old['velocity_profile']
+    run(store, 'Proposed')
+    new = store.load('Proposed')
+    assert new.directory != old.directory and not old.directory.exists()
+    # Open memory maps of the replaced version stay readable
+    assert np.allclose(velocity, new['velocity_profile'])
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == [new.directory.name]
+
+def test_concurrent_writers_keep_every_method(tmp_path):
+    store = ResultsStore(tmp_path)
+    methods = [f"Method #{k}" for k in range(1, 4)]
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        list(pool.map(run, [store] * 3, methods))
+    assert sorted(store.methods()) == methods
+    assert (tmp_path / INDEX).is_file()
+
+def test_figures_plot_from_the_store(store, monkeypatch):
+    monkeypatch.setenv(figstyle.RESULTS_ENV, str(store.path))
+    assert figstyle.results_store().path == store.path
+    for fig_number in (3, 5, 6, 9):
+        fig = figure_module(fig_number).plot(store)
+        assert fig.axes
+        plt.close(fig)
+
+def test_dispatch_and_pairs_are_in_hours(store):
+    methods, hours, taps, q_pv, charging = figure_module(9).stored_dispatch(store)
+    assert methods == ['Proposed', 'Half-hourly']
+    assert np.allclose(np.diff(hours), 0.5)
+    assert all(len(values) == len(hours) for series in (taps, q_pv, charging) for values in series)
+    assert np.allclose(taps[0], np.repeat(store.load('Proposed')['tap'], 2)[:len(hours)])
+    times = figure_module(3).stored_pairs(store)[0]
+    assert times == [float(T_a) for T_a in sorted(set(store.load('Proposed')['pair_T_a']))]
+
+def test_empty_store_falls_back_to_paper_numbers(tmp_path, monkeypatch):
+    monkeypatch.setenv(figstyle.RESULTS_ENV, str(tmp_path))
+    assert figstyle.results_store() is None
+    monkeypatch.delenv(figstyle.RESULTS_ENV)
+    assert figstyle.results_store() is None
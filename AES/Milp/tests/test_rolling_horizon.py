@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import VoltageRegulator
+from rolling_horizon import RollingHorizonRegulator
+
+@pytest.fixture
+def instance():
+    fleet = synthetic_fleet(8)
+    return (fleet_pairs(fleet), *daily_profiles(24), fleet)
+
+def test_window_and_stride_are_validated():
+    regulator = VoltageRegulator(example_seaport())
+    with pytest.raises(ValueError):
+        RollingHorizonRegulator(regulator, window=4, stride=6)
+    with pytest.raises(ValueError):
+        RollingHorizonRegulator(regulator, window=4, stride=0)
+
+def test_rolling_plan_serves_every_vessel(instance):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport())
+    result = RollingHorizonRegulator(regulator, 12, 6, min_vessels=0).optimize(
+        pairs, pv, load, fleet)
+    monolithic = regulator.optimize_voltage_regulation(pairs, pv, load, fleet)
+    assert result['success'] and 'fallback' not in result and result['window_failures'] == []
+    assert [w['start'] for w in result['timing']['windows']] == [0, 6, 12]
+
+    omega = np.round(result['omega'])
+    assert np.all(omega.sum(axis=1) <= 1) and np.all(omega.sum(axis=0) <= 1)
+    assert np.sum(np.abs(np.diff(result['tap']))) <= regulator.params.tap_max
+    for k, aes in enumerate(fleet):
+        pair = pairs[aes.vessel_id][int(np.argmax(result['vessel_selection'][aes.vessel_id]))]
+        berths = np.flatnonzero(omega[:, k].any(axis=1))
+        assert len(berths) == 1 and not omega[:, k, :pair['T_a']].any()
+        assert omega[berths[0], k].sum() >= regulator.service_steps(berths[0], aes.vessel_type)
+        charged = regulator.eta_ch * result['P_ch'][:, k].sum()
+        assert charged >= aes.E_ESS * (regulator.SOC_target - pair['SOC_a']) - 1e-4
+    # Committing early can only cost more than planning the whole day at once
+    assert result['objective_value'] >= monolithic['objective_value'] - 1e-6
+
+def test_small_fleets_solve_monolithically(instance):
+    pairs, pv, load, fleet = instance
+    fleet = fleet[:4]
+    pairs = {aes.vessel_id: pairs[aes.vessel_id] for aes in fleet}
+    regulator = VoltageRegulator(example_seaport())
+    result = RollingHorizonRegulator(regulator, 12, 6).optimize(pairs, pv, load, fleet)
+    assert result['rolling'] is False
+    assert result['objective_value'] == pytest.approx(
+        regulator.optimize_voltage_regulation(pairs, pv, load, fleet)['objective_value'])
+
+def test_failed_windows_are_reported(instance, monkeypatch, capsys):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport())
+    solve_model = regulator.solve_model
+
+    def failing(model, build_time=0.0, warm_start=False):
+        if model['shape'][2] < 24:
+            return {'success': False, 'status': 'infeasible', 'timing': {'build': build_time}}
+        return solve_model(model, build_time, warm_start)
+    monkeypatch.setattr(regulator, 'solve_model', failing)
+    result = RollingHorizonRegulator(regulator, 12, 6, min_vessels=0).optimize(
+        pairs, pv, load, fleet)
+    # The first window fails, is extended to the horizon end and then solves
+    assert result['success'] and 'fallback' not in result
+    assert result['window_failures'] == [{'start': 0, 'end': 12, 'cause': 'infeasible',
+                                          'n_vessels': 5}]
+    assert "window 0-12 (5 vessels) failed: infeasible" in capsys.readouterr().out
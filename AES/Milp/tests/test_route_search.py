@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+import pytest
+
+from logic import (DEFAULT_RESISTANCE_PROFILE, CoordinatedOptimizer, RouteOptimizer,
+                   example_fleet, example_seaport)
+from route_search import (SEARCH_ENGINES, IncrementalRouter, RouteService, distance_field,
+                          path_length, register_search_engine, search)
+
+def random_map(seed, shape=(15, 15)):
+    return np.random.default_rng(seed).uniform(0.05, 0.4, size=shape)
+
+def path_cost(resistance_map, path, diagonal_weighting):
+    """Cost of walking a path: resistance of every entered cell, sqrt(2) on diagonals"""
+    cost = 0.0
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        assert max(abs(r1 - r0), abs(c1 - c0)) == 1
+        diagonal = r1 != r0 and c1 != c0
+        cost += resistance_map[r1, c1] * (math.sqrt(2) if diagonal and diagonal_weighting else 1)
+    return cost
+
+@pytest.mark.parametrize("engine", ["astar", "bidirectional"])
+@pytest.mark.parametrize("diagonal_weighting", [False, True])
+def test_engines_match_dijkstra(engine, diagonal_weighting):
+    for seed in range(5):
+        resistance_map = random_map(seed)
+        start, end = (0, seed), (14, 14 - seed)
+        reference = search(resistance_map, start, end, "dijkstra", diagonal_weighting)
+        result = search(resistance_map, start, end, engine, diagonal_weighting)
+        assert result.cost == pytest.approx(reference.cost)
+        assert result.path[0] == start and result.path[-1] == end
+        assert path_cost(resistance_map, result.path, diagonal_weighting) == pytest.approx(result.cost)
+
+def test_astar_expands_no_more_than_dijkstra():
+    resistance_map = random_map(7, (30, 30))
+    dijkstra = search(resistance_map, (0, 0), (29, 29), "dijkstra")
+    astar = search(resistance_map, (0, 0), (29, 29), "astar")
+    assert astar.expanded <= dijkstra.expanded
+
+def test_route_optimizer_uses_configured_engine():
+    resistance_map = random_map(3)
+    optimizer = RouteOptimizer(grid_size=(15, 15), search_engine="bidirectional")
+    path, cost = optimizer.dijkstra_route_planning(resistance_map, (0, 0), (14, 14))
+    assert optimizer.last_search.engine == "bidirectional"
+    assert cost == pytest.approx(search(resistance_map, (0, 0), (14, 14)).cost)
+    assert path == optimizer.last_search.path
+
+def test_unknown_and_registered_engines():
+    with pytest.raises(ValueError):
+        search(random_map(0), (0, 0), (1, 1), engine="nope")
+    register_search_engine("custom", SEARCH_ENGINES["dijkstra"])
+    try:
+        assert search(random_map(0), (0, 0), (5, 5), engine="custom").cost == pytest.approx(
+            search(random_map(0), (0, 0), (5, 5)).cost)
+    finally:
+        del SEARCH_ENGINES["custom"]
+
+def test_distance_field_matches_point_searches():
+    resistance_map = random_map(11)
+    field = distance_field(resistance_map, (2, 3))
+    for destination in [(0, 0), (14, 14), (7, 1), (2, 3)]:
+        assert field.cost_to(destination) == pytest.approx(
+            search(resistance_map, (2, 3), destination).cost)
+        path = field.path_to(destination)
+        assert path[0] == (2, 3) and path[-1] == destination
+        assert path_cost(resistance_map, path, False) == pytest.approx(field.cost_to(destination))
+
+def test_route_service_caches_one_field_per_origin():
+    service = RouteService(max_fields=2)
+    with pytest.raises(RuntimeError):
+        service.route((0, 0), (1, 1))
+    resistance_map = random_map(12)
+    service.set_resistance_map(resistance_map)
+    routes = service.routes({1: ((0, 0), (14, 14)), 2: ((0, 0), (5, 9)), 3: ((3, 3), (0, 14))})
+    assert service.stats() == {'hits': 1, 'misses': 2, 'cached_fields': 2}
+    assert routes[2][1] == pytest.approx(search(resistance_map, (0, 0), (5, 9)).cost)
+
+    # The same snapshot keeps the fields; a new one drops them
+    service.set_resistance_map(resistance_map.copy())
+    assert service.stats()['cached_fields'] == 2
+    service.set_resistance_map(resistance_map * 2)
+    assert service.stats()['cached_fields'] == 0
+    assert service.route((0, 0), (5, 9))[1] == pytest.approx(2 * routes[2][1])
+
+    # LRU eviction beyond max_fields
+    for origin in [(1, 1), (2, 2), (4, 4)]:
+        service.field(origin)
+    assert service.stats()['cached_fields'] == 2
+
+def test_path_length_counts_diagonals():
+    assert path_length([(0, 0), (0, 1), (1, 2)]) == pytest.approx(1 + math.sqrt(2))
+    assert path_length([(0, 0)]) == 0.0
+
+def test_voyage_inputs_scale_distance_by_route():
+    fleet = example_fleet()
+    optimizer = CoordinatedOptimizer(fleet, example_seaport(), verbose=False)
+    optimizer.route_service.set_resistance_map(np.full((10, 10), 0.2))
+    planned = optimizer.route_service.routes({1: ((0, 0), (9, 9)), 2: ((0, 0), (0, 9))})
+    distances, profiles = optimizer.voyage_inputs(planned, own_routes=(2,))
+    assert distances[1] == pytest.approx(optimizer.d_route)
+    assert distances[2] == pytest.approx(optimizer.d_route * 9 / (9 * math.sqrt(2)))
+    assert profiles[1] == DEFAULT_RESISTANCE_PROFILE
+    assert profiles[2] == [0.2] * (fleet[1].T_up - 8)
+
+@pytest.mark.parametrize("diagonal_weighting", [False, True])
+def test_incremental_router_matches_full_recompute(diagonal_weighting):
+    rng = np.random.default_rng(5)
+    resistance_map = random_map(5, (20, 20))
+    router = IncrementalRouter(resistance_map, (0, 0), diagonal_weighting)
+    for _ in range(5):
+        cells = rng.integers(0, 20, size=(6, 2))
+        resistance_map[cells[:, 0], cells[:, 1]] = rng.uniform(0.0, 0.6, size=6)
+        stats = router.update(cells, resistance_map[cells[:, 0], cells[:, 1]])
+        reference = distance_field(resistance_map, (0, 0), diagonal_weighting)
+        np.testing.assert_allclose(router.field.distances, reference.distances)
+        assert stats['expanded'] <= reference.expanded
+        path, cost = router.route((19, 12))
+        assert path_cost(resistance_map, path, diagonal_weighting) == pytest.approx(cost)
+
+def test_update_map_from_wind_forecast_diff():
+    optimizer = RouteOptimizer(grid_size=(12, 12))
+    wind = np.random.default_rng(8).integers(0, 7, size=(12, 12))
+    resistance_map = optimizer.generate_resistance_map(wind)
+    router = IncrementalRouter(resistance_map, (6, 6))
+
+    wind[2:4, 8:11] = 6
+    cells, values = optimizer.resistance_diff(resistance_map, wind)
+    new_map = optimizer.generate_resistance_map(wind)
+    assert len(cells) == np.count_nonzero(new_map != resistance_map)
+    router.update(cells, values)
+    np.testing.assert_allclose(router.field.distances,
+                               distance_field(new_map, (6, 6)).distances)
+
+    wind[:] = 1
+    router.update_map(optimizer.generate_resistance_map(wind))
+    np.testing.assert_allclose(router.field.distances,
+                               distance_field(optimizer.generate_resistance_map(wind),
+                                              (6, 6)).distances)
@@ -0,0 +1,80 @@
+import asyncio
+import dataclasses
+
+import numpy as np
+import pytest
+
+from logic import CoordinatedOptimizer, example_fleet, example_forecasts, example_seaport
+from service import ForecastUpdate, NewVessel, ReoptimizationService, VesselDelay
+
+def make_service(**kwargs):
+    pv_forecast, load_forecast = example_forecasts()
+    optimizer = CoordinatedOptimizer(example_fleet(), example_seaport())
+    return ReoptimizationService(optimizer, pv_forecast, load_forecast, **kwargs)
+
+def replay(service, events):
+    """Queue ``events`` and stop(), run the service; returns the published plans"""
+    async def main():
+        plans = service.subscribe()
+        for event in events:
+            await service.submit(event)
+        await service.stop()
+        await service.run()
+        return [plans.get_nowait() for _ in range(plans.qsize())]
+    return asyncio.run(main())
+
+def test_apply_reports_affected_vessels(capsys):
+    service = make_service()
+    fleet = service.optimizer.aes_fleet
+    assert service.apply(ForecastUpdate(pv_forecast=np.zeros(25))) == (set(), False)
+    assert not service.pv_forecast.any()
+    assert service.apply(ForecastUpdate(resistance_profile=[0.3] * 4)) == ({1, 2}, False)
+    assert service.apply(ForecastUpdate(wind_conditions=np.ones((10, 10)))) == (set(), True)
+
+    T_low, T_up = fleet[1].T_low, fleet[1].T_up
+    assert service.apply(VesselDelay(vessel_id=2, hours=-1)) == ({2}, False)
+    assert (fleet[1].T_low, fleet[1].T_up) == (T_low - 1, T_up - 1)
+    assert service.apply(VesselDelay(vessel_id=9, hours=1)) == (set(), False)
+    assert "unknown AES 9" in capsys.readouterr().out
+
+    newcomer = dataclasses.replace(fleet[0], vessel_id=3)
+    assert service.apply(NewVessel(newcomer)) == ({3}, False)
+    assert service.apply(NewVessel(dataclasses.replace(newcomer, beta_k=0.9))) == ({3}, False)
+    assert [aes.vessel_id for aes in fleet] == [1, 2, 3] and fleet[2].beta_k == 0.9
+    with pytest.raises(TypeError):
+        service.apply("not an event")
+
+def test_burst_is_coalesced_into_one_plan(capsys):
+    service = make_service(coalesce=1.0)
+    _, load_forecast = example_forecasts()
+    plans = replay(service, [ForecastUpdate(load_forecast=1.1 * load_forecast),
+                             ForecastUpdate(pv_forecast=np.zeros(25))])
+    assert [plan['version'] for plan in plans] == [0, 1]
+    assert plans[0]['affected'] == [1, 2] and plans[0]['events'] == 0
+    # Port-side updates re-run Steps 4-6 only
+    assert plans[1]['events'] == 2 and plans[1]['affected'] == []
+    assert all(plan['result']['success'] for plan in plans)
+    assert all(plan['latency']['total'] >= plan['latency']['port'] for plan in plans)
+    assert service.latest is plans[-1]
+    # verbose=False keeps the optimizer's step banners out of the output
+    assert "Step" not in capsys.readouterr().out
+
+def test_delay_matches_a_fresh_run():
+    service = make_service(coalesce=0.0)
+    plans = replay(service, [VesselDelay(vessel_id=2, hours=-1)])
+    assert plans[-1]['affected'] == [2]
+
+    fleet = example_fleet()
+    fleet[1] = dataclasses.replace(fleet[1], T_low=fleet[1].T_low - 1, T_up=fleet[1].T_up - 1)
+    pv_forecast, load_forecast = example_forecasts()
+    fresh = CoordinatedOptimizer(fleet, example_seaport(), verbose=False)
+    expected = fresh.run_coordinated_optimization(np.zeros((10, 10), dtype=int), pv_forecast,
+                                                  load_forecast)
+    assert plans[-1]['result']['summary']['total_operation_cost'] == pytest.approx(
+        expected['summary']['total_operation_cost'], rel=1e-6)
+
+def test_max_batch_splits_bursts():
+    service = make_service(coalesce=1.0, max_batch=2)
+    plans = replay(service, [ForecastUpdate(pv_forecast=np.full(25, x)) for x in (0.1, 0.2, 0.3)])
+    assert [plan['events'] for plan in plans] == [0, 2, 1]
+    assert np.allclose(service.pv_forecast, 0.3)
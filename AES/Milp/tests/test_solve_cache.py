@@ -0,0 +1,92 @@
+import dataclasses
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import DEFAULT_RESISTANCE_PROFILE, VoltageRegulator, VoyageScheduler, example_fleet
+from solve_cache import SolveCache, cache_hit, fingerprint
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolveCache(tmp_path / "cache.sqlite")
+    yield cache
+    cache.close()
+
+def test_fingerprint_is_content_based():
+    aes = example_fleet()[0]
+    assert fingerprint(aes, np.arange(3.0)) == fingerprint(example_fleet()[0], np.arange(3.0))
+    assert fingerprint(np.arange(3.0)) != fingerprint(np.arange(3))
+    assert fingerprint([1.0, 2.0]) != fingerprint(np.array([1.0, 2.0]))
+    assert fingerprint({'a': 1, 'b': 2}) == fingerprint({'b': 2, 'a': 1})
+    assert fingerprint(1) != fingerprint(1.0) != fingerprint(True)
+    with pytest.raises(TypeError):
+        fingerprint(object())
+
+def test_put_get_and_counters(cache):
+    assert cache.get("k") == (False, None)
+    cache.put("k", {'x': np.arange(3)})
+    cache.put("none", None)
+    hit, value = cache.get("k")
+    assert hit and np.array_equal(value['x'], np.arange(3))
+    assert cache.get("none") == (True, None)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 2)
+    cache.clear()
+    assert cache.stats()['entries'] == 0 and cache.stats()['hits'] == 0
+
+def test_expiry_and_lru_eviction(tmp_path):
+    cache = SolveCache(tmp_path / "small.sqlite", max_bytes=3000, max_age=0.05)
+    for key in "abc":
+        cache.put(key, b"x" * 1000)
+    # 'a' is the least recently used once 'b' and 'c' are read
+    cache.get("b"), cache.get("c")
+    cache.put("d", b"x" * 1000)
+    assert not cache.get("a")[0] and cache.get("d")[0]
+    time.sleep(0.1)
+    assert cache.get("d") == (False, None)
+    assert cache.stats()['evictions'] >= 2
+    cache.close()
+
+def test_cache_pickles_without_connection(cache):
+    cache.put("k", 1)
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.get("k") == (True, 1)
+    clone.close()
+
+def test_cache_hit_marks_timing():
+    result = cache_hit({'cost': 1.0, 'timing': {'total': 2.0}}, 0.001)
+    assert result['cached'] and result['timing'] == {'total': 0.001, 'cached': True,
+                                                     'solved': {'total': 2.0}}
+    assert cache_hit(None, 0.001) is None
+
+def test_voyage_results_are_cached(cache):
+    aes = example_fleet()[0]
+    first = VoyageScheduler(aes, cache=cache).optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE)
+    again = VoyageScheduler(aes, cache=cache).optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE)
+    assert again['cached'] and 'cached' not in first
+    assert again['cost'] == first['cost']
+    # SLSQP results depend on the start point
+    other = VoyageScheduler(aes, cache=cache).optimize_voyage(
+        10, DEFAULT_RESISTANCE_PROFILE, x0=np.concatenate([[15.0, 15.0], [100.0] * 2, [5.0] * 2]))
+    assert 'cached' not in other
+    # Port-side fields do not enter the voyage key
+    port_change = VoyageScheduler(dataclasses.replace(aes, beta_k=0.9), cache=cache)
+    assert port_change.optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE)['cached']
+
+def test_regulation_results_are_cached(cache):
+    fleet = synthetic_fleet(3)
+    pairs, (pv, load) = fleet_pairs(fleet), daily_profiles(24)
+    first = VoltageRegulator(example_seaport(), cache=cache).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    again = VoltageRegulator(example_seaport(), cache=cache).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    assert again['cached'] and again['objective_value'] == first['objective_value']
+    assert again['timing']['solved'] == first['timing']
+    # Options that change the model change the key
+    for options in ({'max_wait': 0.0}, {'steps_per_hour': 2}, {'presolve': True}):
+        result = VoltageRegulator(example_seaport(), cache=cache, **options
+                                  ).optimize_voltage_regulation(pairs, pv, load, fleet)
+        assert 'cached' not in result
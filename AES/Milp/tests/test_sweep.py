@@ -0,0 +1,60 @@
+import csv
+
+import pytest
+
+from sweep import COLUMNS, Scenario, open_sink, run_scenario, run_sweep, scenario_grid
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return sorted(csv.DictReader(f), key=lambda row: int(row['scenario_id']))
+
+def test_scenario_grid_is_lazy_product():
+    grid = scenario_grid(profiles=['example', 'cloudy'], beta_k=[0.3, 0.5], wind_seeds=[0, 1, 2])
+    assert iter(grid) is grid
+    scenarios = list(grid)
+    assert len(scenarios) == 12
+    assert [s.scenario_id for s in scenarios] == list(range(12))
+    assert scenarios[0] == Scenario(0, 'example', 'example', 0.3, 0, 10)
+    assert scenarios[-1] == Scenario(11, 'example', 'cloudy', 0.5, 2, 10)
+
+def test_run_scenario_row():
+    row = run_scenario(Scenario(0))
+    assert list(row) == COLUMNS
+    assert row['success'] and row['error'] is None
+    assert row['total_operation_cost'] == pytest.approx(1533.44, abs=0.01)
+    assert isinstance(row['n_vessels_optimized'], int)
+    assert row['route_resistance'] > 0 and row['time'] > 0
+
+def test_run_scenario_reports_failure(capsys):
+    row = run_scenario(Scenario(3, fleet='missing'))
+    assert not row['success']
+    assert row['error'].startswith('KeyError')
+    assert row['scenario_id'] == 3 and row['total_operation_cost'] is None
+    assert capsys.readouterr().out == ""
+
+def test_open_sink_rejects_unknown_suffix(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "out.json")
+
+def test_run_sweep_streams_rows(tmp_path):
+    scenarios = list(scenario_grid(beta_k=[None, 0.5])) + [Scenario(2, fleet='missing')]
+    output = tmp_path / "sweep.csv"
+    summary = run_sweep(iter(scenarios), output, verbose=False)
+    assert summary['n_scenarios'] == 3 and summary['n_failed'] == 1
+    rows = read_rows(output)
+    assert [row['scenario_id'] for row in rows] == ['0', '1', '2']
+    assert [row['success'] for row in rows] == ['True', 'True', 'False']
+    assert list(rows[0]) == COLUMNS
+
+def test_parallel_sweep_matches_serial_and_shares_cache(tmp_path):
+    scenarios = list(scenario_grid(profiles=['example', 'cloudy'], tap_max=[8, 10]))
+    serial = run_sweep(scenarios, tmp_path / "serial.csv", verbose=False)
+    parallel = run_sweep(scenarios, tmp_path / "parallel.csv", n_workers=2, max_pending=2,
+                         cache_path=tmp_path / "cache.sqlite", verbose=False)
+    assert serial['n_scenarios'] == parallel['n_scenarios'] == 4
+    for a, b in zip(read_rows(tmp_path / "serial.csv"), read_rows(tmp_path / "parallel.csv")):
+        assert a['success'] == b['success'] == 'True'
+        assert float(a['total_operation_cost']) == pytest.approx(
+            float(b['total_operation_cost']), rel=1e-6)
+    # The scenarios differ only in port-side settings, so their voyage solves are shared
+    assert parallel['cache']['hits'] > 0
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from benchmarks import daily_profiles, example_seaport, fleet_pairs, synthetic_fleet
+from logic import VoltageRegulator
+
+@pytest.fixture
+def instance():
+    """(pairs, pv, load, fleet) of a four-vessel day"""
+    fleet = synthetic_fleet(4)
+    return (fleet_pairs(fleet), *daily_profiles(24), fleet)
+
+def selected_pairs(pairs, result):
+    return {k: pairs[k][int(np.argmax(selection))]
+            for k, selection in result['vessel_selection'].items()}
+
+def check_allocation(regulator, pairs, result):
+    """Berth capacity, one berth per vessel, arrival and port-capacity constraints"""
+    omega, P_ch = np.round(result['omega']), result['P_ch']
+    assert np.all(omega.sum(axis=1) <= 1)          # one vessel per berth and step
+    assert np.all(omega.sum(axis=0) <= 1)          # one berth per vessel and step
+    for k, pair in enumerate(selected_pairs(pairs, result).values()):
+        assert not omega[:, k, :pair['T_a']].any()
+    assert np.all(P_ch.sum(axis=(0, 1)) <= regulator.port_capacity + 1e-6)
+    for selection in result['vessel_selection'].values():
+        assert np.sum(np.round(selection)) == 1
+
+def test_allocation_matrices():
+    A_berth, A_vessel = VoltageRegulator.allocation_matrices(3, 4)
+    omega = np.random.default_rng(0).random((3, 4, 5))
+    flat = omega.reshape(12, 5)
+    np.testing.assert_allclose(A_berth @ flat, omega.sum(axis=1))
+    np.testing.assert_allclose(A_vessel @ flat, omega.sum(axis=0))
+
+def test_selection_matrix():
+    pairs = {7: [{}, {}], 8: [{}], 9: [{}, {}, {}]}
+    S = VoltageRegulator.selection_matrix(pairs).toarray()
+    np.testing.assert_array_equal(S, [[1, 1, 0, 0, 0, 0],
+                                      [0, 0, 1, 0, 0, 0],
+                                      [0, 0, 0, 1, 1, 1]])
+
+def test_vectorized_model_solves_feasibly(instance):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport())
+    result = regulator.optimize_voltage_regulation(pairs, pv, load, fleet)
+    assert result['success']
+    assert result['omega'].shape == (3, 4, 24)
+    check_allocation(regulator, pairs, result)
+    assert set(result['timing']) >= {'build', 'canonicalization', 'solve', 'total'}
+    assert result['timing']['total'] >= result['timing']['build']
+    assert regulator.last_timing is result['timing']
+
+def test_vessels_without_pairs_are_left_out(instance):
+    pairs, pv, load, fleet = instance
+    pairs = {**pairs, 1: []}
+    result = VoltageRegulator(example_seaport()).optimize_voltage_regulation(
+        pairs, pv, load, fleet)
+    assert result['success'] and list(result['vessel_selection']) == [0, 2, 3]
+
+def test_linearized_milp_plan(instance):
+    pairs, pv, load, fleet = instance
+    regulator = VoltageRegulator(example_seaport())
+    model = regulator.build_model(pairs, pv, load, fleet)
+    assert model['problem'].is_dcp() and model['problem'].is_mixed_integer()
+    result = regulator.solve_model(model)
+    assert result['success'] and result['mip_gap'] <= 1e-3
+
+    omega, P_ch = result['omega'], result['P_ch']
+    np.testing.assert_allclose(omega, np.round(omega), atol=1e-6)
+    # z = P_ch * omega: no power without a berth, never above P_ch_max
+    assert np.all(P_ch[np.round(omega) == 0] <= 1e-6)
+    assert np.all(P_ch <= regulator.P_ch_max + 1e-6)
+    for k, (aes, pair) in enumerate(zip(fleet, selected_pairs(pairs, result).values())):
+        berths = np.flatnonzero(np.round(omega[:, k]).any(axis=1))
+        assert len(berths) == 1
+        steps = np.flatnonzero(np.round(omega[berths[0], k]))
+        assert np.all(np.diff(steps) == 1)      # one contiguous stay
+        assert len(steps) >= regulator.service_steps(berths[0], aes.vessel_type)
+        required = aes.E_ESS * (regulator.SOC_target - pair['SOC_a'])
+        assert regulator.eta_ch * regulator.dt * P_ch[:, k].sum() >= required - 1e-4
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime, check_grad
+
+from benchmarks import example_aes
+from logic import DEFAULT_RESISTANCE_PROFILE, VoyageScheduler, example_fleet
+
+@pytest.fixture
+def scheduler():
+    return VoyageScheduler(example_fleet()[0])
+
+def random_point(scheduler, n, seed=0):
+    lower, upper = scheduler._voyage_bounds(n)
+    return np.random.default_rng(seed).uniform(lower, upper)
+
+@pytest.mark.parametrize("soc_price", [0.0, 0.3])
+def test_objective_gradient(scheduler, soc_price):
+    scheduler.soc_price = soc_price
+    x = random_point(scheduler, 4)
+    error = check_grad(lambda x: scheduler.priced_objective(x, 4)[0],
+                       lambda x: scheduler.priced_objective(x, 4)[1], x)
+    assert error < 1e-5 * max(1.0, np.linalg.norm(scheduler.priced_objective(x, 4)[1]))
+
+def test_ess_degradation_gradient(scheduler):
+    E = scheduler.params.E_ESS
+    for P in (10.0, 35.0, 60.0):
+        numeric = approx_fprime([P], lambda p: scheduler.ess_degradation_cost(p[0], p[0] / E))
+        assert scheduler.ess_degradation_cost_grad(P) == pytest.approx(numeric[0], rel=1e-5)
+
+def test_power_balance_jacobian(scheduler):
+    f = np.array(DEFAULT_RESISTANCE_PROFILE)
+    x = random_point(scheduler, 4, seed=1)
+    numeric = np.array([approx_fprime(x, lambda x: scheduler.power_balance(x, f)[i], 1e-6)
+                        for i in range(4)])
+    np.testing.assert_allclose(scheduler.power_balance_jacobian(x, f).toarray(), numeric,
+                               rtol=1e-4, atol=1e-4)
+
+@pytest.mark.parametrize("method", ["SLSQP", "trust-constr"])
+def test_voyage_meets_constraints(scheduler, method):
+    result = scheduler.optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE, method=method)
+    assert result['success'] and result['T_a'] == 10
+    f = np.array(DEFAULT_RESISTANCE_PROFILE[:2])
+    x = np.concatenate([result['velocity_profile'], result['P_DSG_profile'],
+                        result['P_dis_profile']])
+    assert np.sum(result['velocity_profile']) == pytest.approx(scheduler.d_route, abs=1e-4)
+    np.testing.assert_allclose(scheduler.power_balance(x, f), 0, atol=1e-3)
+    assert np.sum(result['P_dis_profile']) <= scheduler.discharge_capacity() + 1e-6
+    assert result['SOC_a'] >= scheduler.SOC_min
+
+def test_methods_agree_on_cost(scheduler):
+    slsqp = scheduler.optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE)
+    trust = scheduler.optimize_voyage(10, DEFAULT_RESISTANCE_PROFILE, method='trust-constr')
+    assert trust['cost'] == pytest.approx(slsqp['cost'], rel=1e-3)
+
+def test_no_voyage_before_start(scheduler):
+    assert scheduler.optimize_voyage(VoyageScheduler.T_s, DEFAULT_RESISTANCE_PROFILE) is None
+
+@pytest.fixture
+def long_voyage():
+    """A vessel with a 9-20 h arrival window and its resistance profile"""
+    aes = example_aes(T_low=9, T_up=20, P_dis_min=0)
+    aes.P_DSG_min = 20
+    return VoyageScheduler(aes), list(np.random.default_rng(0).uniform(0.1, 0.3, size=14))
+
+def test_batch_matches_single_solves(long_voyage):
+    scheduler, profile = long_voyage
+    batch = scheduler.optimize_voyage_batch(range(9, 21), profile)
+    single = {T_a: scheduler.optimize_voyage(T_a, profile) for T_a in range(9, 21)}
+    assert [r['T_a'] for r in batch] == [T_a for T_a, r in single.items() if r is not None]
+    for result in batch:
+        assert result['cost'] == pytest.approx(single[result['T_a']]['cost'], rel=1e-3)
+
+def test_batch_skips_unreachable_arrivals(long_voyage):
+    scheduler, profile = long_voyage
+    # 30 nmi cannot be covered in one hour at 20 knots
+    assert scheduler.optimize_voyage_batch([9], profile) == []
+    assert scheduler.optimize_voyage_batch([], profile) == []
+
+def test_batch_continues_from_previous_chunk(long_voyage):
+    scheduler, profile = long_voyage
+    whole = scheduler.optimize_voyage_batch(range(9, 21), profile)
+    first = scheduler.optimize_voyage_batch(range(9, 12), profile)
+    second = scheduler.optimize_voyage_batch(range(12, 21), profile, previous=first[-1])
+    assert [r['cost'] for r in first + second] == pytest.approx([r['cost'] for r in whole])
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        VoyageScheduler(example_fleet()[0], backend='ipopt')
+
+def test_convex_backend_matches_slsqp(long_voyage):
+    scheduler, profile = long_voyage
+    for T_a in range(10, 14):
+        report = scheduler.compare_backends(T_a, profile)
+        assert 'mismatch' not in report
+        assert abs(report['relative_gap']) < 1e-5
+        assert report['convex']['power_slack'] <= scheduler.power_tol
+
+def test_convex_backend_rejects_forced_power_surplus():
+    # P_DSG_min + P_dis_min exceed the propulsion need: no exact power balance
+    scheduler = VoyageScheduler(example_fleet()[1], backend='cvxpy')
+    for T_a in range(11, 15):
+        report = scheduler.compare_backends(T_a, DEFAULT_RESISTANCE_PROFILE)
+        assert report['slsqp'] is None and report['convex'] is None
+        assert scheduler.optimize_voyage(T_a, DEFAULT_RESISTANCE_PROFILE) is None
+
+def test_backend_mismatch_is_reported(long_voyage, monkeypatch):
+    scheduler, profile = long_voyage
+    monkeypatch.setattr(scheduler, '_solve_voyage_slsqp', lambda *args: None)
+    report = scheduler.compare_backends(11, profile)
+    assert report['mismatch'] == 'slsqp infeasible' and 'gap' not in report
+
+def test_convex_batch(long_voyage):
+    scheduler, profile = long_voyage
+    convex = VoyageScheduler(scheduler.params, backend='cvxpy')
+    expected = scheduler.optimize_voyage_batch(range(9, 21), profile)
+    result = convex.optimize_voyage_batch(range(9, 21), profile)
+    assert [r['T_a'] for r in result] == [r['T_a'] for r in expected]
+    assert [r['cost'] for r in result] == pytest.approx([r['cost'] for r in expected], rel=1e-4)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import voyage_pool
+from benchmarks import example_aes, example_seaport
+from logic import CoordinatedOptimizer
+from voyage_pool import solve_voyage_chunk, vessel_scheduler
+
+@pytest.fixture
+def vessel():
+    aes = example_aes(T_low=9, T_up=20, P_dis_min=0)
+    aes.P_DSG_min = 20
+    return aes, list(np.random.default_rng(0).uniform(0.1, 0.3, size=14))
+
+def test_scheduler_reused_per_vessel(vessel):
+    aes, _ = vessel
+    entry = vessel_scheduler(aes)
+    assert vessel_scheduler(aes) is entry
+    assert vessel_scheduler(aes, d_route=40.0) is not entry
+
+def test_scheduler_lru_is_bounded(vessel, monkeypatch):
+    aes, _ = vessel
+    monkeypatch.setattr(voyage_pool, 'MAX_SCHEDULERS', 2)
+    monkeypatch.setattr(voyage_pool, '_SCHEDULERS', type(voyage_pool._SCHEDULERS)())
+    for d_route in (10.0, 20.0, 30.0):
+        vessel_scheduler(aes, d_route=d_route)
+    assert len(voyage_pool._SCHEDULERS) == 2
+
+def test_consecutive_chunks_warm_start_like_one_batch(vessel):
+    aes, profile = vessel
+    whole = solve_voyage_chunk(aes, list(range(9, 21)), profile)
+    chunks = [solve_voyage_chunk(aes, list(range(start, start + 3)), profile)
+              for start in range(9, 21, 3)]
+    assert [r['cost'] for chunk in chunks for r in chunk] == pytest.approx(
+        [r['cost'] for r in whole])
+    # The carry records the last T_a covered and its result
+    _, carry = vessel_scheduler(aes)
+    assert carry[:2] == (tuple(profile), 20)
+
+def pool_fleet():
+    fleet = []
+    for vessel_id in range(3):
+        aes = example_aes(vessel_id=vessel_id, T_low=9, T_up=14, P_dis_min=0)
+        aes.P_DSG_min = 20
+        aes.c2 = 0.008 + 0.002 * vessel_id
+        fleet.append(aes)
+    return fleet
+
+def voyage_costs(pairs):
+    return {vessel_id: [(r['T_a'], r['cost']) for r in results]
+            for vessel_id, results in pairs.items()}
+
+@pytest.mark.parametrize("shared_results", [False, True])
+def test_pool_matches_serial_schedule(shared_results):
+    profile = list(np.random.default_rng(1).uniform(0.1, 0.3, size=8))
+    serial = CoordinatedOptimizer(pool_fleet(), example_seaport(), verbose=False)
+    pooled = CoordinatedOptimizer(pool_fleet(), example_seaport(), n_workers=2, chunk_size=2,
+                                  shared_results=shared_results, verbose=False)
+    expected = voyage_costs(serial.schedule_voyages(profile))
+    result = voyage_costs(pooled.schedule_voyages(profile))
+    assert list(result) == list(expected)
+    for vessel_id, pairs in expected.items():
+        assert [T_a for T_a, _ in result[vessel_id]] == [T_a for T_a, _ in pairs]
+        # Chunks solved in other processes start cold, so SLSQP may stop a
+        # little elsewhere than on the warm-started serial run
+        assert [cost for _, cost in result[vessel_id]] == pytest.approx(
+            [cost for _, cost in pairs], rel=1e-3)
+
+def test_jobs_split_windows_across_workers():
+    optimizer = CoordinatedOptimizer(pool_fleet(), example_seaport(), n_workers=6,
+                                     verbose=False)
+    jobs = optimizer._voyage_jobs()
+    assert len(jobs) == 6
+    assert [T_a for _, aes, T_a_values in jobs if aes.vessel_id == 0
+            for T_a in T_a_values] == list(range(9, 15))
+
+def test_failing_job_names_the_vessel(monkeypatch):
+    optimizer = CoordinatedOptimizer(pool_fleet(), example_seaport(), verbose=False)
+
+    def fail(*args):
+        raise ValueError("boom")
+    monkeypatch.setattr(voyage_pool, 'solve_voyage_chunk', fail)
+    with pytest.raises(RuntimeError, match="AES 0, T_a 9-14"):
+        optimizer.schedule_voyages([0.2] * 8)
@@ -0,0 +1,64 @@
+"""
+Process-pool workers for Step 3: per-vessel voyage solves over chunks of arrival times
+"""
+
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import Dict, List, Tuple
+
+from logic import AESParameters, VoyageScheduler
+from packed import PackedVoyages
+from solve_cache import SolveCache
+
+# VoyageSchedulers of this process by vessel and voyage setup, reused across
+# chunks together with the last T_a covered and last result (warm-start carry)
+_SCHEDULERS: "OrderedDict[Tuple, List]" = OrderedDict()
+MAX_SCHEDULERS = 1024
+
+def vessel_scheduler(aes: AESParameters, d_route: float = 30.0, backend: str = 'slsqp',
+                     soc_price: float = 0.0, steps_per_hour: int = 1) -> List:
+    """[scheduler, carry] for a vessel, built once per process (LRU of MAX_SCHEDULERS)
+
+    ``carry`` is None or (profile, last T_a covered, last result).
+    """
+    key = (astuple(aes), d_route, backend, soc_price, steps_per_hour)
+    entry = _SCHEDULERS.get(key)
+    if entry is None:
+        entry = [VoyageScheduler(aes, d_route, backend, soc_price=soc_price,
+                                 steps_per_hour=steps_per_hour), None]
+        _SCHEDULERS[key] = entry
+        if len(_SCHEDULERS) > MAX_SCHEDULERS:
+            _SCHEDULERS.popitem(last=False)
+    else:
+        _SCHEDULERS.move_to_end(key)
+    return entry
+
+def solve_voyage_chunk(aes: AESParameters, T_a_values: List[int],
+                       resistance_profile: List[float], d_route: float = 30.0,
+                       backend: str = 'slsqp', soc_price: float = 0.0,
+                       cache: SolveCache = None, steps_per_hour: int = 1,
+                       buffer: PackedVoyages = None, first_row: int = 0) -> List[Dict]:
+    """Worker entry point: warm-started voyage solves for one vessel's T_a chunk
+
+    The vessel's scheduler is kept per process (see vessel_scheduler); a chunk
+    that continues the previous one of the same profile warm-starts from its
+    last result. With a (shared) ``buffer`` the results are written to its rows
+    first_row + (T_a - T_a_values[0]) instead of being returned, and only
+    their count comes back.
+    """
+    entry = vessel_scheduler(aes, d_route, backend, soc_price, steps_per_hour)
+    scheduler, carry = entry
+    scheduler.cache = cache
+    profile = tuple(resistance_profile)
+    previous = None
+    if carry is not None and carry[:2] == (profile, min(T_a_values) - 1):
+        previous = carry[2]
+    results = scheduler.optimize_voyage_batch(T_a_values, resistance_profile,
+                                              previous=previous)
+    entry[1] = (profile, max(T_a_values), results[-1] if results else previous)
+    if buffer is None:
+        return results
+    for result in results:
+        buffer.write(first_row + result['T_a'] - T_a_values[0], result)
+    buffer.detach()
+    return len(results)